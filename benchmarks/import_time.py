@@ -0,0 +1,44 @@
+"""Startup cost of the package in fresh interpreters.
+
+Every statement runs in a new Python process, the same way short lived jobs
+pay for it. The interpreter startup time (`pass`) is reported as a baseline.
+
+Usage:
+    python benchmarks/import_time.py [repeat]
+"""
+
+import sys
+import time
+import statistics
+import subprocess
+
+
+STATEMENTS = [
+    "pass",
+    "import sotagents",
+    "import sotagents.client",
+    "from sotagents import PapersWithCodeClient; PapersWithCodeClient()",
+    "import sotagents.analysis",
+    "from sotagents.commands import app",
+]
+
+
+def measure(statement: str, repeat: int) -> list[float]:
+    """Return wall times in milliseconds of running the statement."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main(repeat: int = 10):
+    print(f"{'Statement':<70}{'median (ms)':>12}{'min (ms)':>10}")
+    for statement in STATEMENTS:
+        times = measure(statement, repeat)
+        print(f"{statement:<70}{statistics.median(times):>12.1f}{min(times):>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
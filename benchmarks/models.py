@@ -0,0 +1,130 @@
+"""Per item cost of building models from API responses.
+
+Compares validated construction (`Model(**data)`) with the trusted mode used by
+`PapersWithCodeClient(trusted=True)` (`Model.construct_trusted(data)`) for every
+model type returned by the list endpoints.
+
+Usage:
+    python benchmarks/models.py [items_per_page] [repeat]
+"""
+
+import sys
+import timeit
+
+from sotagents.models import (
+    Papers,
+    Repositories,
+    PaperRepos,
+    Authors,
+    Conferences,
+    Proceedings,
+    Areas,
+    Tasks,
+    Datasets,
+    Methods,
+    Metrics,
+    Results,
+    EvaluationTables,
+)
+
+
+PAPER = {
+    "id": "attention-is-all-you-need",
+    "arxiv_id": "1706.03762",
+    "nips_id": None,
+    "url_abs": "https://arxiv.org/abs/1706.03762v5",
+    "url_pdf": "https://arxiv.org/pdf/1706.03762v5.pdf",
+    "title": "Attention Is All You Need",
+    "abstract": "The dominant sequence transduction models are based on ... " * 10,
+    "authors": ["Ashish Vaswani", "Noam Shazeer", "Niki Parmar", "Jakob Uszkoreit"],
+    "published": "2017-06-12",
+    "conference": "nips-2017",
+    "conference_url_abs": "http://papers.nips.cc/paper/7181",
+    "conference_url_pdf": "http://papers.nips.cc/paper/7181.pdf",
+    "proceeding": "neurips-2017-12",
+}
+REPOSITORY = {
+    "url": "https://github.com/tensorflow/tensor2tensor",
+    "owner": "tensorflow",
+    "name": "tensor2tensor",
+    "description": "Library of deep learning models and datasets.",
+    "stars": 14000,
+    "framework": "tf",
+    "is_official": True,
+}
+ITEMS = {
+    Papers: PAPER,
+    Repositories: REPOSITORY,
+    PaperRepos: {"paper": PAPER, "repository": REPOSITORY, "is_official": True},
+    Authors: {"id": "ashish-vaswani", "full_name": "Ashish Vaswani"},
+    Conferences: {"id": "nips-2017", "name": "NeurIPS 2017"},
+    Proceedings: {"id": "neurips-2017-12", "year": 2017, "month": 12},
+    Areas: {"id": "computer-vision", "name": "Computer Vision"},
+    Tasks: {
+        "id": "machine-translation",
+        "name": "Machine Translation",
+        "description": "Machine translation is the task of translating ...",
+    },
+    Datasets: {
+        "id": "wmt-2014",
+        "name": "WMT 2014",
+        "full_name": "Workshop on Machine Translation 2014",
+        "url": "https://www.statmt.org/wmt14/",
+    },
+    Methods: {
+        "id": "transformer",
+        "name": "Transformer",
+        "full_name": "Transformer",
+        "description": "A Transformer is a model architecture ...",
+        "paper": "attention-is-all-you-need",
+    },
+    Metrics: {"id": "bleu", "name": "BLEU", "description": "", "is_loss": False},
+    Results: {
+        "id": "result",
+        "best_rank": 1,
+        "metrics": {"BLEU score": "28.4", "Hardware Burden": "1G"},
+        "methodology": "Transformer Big",
+        "uses_additional_data": False,
+        "paper": "attention-is-all-you-need",
+        "best_metric": "BLEU score",
+        "evaluated_on": "2017-06-12",
+        "external_source_url": None,
+    },
+    EvaluationTables: {
+        "id": "machine-translation-on-wmt2014-english-german",
+        "task": "machine-translation",
+        "dataset": "wmt-2014",
+        "description": "",
+        "mirror_url": None,
+    },
+}
+
+
+def page(item: dict, items_per_page: int) -> dict:
+    return {
+        "count": items_per_page,
+        "next_page": None,
+        "previous_page": None,
+        "results": [dict(item) for _ in range(items_per_page)],
+    }
+
+
+def measure(statement, items_per_page: int, repeat: int) -> float:
+    """Return the best per item time in microseconds."""
+    best = min(timeit.repeat(statement, number=1, repeat=repeat))
+    return best / items_per_page * 1e6
+
+
+def main(items_per_page: int = 500, repeat: int = 20):
+    print(f"{'Model':<20}{'strict (us)':>14}{'trusted (us)':>14}{'speedup':>10}")
+    for model, item in ITEMS.items():
+        data = page(item, items_per_page)
+        model.construct_trusted(data)  # Build the construction plan.
+        strict = measure(lambda: model(**data), items_per_page, repeat)
+        trusted = measure(lambda: model.construct_trusted(data), items_per_page, repeat)
+        name = model.__fields__["results"].type_.__name__
+        print(f"{name:<20}{strict:>14.2f}{trusted:>14.2f}{strict / trusted:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -36,6 +36,6 @@ setup(
     install_requires=io.open("requirements.txt").read().splitlines(),
     entry_points="""
         [console_scripts]
-        pwc=sotagents.__main__:app
+        pwc=sotagents.__main__:main
     """,
 )
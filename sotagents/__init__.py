@@ -1,4 +1,21 @@
 __all__ = ["PapersWithCodeClient", "version", "__version__"]
 
-from sotagents.client import PapersWithCodeClient
+from typing import TYPE_CHECKING, Any
+
 from sotagents.version import version, __version__
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+def __getattr__(name: str) -> Any:
+    # The client and its dependencies are imported on first use.
+    if name == "PapersWithCodeClient":
+        from sotagents.client import PapersWithCodeClient
+
+        return PapersWithCodeClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,19 @@
-from sotagents.commands import app
+import sys
+
+
+def main():
+    """Run the CLI, in the daemon if it's enabled."""
+    # The daemon client is light, the CLI is imported only if it's needed.
+    from sotagents.daemon import forward
+
+    code = forward()
+    if code is not None:
+        sys.exit(code)
+
+    from sotagents.commands import app
+
+    app(prog_name="pwc")
 
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -0,0 +1,26 @@
+__all__ = [
+    "parse_metric_value",
+    "parse_metric_values",
+    "rank",
+    "MetricStats",
+    "ResultsFrame",
+    "Leaderboard",
+    "build_leaderboard",
+    "materialize_leaderboards",
+    "SotaSeries",
+    "SotaProgression",
+]
+
+from sotagents.analysis.values import parse_metric_value
+from sotagents.analysis.frame import (
+    parse_metric_values,
+    rank,
+    MetricStats,
+    ResultsFrame,
+)
+from sotagents.analysis.leaderboard import (
+    Leaderboard,
+    build_leaderboard,
+    materialize_leaderboards,
+)
+from sotagents.analysis.progression import SotaSeries, SotaProgression
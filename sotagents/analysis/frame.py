@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from sotagents.analysis.values import parse_metric_value
+from sotagents.models import Metric, Result, Results
+
+
+def parse_metric_values(values: Sequence) -> np.ndarray:
+    """Parse a column of metric values into a float array.
+
+    Columns containing only plain numbers are converted by NumPy directly, other
+    columns fall back to `parse_metric_value` for every value.
+
+    Args:
+        values: Metric values as returned by the API.
+
+    Returns:
+        Float array with `NaN` for missing or unparsable values.
+    """
+    try:
+        return np.asarray(
+            ["nan" if value is None else value for value in values],
+            dtype=np.float64,
+        )
+    except (TypeError, ValueError):
+        return np.asarray(
+            [parse_metric_value(value) for value in values], dtype=np.float64
+        )
+
+
+def parse_dates(values: Sequence[Optional[str]]) -> np.ndarray:
+    """Parse a column of `YYYY-MM-DD` dates into a `datetime64[D]` array.
+
+    Missing or invalid dates are returned as `NaT`.
+    """
+    try:
+        return np.asarray(
+            ["NaT" if value is None else value[:10] for value in values],
+            dtype="datetime64[D]",
+        )
+    except (TypeError, ValueError):
+        parsed = []
+        for value in values:
+            try:
+                parsed.append(np.datetime64(value[:10], "D"))
+            except (TypeError, ValueError):
+                parsed.append(np.datetime64("NaT", "D"))
+        return np.asarray(parsed, dtype="datetime64[D]")
+
+
+def rank(values: np.ndarray, is_loss: bool = False) -> np.ndarray:
+    """Compute SOTA ranks for a column of metric values.
+
+    The best value gets rank 1 and equal values share the same rank.
+
+    Args:
+        values: Float array of metric values.
+        is_loss: If `True` lower values are better.
+
+    Returns:
+        Float array of ranks, `NaN` for missing values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keys = values if is_loss else -values
+    present = ~np.isnan(keys)
+    ordered = np.sort(keys[present])
+    ranks = np.full(values.shape, np.nan)
+    ranks[present] = np.searchsorted(ordered, keys[present], side="left") + 1
+    return ranks
+
+
+@dataclass(frozen=True)
+class MetricStats:
+    """Summary statistics of a single metric.
+
+    Attributes:
+        count: Number of results with a value for the metric.
+        mean: Mean value.
+        std: Standard deviation.
+        min: Minimal value.
+        median: Median value.
+        max: Maximal value.
+        best: Best value taking the loss direction into account.
+    """
+
+    count: int
+    mean: float
+    std: float
+    min: float
+    median: float
+    max: float
+    best: float
+
+
+class ResultsFrame:
+    """Columnar view over evaluation results.
+
+    Metric values are parsed once into float arrays keyed by metric name, with
+    `NaN` where a result has no value for the metric. All operations on the frame
+    are vectorized.
+
+    Attributes:
+        ids: Result IDs.
+        papers: Paper IDs of the results.
+        evaluated_on: Evaluation dates as `datetime64[D]`, `NaT` when unknown.
+        values: Metric name to float array of metric values.
+        is_loss: Metric name to loss flag. Metrics not listed are treated as
+            "higher is better".
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        papers: np.ndarray,
+        values: dict[str, np.ndarray],
+        is_loss: Optional[dict[str, bool]] = None,
+        evaluated_on: Optional[np.ndarray] = None,
+    ):
+        self.ids = ids
+        self.papers = papers
+        self.evaluated_on = (
+            np.full(len(ids), np.datetime64("NaT"), dtype="datetime64[D]")
+            if evaluated_on is None
+            else evaluated_on
+        )
+        self.values = values
+        self.is_loss = is_loss or {}
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Union[Results, Iterable[Result]],
+        metrics: Optional[Iterable[Metric]] = None,
+    ) -> "ResultsFrame":
+        """Build a frame from results.
+
+        Args:
+            results: Results page or an iterable of results.
+            metrics: Metrics of the evaluation table. Used to order the columns
+                and to get the loss direction of every metric.
+
+        Returns:
+            ResultsFrame object.
+        """
+        if isinstance(results, Results):
+            results = results.results
+        results = list(results)
+        metrics = list(metrics or [])
+
+        names = [metric.name for metric in metrics]
+        seen = set(names)
+        for result in results:
+            for name in result.metrics:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+
+        return cls(
+            ids=np.array([result.id for result in results], dtype=object),
+            papers=np.array([result.paper for result in results], dtype=object),
+            evaluated_on=parse_dates([result.evaluated_on for result in results]),
+            values={
+                name: parse_metric_values(
+                    [result.metrics.get(name) for result in results]
+                )
+                for name in names
+            },
+            is_loss={metric.name: metric.is_loss for metric in metrics},
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.values[metric]
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(rows={len(self)}, "
+            f"metrics={self.metric_names})"
+        )
+
+    @property
+    def metric_names(self) -> list[str]:
+        return list(self.values)
+
+    def take(self, indices: Union[np.ndarray, Sequence[int]]) -> "ResultsFrame":
+        """Return a new frame with the selected rows.
+
+        Args:
+            indices: Row indices or a boolean mask.
+        """
+        indices = np.asarray(indices)
+        return self.__class__(
+            ids=self.ids[indices],
+            papers=self.papers[indices],
+            evaluated_on=self.evaluated_on[indices],
+            values={name: values[indices] for name, values in self.values.items()},
+            is_loss=self.is_loss,
+        )
+
+    def rank(self, metric: str) -> np.ndarray:
+        """Return SOTA ranks of all rows for the metric.
+
+        Ranks are ascending by value for loss metrics and descending otherwise.
+        """
+        return rank(self.values[metric], is_loss=self.is_loss.get(metric, False))
+
+    def ranks(self) -> dict[str, np.ndarray]:
+        """Return SOTA ranks for all metrics."""
+        return {name: self.rank(name) for name in self.values}
+
+    def top_k(self, metric: str, k: int = 10) -> np.ndarray:
+        """Return indices of the `k` best rows for the metric, best first.
+
+        Rows without a value for the metric are never returned. Rows with equal
+        values are returned in row order.
+        """
+        values = self.values[metric]
+        keys = values if self.is_loss.get(metric, False) else -values
+        present = np.flatnonzero(~np.isnan(keys))
+        k = min(k, len(present))
+        if k <= 0:
+            return present[:0]
+        # All rows tied with the k-th best are candidates, so the returned rows
+        # don't depend on how the partition orders them.
+        kth = np.partition(keys[present], k - 1)[k - 1]
+        candidates = present[keys[present] <= kth]
+        return candidates[np.argsort(keys[candidates], kind="stable")[:k]]
+
+    def stats(self, metric: str) -> MetricStats:
+        """Return summary statistics for the metric."""
+        values = self.values[metric]
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return MetricStats(
+                count=0,
+                mean=np.nan,
+                std=np.nan,
+                min=np.nan,
+                median=np.nan,
+                max=np.nan,
+                best=np.nan,
+            )
+        minimum, maximum = float(values.min()), float(values.max())
+        return MetricStats(
+            count=len(values),
+            mean=float(values.mean()),
+            std=float(values.std()),
+            min=minimum,
+            median=float(np.median(values)),
+            max=maximum,
+            best=minimum if self.is_loss.get(metric, False) else maximum,
+        )
+
+    def describe(self) -> dict[str, MetricStats]:
+        """Return summary statistics for all metrics."""
+        return {name: self.stats(name) for name in self.values}
@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+
+from sotagents.errors import HttpClientError
+from sotagents.analysis.frame import ResultsFrame
+from sotagents.models import EvaluationTable, Metric, Paper, Result
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+@dataclass
+class Leaderboard:
+    """Materialized leaderboard of a single evaluation table.
+
+    Data is stored in columns, every column has one value per result.
+
+    Attributes:
+        table: Evaluation table.
+        metrics: Metrics used in the evaluation table.
+        frame: Parsed metric values of all results.
+        columns: Result attribute columns: `id`, `methodology`, `paper`,
+            `paper_title`, `evaluated_on` and `uses_additional_data`.
+        ranks: SOTA ranks, one column per metric name, `NaN` for results without
+            a value for the metric.
+    """
+
+    table: EvaluationTable
+    metrics: list[Metric]
+    frame: ResultsFrame
+    columns: dict[str, list] = field(default_factory=dict)
+    ranks: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def scores(self) -> dict[str, np.ndarray]:
+        """Parsed metric values, one column per metric name."""
+        return self.frame.values
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return a single row as a dictionary."""
+        row = {name: column[index] for name, column in self.columns.items()}
+        row.update({name: float(column[index]) for name, column in self.scores.items()})
+        return row
+
+    def sota(self, metric: str) -> Optional[dict[str, Any]]:
+        """Return the best row for the metric or `None` if there are no values."""
+        best = self.frame.top_k(metric, k=1) if metric in self.scores else []
+        if len(best) == 0:
+            return None
+        return self.row(int(best[0]))
+
+
+def build_leaderboard(
+    table: EvaluationTable,
+    metrics: list[Metric],
+    results: list[Result],
+    papers: dict[str, Optional[Paper]],
+) -> Leaderboard:
+    """Join evaluation table results with their metrics and papers.
+
+    Args:
+        table: Evaluation table.
+        metrics: Metrics used in the evaluation table.
+        results: All results of the evaluation table.
+        papers: Dictionary of paper ID to paper object.
+
+    Returns:
+        Leaderboard object.
+    """
+    frame = ResultsFrame.from_results(results, metrics=metrics)
+    leaderboard = Leaderboard(table=table, metrics=metrics, frame=frame)
+    columns = leaderboard.columns
+    columns["id"] = [result.id for result in results]
+    columns["methodology"] = [result.methodology for result in results]
+    columns["paper"] = [result.paper for result in results]
+    columns["paper_title"] = [
+        None if papers.get(result.paper) is None else papers[result.paper].title
+        for result in results
+    ]
+    columns["evaluated_on"] = [result.evaluated_on for result in results]
+    columns["uses_additional_data"] = [
+        result.uses_additional_data for result in results
+    ]
+    leaderboard.ranks.update(frame.ranks())
+    return leaderboard
+
+
+def materialize_leaderboards(
+    client: "PapersWithCodeClient",
+    task_id: str,
+    concurrency: int = 8,
+) -> list[Leaderboard]:
+    """Fetch all evaluation tables of a task and build their leaderboards.
+
+    Metrics and results of every evaluation table and the papers referenced by
+    the results are fetched concurrently.
+
+    Args:
+        client: Client used to fetch the data.
+        task_id: ID of the task.
+        concurrency: Maximal number of concurrent requests.
+
+    Returns:
+        List of leaderboards, one for each evaluation table of the task.
+    """
+    tables = list(client.iterate(client.task_evaluation_list, task_id))
+    if len(tables) == 0:
+        return []
+
+    def fetch_all(method, *args) -> list:
+        return list(client.iterate(method, *args))
+
+    def get_paper(paper_id: str) -> Optional[Paper]:
+        try:
+            return client.paper_get(paper_id)
+        except HttpClientError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        metrics = [
+            executor.submit(fetch_all, client.evaluation_metric_list, table.id)
+            for table in tables
+        ]
+        results = [
+            executor.submit(fetch_all, client.evaluation_result_list, table.id)
+            for table in tables
+        ]
+        metrics = [future.result() for future in metrics]
+        results = [future.result() for future in results]
+
+        paper_ids = sorted(
+            {
+                result.paper
+                for table_results in results
+                for result in table_results
+                if result.paper
+            }
+        )
+        papers = dict(zip(paper_ids, executor.map(get_paper, paper_ids)))
+
+    return [
+        build_leaderboard(
+            table=table,
+            metrics=table_metrics,
+            results=table_results,
+            papers=papers,
+        )
+        for table, table_metrics, table_results in zip(tables, metrics, results)
+    ]
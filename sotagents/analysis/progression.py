@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from sotagents.analysis.frame import ResultsFrame
+from sotagents.models import Metric, Result, Results
+
+
+@dataclass(frozen=True)
+class SotaSeries:
+    """Best score over time for a single metric.
+
+    Attributes:
+        metric: Metric name.
+        dates: Distinct evaluation dates as `datetime64[D]`, sorted ascending.
+        values: Best value achieved up to and including every date.
+        ids: ID of the result holding the best value at every date.
+    """
+
+    metric: str
+    dates: np.ndarray
+    values: np.ndarray
+    ids: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+class SotaProgression:
+    """Running best value of every metric of an evaluation table over time.
+
+    Results are kept sorted by `Result.evaluated_on`, results without an
+    evaluation date are ignored. Adding new results merges them into the sorted
+    rows, which takes `O(n log n)` for `n` rows in total, but the running best is
+    only recomputed from the earliest affected date onward.
+
+    Example:
+        >>> progression = SotaProgression(metrics=client.evaluation_metric_list(
+        ...     evaluation_id).results)
+        >>> progression.add(client.evaluation_result_list(evaluation_id))
+        >>> series = progression.series("Top 1 Accuracy")
+        >>> series.dates, series.values
+    """
+
+    def __init__(self, metrics: Iterable[Metric] = ()):
+        """Initialize.
+
+        Args:
+            metrics: Metrics of the evaluation table, used for the loss direction
+                of every metric. Metrics not listed are treated as "higher is
+                better".
+        """
+        self.metrics = list(metrics)
+        self.is_loss = {metric.name: metric.is_loss for metric in self.metrics}
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.ids = np.empty(0, dtype=object)
+        self.values: dict[str, np.ndarray] = {}
+        self._best: dict[str, np.ndarray] = {}
+        self._holder: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def metric_names(self) -> list[str]:
+        return list(self.values)
+
+    def add(
+        self, results: Union[ResultsFrame, Results, Iterable[Result]]
+    ) -> "SotaProgression":
+        """Add new results or replace existing results with the same ID.
+
+        Args:
+            results: Results frame, results page or an iterable of results.
+
+        Returns:
+            The progression itself.
+        """
+        if not isinstance(results, ResultsFrame):
+            results = ResultsFrame.from_results(results, metrics=self.metrics)
+        frame = results.take(~np.isnat(results.evaluated_on))
+        if len(frame) == 0:
+            return self
+        for name, is_loss in frame.is_loss.items():
+            self.is_loss.setdefault(name, is_loss)
+
+        # Drop the rows that are replaced by the new results.
+        replaced = np.flatnonzero(np.isin(self.ids, frame.ids))
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[replaced] = False
+
+        order = np.argsort(frame.evaluated_on, kind="stable")
+        new_dates = frame.evaluated_on[order]
+        kept_dates = self.dates[keep]
+        start = int(np.searchsorted(kept_dates, new_dates[0], side="right"))
+        if len(replaced) > 0:
+            start = min(start, int(replaced[0]))
+
+        # Merge the new rows into the sorted rows, new rows go after existing
+        # rows with the same date.
+        dates = np.concatenate([kept_dates, new_dates])
+        merge = np.argsort(dates, kind="stable")
+        self.dates = dates[merge]
+        self.ids = np.concatenate([self.ids[keep], frame.ids[order]])[merge]
+
+        names = list(self.values)
+        names.extend(name for name in frame.values if name not in self.values)
+        for name in names:
+            old = self.values.get(name, np.full(len(keep), np.nan))[keep]
+            new = frame.values.get(name, np.full(len(frame), np.nan))[order]
+            self.values[name] = np.concatenate([old, new])[merge]
+            self._recompute(name, start if name in self._best else 0)
+        return self
+
+    def _recompute(self, name: str, start: int):
+        """Recompute the running best of a metric from the `start` row onward."""
+        values = self.values[name]
+        best = self._best.get(name, np.empty(0))[:start]
+        holder = self._holder.get(name, np.empty(0, dtype=np.int64))[:start]
+
+        tail = values[start:]
+        accumulate = np.fmin if self.is_loss.get(name, False) else np.fmax
+        previous = best[-1] if start > 0 else np.nan
+        tail_best = accumulate.accumulate(np.concatenate([[previous], tail]))[1:]
+
+        # A row holds the record if it strictly improves the previous best.
+        previous_best = np.concatenate([[previous], tail_best[:-1]])
+        if self.is_loss.get(name, False):
+            improved = tail < np.where(np.isnan(previous_best), np.inf, previous_best)
+        else:
+            improved = tail > np.where(np.isnan(previous_best), -np.inf, previous_best)
+        indices = np.where(improved, np.arange(start, len(values)), -1)
+        previous_holder = holder[-1] if start > 0 else -1
+        tail_holder = np.maximum.accumulate(
+            np.concatenate([[previous_holder], indices])
+        )[1:]
+
+        self._best[name] = np.concatenate([best, tail_best])
+        self._holder[name] = np.concatenate([holder, tail_holder]).astype(np.int64)
+
+    def series(self, metric: str, steps_only: bool = False) -> SotaSeries:
+        """Return the best score over time for the metric.
+
+        There is one point per date, with the best value at the end of the
+        date, so it doesn't depend on the order the results were added in.
+
+        Args:
+            metric: Metric name.
+            steps_only: Return only the dates where the best value improved.
+
+        Returns:
+            SotaSeries object.
+        """
+        # Last row of every date.
+        last = np.flatnonzero(self.dates[1:] != self.dates[:-1])
+        if len(self.dates) > 0:
+            last = np.append(last, len(self.dates) - 1)
+        best = self._best[metric][last]
+        holder = self._holder[metric][last]
+        mask = holder >= 0
+        if steps_only:
+            # The record is held by a row of the date itself.
+            first = np.concatenate([[0], last[:-1] + 1])
+            mask &= holder >= first
+        ids = np.full(len(holder), None, dtype=object)
+        ids[mask] = self.ids[holder[mask]]
+        return SotaSeries(
+            metric=metric,
+            dates=self.dates[last][mask],
+            values=best[mask],
+            ids=ids[mask],
+        )
+
+    def all_series(self, steps_only: bool = False) -> dict[str, SotaSeries]:
+        """Return the best score over time for all metrics."""
+        return {name: self.series(name, steps_only=steps_only) for name in self.values}
+
+    def best(self, metric: str) -> Optional[float]:
+        """Return the current best value for the metric."""
+        best = self._best.get(metric)
+        if best is None or len(best) == 0 or np.isnan(best[-1]):
+            return None
+        return float(best[-1])
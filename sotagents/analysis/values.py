@@ -0,0 +1,46 @@
+import re
+from typing import Any, Optional
+
+
+_MULTIPLIERS = {
+    "": 1.0,
+    "%": 1.0,
+    "k": 1e3,
+    "K": 1e3,
+    "m": 1e6,
+    "M": 1e6,
+    "b": 1e9,
+    "B": 1e9,
+    "g": 1e9,
+    "G": 1e9,
+}
+
+_VALUE_RE = re.compile(
+    r"^\s*([-+]?(?:\d[\d,]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"\s*(?:([%kKmMbBgG])(?![A-Za-z]))?"
+)
+
+
+def parse_metric_value(value: Any) -> Optional[float]:
+    """Parse a metric value returned by the API into a float.
+
+    Metric values are free form strings like `"92.3"`, `"92.3%"` or `"1.2M"`.
+    Only the leading number and its suffix are used, anything after that (for
+    example a standard deviation `"92.3 ± 0.1"`) is ignored. Percentages are
+    kept on their original scale.
+
+    Args:
+        value: Metric value.
+
+    Returns:
+        Parsed value or `None` if the value is missing or cannot be parsed.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _VALUE_RE.match(str(value))
+    if match is None:
+        return None
+    number, suffix = match.groups()
+    return float(number.replace(",", "")) * _MULTIPLIERS[suffix or ""]
@@ -0,0 +1,193 @@
+__all__ = ["jwt_expiry", "TokenManager"]
+
+import json
+import time
+import base64
+import logging
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from sotagents.http import HttpClient
+
+
+logger = logging.getLogger(__name__)
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Return the expiration time of a JWT as a Unix timestamp.
+
+    The signature is not verified, the token is only decoded to find out when
+    it has to be refreshed.
+
+    Returns:
+        Value of the `exp` claim or `None` if the token is not a JWT or has no
+        expiration time.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return None if exp is None else float(exp)
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenManager:
+    """Keeps the JWT access token fresh.
+
+    The access token is refreshed in the background `leeway` seconds before it
+    expires, so requests never wait for it or fail with an expired token. Only
+    when the token is about to expire the requests wait for the refresh. All
+    threads share a single refresh request.
+
+    New tokens are passed to `on_refresh` in a background thread, e.g. to save
+    them to the configuration file.
+
+    After a failed refresh no new refresh is made for `cooldown` seconds, the
+    requests meanwhile keep using the current token and explicit refreshes fail
+    with the same error.
+
+    The refresh endpoint takes `{"refresh": <refresh token>}` and returns the
+    new access token in `access` and, if the refresh tokens are rotated, the new
+    refresh token in `refresh`.
+    """
+
+    #: Default endpoint used to refresh the access token, relative to the API URL.
+    #: Configured with the `auth.refresh_url` setting.
+    REFRESH_URL = "/auth/token/refresh/"
+
+    def __init__(
+        self,
+        http: "HttpClient",
+        access: str,
+        refresh: Optional[str],
+        leeway: float = 60,
+        on_refresh: Optional[Callable[[str, Optional[str]], None]] = None,
+        refresh_url: Optional[str] = None,
+        cooldown: float = 30,
+    ):
+        """Initialize.
+
+        Args:
+            http: HTTP client used to send the refresh requests.
+            access: JWT access token.
+            refresh: JWT refresh token. The access token is never refreshed if
+                it's not provided.
+            leeway: Number of seconds before expiration when the token is
+                refreshed.
+            on_refresh: Callback called with the new access and refresh tokens.
+            refresh_url: Refresh endpoint. Defaults to `REFRESH_URL`.
+            cooldown: Number of seconds after a failed refresh during which no
+                new refresh is made.
+        """
+        self.http = http
+        self.leeway = leeway
+        self.on_refresh = on_refresh
+        self.refresh_url = refresh_url or self.REFRESH_URL
+        self.cooldown = cooldown
+        self._access = access
+        self._refresh = refresh
+        self._expires = jwt_expiry(access)
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+        # Failed refresh returned until the cooldown ends.
+        self._failed: Optional[Future] = None
+        self._failed_until = 0.0
+
+    @property
+    def access(self) -> str:
+        return self._access
+
+    @property
+    def expires(self) -> Optional[float]:
+        """Expiration time of the access token as a Unix timestamp."""
+        return self._expires
+
+    def token(self) -> str:
+        """Return a valid access token, refreshing it if needed.
+
+        Starts a background refresh when the token is close to expiration and
+        waits for the refresh only if the token is about to expire.
+        """
+        if self._refresh is None or self._expires is None:
+            return self._access
+        remaining = self._expires - time.time()
+        if remaining > self.leeway:
+            return self._access
+        future = self._start()
+        if remaining > min(5, self.leeway / 2):
+            # Still valid, keep using it while the refresh runs.
+            return self._access
+        try:
+            return future.result()
+        except Exception:
+            # Logged when the refresh failed.
+            return self._access
+
+    def refresh(self, stale: Optional[str] = None) -> str:
+        """Refresh the access token and wait for the new one.
+
+        Args:
+            stale: Token that was rejected by the server. If the token has been
+                refreshed in the meantime, the current token is returned
+                without a new refresh.
+
+        Returns:
+            New access token.
+        """
+        if self._refresh is None:
+            raise ValueError("Refresh token is not available.")
+        if stale is not None and stale != self._access:
+            return self._access
+        return self._start().result()
+
+    def _start(self) -> Future:
+        """Start a refresh or return the one already running.
+
+        During the cooldown after a failed refresh the failed one is returned.
+        """
+        with self._lock:
+            if self._pending is not None:
+                return self._pending
+            if self._failed is not None and time.monotonic() < self._failed_until:
+                return self._failed
+            future = self._pending = Future()
+        threading.Thread(
+            target=self._run, args=(future,), name="sotagents-token", daemon=True
+        ).start()
+        return future
+
+    def _run(self, future: Future):
+        try:
+            response = self.http.request(
+                method="post",
+                url=self.refresh_url,
+                data=json.dumps({"refresh": self._refresh}).encode("utf-8"),
+                authenticate=False,
+            )
+            access = response["access"]
+            refresh = response.get("refresh", self._refresh)
+        except Exception as e:
+            logger.warning(
+                "Failed to refresh token, retrying in %g seconds: %s", self.cooldown, e
+            )
+            with self._lock:
+                self._pending = None
+                self._failed = future
+                self._failed_until = time.monotonic() + self.cooldown
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._access = access
+            self._refresh = refresh
+            self._expires = jwt_expiry(access)
+            self._pending = None
+            self._failed = None
+        future.set_result(access)
+        if self.on_refresh is not None:
+            try:
+                self.on_refresh(access, refresh)
+            except Exception as e:
+                logger.warning("Failed to save refreshed token: %s", e)
@@ -0,0 +1,197 @@
+__all__ = ["BulkItem", "BulkReport", "BulkWriter", "idempotency_key"]
+
+import time
+import uuid
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from sotagents.errors import is_transient
+from sotagents.models import (
+    Model,
+    TaskCreateRequest,
+    DatasetCreateRequest,
+    MetricCreateRequest,
+    ResultCreateRequest,
+    EvaluationTableCreateRequest,
+)
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+#: Header used to send the idempotency key.
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def idempotency_key() -> str:
+    """Return a new idempotency key for a write.
+
+    Every write gets its own key, reused only for the retries of that write.
+    Keys derived from the request content would make the server drop identical
+    requests of the same run, e.g. duplicate result rows, and replay stale
+    responses when the same data is written again later.
+    """
+    return str(uuid.uuid4())
+
+
+@dataclass
+class BulkItem:
+    """Outcome of a single write.
+
+    Attributes:
+        index: Position of the request in the input.
+        request: Create request.
+        key: Idempotency key sent with every attempt of the request.
+        response: Created object if the write succeeded.
+        error: Error raised by the last attempt if the write failed.
+        attempts: Number of attempts made.
+    """
+
+    index: int
+    request: Model
+    key: str = field(default_factory=idempotency_key)
+    response: Optional[Model] = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkReport:
+    """Outcome of a bulk write, one item per request in input order."""
+
+    items: list[BulkItem] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def ok(self) -> bool:
+        return all(item.ok for item in self.items)
+
+    @property
+    def succeeded(self) -> list[BulkItem]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> list[BulkItem]:
+        return [item for item in self.items if not item.ok]
+
+
+class BulkWriter:
+    """Runs many create requests with bounded concurrency.
+
+    Every request is sent with its own `Idempotency-Key` header, the same for
+    all its attempts, so retries after timeouts or transient server errors
+    can't create duplicates.
+    Failures don't stop the other writes, they are recorded in the report.
+
+    Example:
+        >>> writer = BulkWriter(client, concurrency=16)
+        >>> report = writer.tasks(TaskCreateRequest(name=name) for name in names)
+        >>> for item in report.failed:
+        ...     print(item.request, item.error)
+    """
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        concurrency: Optional[int] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        """Initialize.
+
+        Args:
+            client: Client used for writing.
+            concurrency: Maximal number of concurrent requests. Defaults to the
+                concurrency of the client.
+            retries: Number of retries for transient errors.
+            backoff: Initial delay between retries in seconds, doubled after
+                every retry.
+        """
+        self.client = client
+        self.concurrency = concurrency or client.concurrency
+        self.retries = retries
+        self.backoff = backoff
+
+    def _write(self, method: Callable[..., Model], item: BulkItem, args: tuple):
+        delay = self.backoff
+        while True:
+            item.attempts += 1
+            try:
+                with self.client.http.extra_headers({IDEMPOTENCY_HEADER: item.key}):
+                    item.response = method(*args, item.request)
+                item.error = None
+                return
+            except Exception as e:
+                item.error = e
+                if item.attempts > self.retries or not is_transient(e):
+                    logger.warning("Bulk write %s failed: %s", item.index, e)
+                    return
+                time.sleep(delay)
+                delay *= 2
+
+    def run(
+        self,
+        method: Callable[..., Model],
+        requests: Iterable[Model],
+        *args: Any,
+    ) -> BulkReport:
+        """Call a client create method for every request.
+
+        Requests are consumed lazily, at most `2 * concurrency` are in flight at
+        any time.
+
+        Args:
+            method: Client create method, e.g. `client.task_add`.
+            requests: Iterable of create requests.
+            args: Arguments passed to the method before the request, e.g. the
+                evaluation table ID.
+
+        Returns:
+            BulkReport object.
+        """
+        report = BulkReport()
+        pending: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index, request in enumerate(requests):
+                item = BulkItem(index=index, request=request)
+                report.items.append(item)
+                pending.add(executor.submit(self._write, method, item, args))
+                if len(pending) >= 2 * self.concurrency:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        return report
+
+    def tasks(self, tasks: Iterable[TaskCreateRequest]) -> BulkReport:
+        """Create tasks."""
+        return self.run(self.client.task_add, tasks)
+
+    def datasets(self, datasets: Iterable[DatasetCreateRequest]) -> BulkReport:
+        """Create datasets."""
+        return self.run(self.client.dataset_add, datasets)
+
+    def evaluations(
+        self, evaluations: Iterable[EvaluationTableCreateRequest]
+    ) -> BulkReport:
+        """Create evaluation tables."""
+        return self.run(self.client.evaluation_create, evaluations)
+
+    def metrics(
+        self, evaluation_id: str, metrics: Iterable[MetricCreateRequest]
+    ) -> BulkReport:
+        """Add metrics to an evaluation table."""
+        return self.run(self.client.evaluation_metric_add, metrics, evaluation_id)
+
+    def results(
+        self, evaluation_id: str, results: Iterable[ResultCreateRequest]
+    ) -> BulkReport:
+        """Add results to an evaluation table."""
+        return self.run(self.client.evaluation_result_add, results, evaluation_id)
@@ -0,0 +1,133 @@
+__all__ = ["TTLCache"]
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread safe in-memory cache with per entry expiration.
+
+    Entries are evicted when they expire or, when the cache is full, in least
+    recently used order.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1024):
+        """Initialize.
+
+        Args:
+            ttl: Number of seconds after which an entry expires.
+            max_size: Maximal number of entries kept in the cache.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Values being computed by `get_or_set`, and a counter of removals so
+        # values computed while entries were removed are not cached.
+        self._inflight: dict[Hashable, Future] = {}
+        self._generation = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value or `default` if it's missing or expired."""
+        with self._lock:
+            item = self._data.get(key, None)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value in the cache.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl: Override the default time to live for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value or compute it with `factory` and cache it.
+
+        Concurrent calls for the same missing key call `factory` only once, the
+        other callers wait for its value or its error. A value computed while
+        entries were removed from the cache is returned but not cached, it may
+        be stale already.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            # The leader of an identical call might have just finished.
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            generation = self._generation
+        if not leader:
+            return future.result()
+
+        try:
+            value = factory()
+            with self._lock:
+                if generation == self._generation:
+                    self.set(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def delete(self, key: Hashable):
+        """Remove an entry from the cache if it exists."""
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove all entries whose key matches the predicate.
+
+        Returns:
+            Number of removed entries.
+        """
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
@@ -1,16 +1,39 @@
+import re
+import fnmatch
+import inspect
 import logging
 import functools
+import threading
+import contextlib
+from math import ceil
 from urllib import parse
-from typing import Optional
-
-from sotagents.config import config
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Type, Union
+
+from sotagents.auth import TokenManager
+from sotagents.config import Config, get_config
+from sotagents.cache import TTLCache
 from sotagents.http import HttpClient
+from sotagents.projection import Projection
+from sotagents.ratelimit import RateLimiter
+from sotagents.sync import (
+    DeltaSynchronizer,
+    ProgressCallback,
+    SyncResult,
+    SyncStateStore,
+    iter_sync_body,
+)
 from sotagents.errors import (
     HttpClientError,
     PydanticValidationError,
     ValidationError,
+    is_transient,
 )
 from sotagents.models import (
+    Model,
+    Page,
     Paper,
     Papers,
     Repository,
@@ -42,6 +65,7 @@ from sotagents.models import (
     Results,
     ResultCreateRequest,
     ResultUpdateRequest,
+    ResultSyncRequest,
     EvaluationTable,
     EvaluationTables,
     EvaluationTableCreateRequest,
@@ -50,40 +74,310 @@ from sotagents.models import (
     EvaluationTableSyncResponse,
 )
 
+if TYPE_CHECKING:
+    # Analysis depends on NumPy which is imported only when it's used.
+    from sotagents.analysis import Leaderboard, SotaProgression
+    from sotagents.mirror import Mirror
+
 
 logger = logging.getLogger(__name__)
 
+_TASK_LISTS = (
+    "/tasks/",
+    "/tasks/*/parents/",
+    "/tasks/*/children/",
+    "/areas/*/tasks/",
+    "/papers/*/tasks/",
+)
+_DATASET_LISTS = ("/datasets/", "/papers/*/datasets/")
+_LEADERBOARDS = "/tasks/*/leaderboards/"
+_EVALUATION_LISTS = (
+    "/evaluations/",
+    "/tasks/*/evaluations/",
+    "/datasets/*/evaluations/",
+    _LEADERBOARDS,
+)
+_RESULT_LISTS = ("/evaluations/{evaluation_id}/results/", "/papers/*/results/")
+
+#: Cached reads affected by every write method. Patterns are matched against the
+#: URLs of cached responses and are formatted with the method arguments.
+INVALIDATES: dict[str, tuple[str, ...]] = {
+    "task_add": _TASK_LISTS,
+    "task_update": ("/tasks/{task_id}/", *_TASK_LISTS),
+    "task_delete": ("/tasks/{task_id}/*", *_TASK_LISTS),
+    "dataset_add": _DATASET_LISTS,
+    "dataset_update": ("/datasets/{dataset_id}/", *_DATASET_LISTS),
+    "dataset_delete": ("/datasets/{dataset_id}/*", *_DATASET_LISTS),
+    "evaluation_create": _EVALUATION_LISTS,
+    "evaluation_update": ("/evaluations/{evaluation_id}/", *_EVALUATION_LISTS),
+    "evaluation_delete": (
+        "/evaluations/{evaluation_id}/*",
+        "/papers/*/results/",
+        *_EVALUATION_LISTS,
+    ),
+    "evaluation_metric_add": ("/evaluations/{evaluation_id}/metrics/", _LEADERBOARDS),
+    "evaluation_metric_update": (
+        "/evaluations/{evaluation_id}/metrics/",
+        "/evaluations/{evaluation_id}/metrics/{metric_id}/",
+        _LEADERBOARDS,
+    ),
+    "evaluation_metric_delete": (
+        "/evaluations/{evaluation_id}/metrics/",
+        "/evaluations/{evaluation_id}/metrics/{metric_id}/",
+        _LEADERBOARDS,
+    ),
+    "evaluation_result_add": (*_RESULT_LISTS, _LEADERBOARDS),
+    "evaluation_result_update": (
+        "/evaluations/{evaluation_id}/results/{result_id}/",
+        *_RESULT_LISTS,
+        _LEADERBOARDS,
+    ),
+    "evaluation_result_delete": (
+        "/evaluations/{evaluation_id}/results/{result_id}/",
+        *_RESULT_LISTS,
+        _LEADERBOARDS,
+    ),
+    "evaluation_synchronize": (
+        "/evaluations/*",
+        "/papers/*/results/",
+        *_EVALUATION_LISTS,
+    ),
+    "evaluation_synchronize_stream": (
+        "/evaluations/*",
+        "/papers/*/results/",
+        *_EVALUATION_LISTS,
+    ),
+}
+
+
+def invalidates(func):
+    """Invalidate the cached reads affected by a write method.
+
+    Cached responses are invalidated after the write finishes, even if it
+    failed, because the server might have applied it anyway.
+    """
+    signature = inspect.signature(func)
+    patterns = INVALIDATES[func.__name__]
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            self.invalidate(*(pattern.format(**arguments) for pattern in patterns))
+
+    return wrapper
+
+
+def _pages(fetch: Callable[[int], Page], page: int, concurrency: int) -> Iterator[Page]:
+    """Yield pages in order starting from `page`.
+
+    After the first page the number of pages is known, so up to `concurrency`
+    of the following pages are fetched at once. Pages added while iterating
+    are fetched one by one at the end.
+    """
+    result = fetch(page)
+    yield result
+    if concurrency > 1 and result.next_page is not None and len(result.results) > 0:
+        from concurrent.futures import ThreadPoolExecutor
+
+        last = ceil(result.count / len(result.results))
+        numbers = iter(range(result.next_page, last + 1))
+        with ThreadPoolExecutor(concurrency, thread_name_prefix="sotagents") as pool:
+            pending = deque(pool.submit(fetch, n) for n in islice(numbers, concurrency))
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    yield result
+                    if result.next_page is None:
+                        break
+                    for number in islice(numbers, 1):
+                        pending.append(pool.submit(fetch, number))
+            finally:
+                for future in pending:
+                    future.cancel()
+    page = result.next_page
+    while page is not None:
+        result = fetch(page)
+        yield result
+        page = result.next_page
+
+
+def validated(func):
+    """Raise `ValidationError` if a request or response of the method is invalid."""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except PydanticValidationError as e:
+            raise ValidationError(error=e)
+
+    return wrapper
+
 
 def handler(func):
+    @validated
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
+        manager = self.http.token_manager
+        token = None if manager is None else manager.access
         try:
             return func(self, *args, **kwargs)
         except HttpClientError as e:
-            if e.status_code == 401:
-                # Try to refresh the token and call the function again.
-                if self.http.authorization_method == self.http.Authorization.jwt:
-                    try:
-                        self.refresh()
-                        return func(self, *args, **kwargs)
-                    except Exception as e:
-                        logger.warning("Failed to refresh token: %s", e)
+            if e.status_code == 401 and manager is not None:
+                # Try to refresh the token and call the function again. Callers
+                # that failed with the same token share a single refresh.
+                try:
+                    self.refresh(stale=token)
+                except Exception as e:
+                    logger.warning("Failed to refresh token: %s", e)
+                else:
+                    return func(self, *args, **kwargs)
             raise
-        except PydanticValidationError as e:
-            raise ValidationError(error=e)
 
     return wrapper
 
 
 class PapersWithCodeClient:
-    """PapersWithCode client."""
+    """PapersWithCode client.
 
-    def __init__(self, token=None, url=None):
+    Server URL and performance settings (timeouts, connection pool size,
+    concurrency, retries, rate limit and caching) are read from the active
+    configuration profile when the client is created.
+    """
+
+    def __init__(
+        self,
+        token=None,
+        url=None,
+        cache_ttl: Optional[float] = None,
+        trusted: bool = False,
+        lazy: bool = False,
+        profile: Optional[str] = None,
+    ):
+        """Initialize.
+
+        Args:
+            token: PapersWithCode authentication token. If not provided, the JWT
+                tokens from the configuration profile are used and refreshed
+                automatically.
+            url: URL of the PapersWithCode server. Defaults to the URL from the
+                configuration profile.
+            cache_ttl: Cache GET responses for this many seconds. Writes made
+                through the client invalidate the cached responses they affect.
+                Defaults to the `cache.ttl` setting, responses are not cached if
+                it's not set or not positive.
+            trusted: Build models from server responses without validating them,
+                see `Model.construct_trusted`. Much faster for large pages, but
+                malformed responses are not detected.
+            lazy: Convert the results of paginated lists to models only when
+                they are accessed, see `LazyResults`.
+            profile: Configuration profile to use instead of the active one.
+        """
+        self.trusted = trusted
+        self.lazy = lazy
+        self._local = threading.local()
+        config = get_config() if profile is None else Config(profile=profile)
+        self.config = config
+        self.concurrency = config.concurrency
+        self.cache_dir = Path(config.cache_dir).expanduser()
         url = url or config.server_url
+        cache_ttl = config.cache_ttl if cache_ttl is None else cache_ttl
+        jwt = token is None and bool(config.token_access)
         self.http = HttpClient(
             url=f"{url}/api/v{config.api_version}",
-            token=token or "",
-            authorization_method=HttpClient.Authorization.token,
+            token=config.token_access if jwt else token or "",
+            authorization_method=(
+                HttpClient.Authorization.jwt if jwt else HttpClient.Authorization.token
+            ),
+            timeout=config.timeout,
+            max_connections=config.max_connections,
+            cache=TTLCache(ttl=cache_ttl) if cache_ttl and cache_ttl > 0 else None,
+            retries=config.retries,
+            backoff=config.retry_backoff,
+            rate_limiter=(
+                None if config.rate_limit is None else RateLimiter(config.rate_limit)
+            ),
+        )
+        if jwt:
+            self.http.token_manager = TokenManager(
+                self.http,
+                access=config.token_access,
+                refresh=config.token_refresh,
+                on_refresh=self.__save_tokens,
+                refresh_url=config.token_refresh_url,
+            )
+        self._leaderboards = TTLCache(ttl=config.leaderboard_ttl)
+        self._mirror: Optional["Mirror"] = None
+        self._mirror_lock = threading.Lock()
+
+    @property
+    def server_cache_dir(self) -> Path:
+        """Directory in the cache directory for the data of the server.
+
+        Local copies of server data (the mirror, the typeahead index and the
+        resolver memo) are kept in it, so that profiles of different servers
+        sharing the cache directory don't overwrite each other's data.
+        """
+        url = parse.urlsplit(self.http.url)
+        name = re.sub(r"[^\w.-]+", "_", url.netloc + url.path).strip("_")
+        return self.cache_dir / name
+
+    @property
+    def mirror(self) -> "Mirror":
+        """Local mirror in the server cache directory used by offline queries."""
+        if self._mirror is None:
+            with self._mirror_lock:
+                if self._mirror is None:
+                    from sotagents.mirror import Mirror
+
+                    self._mirror = Mirror(self)
+        return self._mirror
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all pooled connections."""
+        self.http.close()
+        if self._mirror is not None:
+            self._mirror.close()
+            self._mirror = None
+
+    def __save_tokens(self, access: str, refresh: Optional[str]):
+        self.config.token_access = access
+        self.config.token_refresh = refresh
+        self.config.save()
+
+    def refresh(self, stale: Optional[str] = None) -> str:
+        """Refresh the JWT access token.
+
+        Args:
+            stale: Token rejected by the server. No new refresh is made if the
+                token was already refreshed by another thread.
+
+        Returns:
+            New access token.
+        """
+        if self.http.token_manager is None:
+            raise ValueError("Client is not using JWT authentication.")
+        return self.http.token_manager.refresh(stale=stale)
+
+    def invalidate(self, *patterns: str):
+        """Drop cached responses and leaderboards matching the URL patterns.
+
+        Args:
+            patterns: Shell style URL patterns, e.g. `/tasks/*/evaluations/`.
+                Leaderboards of a task are cached as `/tasks/<id>/leaderboards/`.
+        """
+        self.http.invalidate(*patterns)
+        self._leaderboards.delete_where(
+            lambda key: any(fnmatch.fnmatchcase(key, p) for p in patterns)
         )
 
     @staticmethod
@@ -103,20 +397,193 @@ class PapersWithCodeClient:
             q = parse.parse_qs(p.query)
             return int(q.get("page", [1])[0])
 
-    @classmethod
-    def __page(cls, result, page_model):
+    def __model(self, model: Type[Model], data: dict) -> Model:
+        if self.trusted:
+            return model.construct_trusted(data)
+        return model(**data)
+
+    def __page(self, result, page_model):
         next_page = result["next"]
         if next_page is not None:
-            next_page = cls.__parse(next_page)
+            next_page = self.__parse(next_page)
         previous_page = result["previous"]
         if previous_page is not None:
-            previous_page = cls.__parse(previous_page)
-        return page_model(
-            count=result["count"],
-            next_page=next_page,
-            previous_page=previous_page,
-            results=result["results"],
+            previous_page = self.__parse(previous_page)
+        projection = getattr(self._local, "projection", None)
+        if projection is not None:
+            return page_model.construct(
+                count=result["count"],
+                next_page=next_page,
+                previous_page=previous_page,
+                results=projection(
+                    result["results"], page_model.__fields__["results"].type_
+                ),
+            )
+        if self.lazy:
+            return page_model.construct_lazy(
+                count=result["count"],
+                next_page=next_page,
+                previous_page=previous_page,
+                results=result["results"],
+                trusted=self.trusted,
+            )
+        return self.__model(
+            page_model,
+            {
+                "count": result["count"],
+                "next_page": next_page,
+                "previous_page": previous_page,
+                "results": result["results"],
+            },
+        )
+
+    @staticmethod
+    def iterate(
+        method: Callable[..., Page], *args, concurrency: int = 1, **kwargs
+    ) -> Iterator[Model]:
+        """Iterate over the items on all pages of a paginated list method.
+
+        Example:
+            >>> for paper in client.iterate(client.paper_list, q="transformer"):
+            ...     print(paper.title)
+
+        Args:
+            method: Paginated list method of the client, e.g. `client.paper_list`.
+            args: Positional arguments passed to the method.
+            concurrency: Number of pages fetched at once. Items are still
+                yielded in order.
+            kwargs: Keyword arguments passed to the method. If `page` is provided
+                iteration starts from that page.
+
+        Yields:
+            Items from all pages.
+        """
+        page = kwargs.pop("page", 1)
+        for result in _pages(
+            lambda number: method(*args, page=number, **kwargs), page, concurrency
+        ):
+            yield from result.results
+
+    @contextlib.contextmanager
+    def raw(self, fields: Optional[list[str]] = None, tuples: bool = False):
+        """Return raw items from paginated list methods instead of models.
+
+        Inside the context the `results` of pages returned by the list methods
+        called from the current thread are plain dictionaries or tuples and no
+        models are built. Pagination, error handling and token refresh work the
+        same as for models.
+
+        Example:
+            >>> with client.raw(["id", "title"], tuples=True):
+            ...     page = client.paper_list(q="transformer")
+            >>> page.results[0]
+            ('attention-is-all-you-need', 'Attention Is All You Need')
+
+        Args:
+            fields: Fields to keep, nested fields are separated with a dot, e.g.
+                `paper.title`. All fields are kept if not provided.
+            tuples: Return tuples of field values in the order of `fields`, or
+                of the model fields if `fields` is not provided.
+        """
+        previous = getattr(self._local, "projection", None)
+        self._local.projection = Projection(fields, tuples=tuples)
+        try:
+            yield
+        finally:
+            self._local.projection = previous
+
+    def iterate_raw(
+        self,
+        method: Callable[..., Page],
+        *args,
+        fields: Optional[list[str]] = None,
+        tuples: bool = False,
+        concurrency: int = 1,
+        **kwargs,
+    ) -> Iterator[Union[dict, tuple]]:
+        """Iterate over raw items on all pages of a paginated list method.
+
+        Same as `iterate`, but yields dictionaries or tuples, see `raw`. With
+        the response cache enabled the yielded dictionaries are shared with the
+        cache and must not be modified.
+
+        Example:
+            >>> rows = client.iterate_raw(client.paper_list, fields=["id", "title"])
+
+        Args:
+            method: Paginated list method of the client, e.g. `client.paper_list`.
+            args: Positional arguments passed to the method.
+            fields: Fields to keep, all fields are kept if not provided.
+            tuples: Yield tuples of field values instead of dictionaries.
+            concurrency: Number of pages fetched at once.
+            kwargs: Keyword arguments passed to the method.
+
+        Yields:
+            Items from all pages.
+        """
+        page = kwargs.pop("page", 1)
+
+        def fetch(number: int) -> Page:
+            # Only the list call is made in raw mode, the caller's code between
+            # items runs with the usual models.
+            with self.raw(fields, tuples=tuples):
+                return method(*args, page=number, **kwargs)
+
+        for result in _pages(fetch, page, concurrency):
+            yield from result.results
+
+    def __offline_papers(
+        self, page: int, items_per_page: int, search: bool = False, **filters
+    ) -> dict:
+        """Return a page of mirrored papers in the format of the API."""
+        count, papers = self.mirror.papers(
+            limit=items_per_page, offset=(page - 1) * items_per_page, **filters
         )
+        if search:
+            # Repositories of the papers are not joined in, the server search
+            # only adds the official one anyway.
+            papers = [
+                {"paper": paper, "repository": None, "is_official": False}
+                for paper in papers
+            ]
+        return {
+            "count": count,
+            "next": f"?page={page + 1}" if page * items_per_page < count else None,
+            "previous": f"?page={page - 1}" if page > 1 else None,
+            "results": papers,
+        }
+
+    def __papers_mirrored(self) -> bool:
+        """Check if the papers were synced to the local mirror."""
+        if self._mirror is None:
+            from sotagents.mirror import Mirror
+
+            # Don't create an empty mirror just to find out.
+            if not Mirror.default_path(self).exists():
+                return False
+        return "papers" in self.mirror.watermarks()
+
+    def __get_papers(
+        self,
+        path: str,
+        params: dict[str, str],
+        timeout: Optional[float],
+        offline: bool,
+        fallback: bool,
+        **filters,
+    ) -> dict:
+        page = int(params["page"])
+        items_per_page = int(params["items_per_page"])
+        search = path == "/search/"
+        if offline:
+            return self.__offline_papers(page, items_per_page, search, **filters)
+        try:
+            return self.http.get(path, params=params, timeout=timeout)
+        except HttpClientError as e:
+            if not fallback or not is_transient(e) or not self.__papers_mirrored():
+                raise
+            logger.warning("Answering %s from the local mirror: %s", path, e)
+            return self.__offline_papers(page, items_per_page, search, **filters)
 
     @handler
     def search(
@@ -124,6 +591,8 @@ class PapersWithCodeClient:
         q: Optional[str] = None,
         page: int = 1,
         items_per_page: int = 50,
+        offline: bool = False,
+        fallback: bool = False,
     ) -> PaperRepos:
         """Search in a similar fashion to the frontpage search.
 
@@ -131,6 +600,11 @@ class PapersWithCodeClient:
             q: Filter papers by querying the paper title and abstract.
             page: Desired page.
             items_per_page: Desired number of items per page.
+            offline: Search the papers in the local mirror (see `Mirror`)
+                instead of the server. Results are ranked by relevance and
+                have no repositories.
+            fallback: Search the local mirror if the server can't be reached
+                or is overloaded and the papers were synced to the mirror.
 
         Returns:
             PaperRepos object.
@@ -140,7 +614,9 @@ class PapersWithCodeClient:
         if q is not None:
             params["q"] = q
         return self.__page(
-            self.http.get("/search/", params=params, timeout=timeout),
+            self.__get_papers(
+                "/search/", params, timeout, offline=offline, fallback=fallback, q=q
+            ),
             PaperRepos,
         )
 
@@ -154,6 +630,8 @@ class PapersWithCodeClient:
         ordering: Optional[str] = None,
         page: int = 1,
         items_per_page: int = 50,
+        offline: bool = False,
+        fallback: bool = False,
     ) -> Papers:
         """Return a paginated list of papers.
 
@@ -165,6 +643,11 @@ class PapersWithCodeClient:
             ordering: Which field to use when ordering the results.
             page: Desired page.
             items_per_page: Desired number of items per page.
+            offline: Query the papers in the local mirror (see `Mirror`)
+                instead of the server. Papers matching `q` are ranked by
+                relevance unless `ordering` is given.
+            fallback: Query the local mirror if the server can't be reached or
+                is overloaded and the papers were synced to the mirror.
 
         Returns:
             Papers object.
@@ -184,7 +667,19 @@ class PapersWithCodeClient:
         if ordering is not None:
             params["ordering"] = ordering
         return self.__page(
-            self.http.get("/papers/", params=params, timeout=timeout), Papers
+            self.__get_papers(
+                "/papers/",
+                params,
+                timeout,
+                offline=offline,
+                fallback=fallback,
+                q=q,
+                arxiv_id=arxiv_id,
+                title=title,
+                abstract=abstract,
+                ordering=ordering,
+            ),
+            Papers,
         )
 
     @handler
@@ -197,7 +692,7 @@ class PapersWithCodeClient:
         Returns:
             Paper object.
         """
-        return Paper(**self.http.get(f"/papers/{paper_id}/"))
+        return self.__model(Paper, self.http.get(f"/papers/{paper_id}/"))
 
     @handler
     def paper_dataset_list(
@@ -386,7 +881,7 @@ class PapersWithCodeClient:
         Returns:
             Repository object.
         """
-        return Repository(**self.http.get(f"/repositories/{owner}/{name}/"))
+        return self.__model(Repository, self.http.get(f"/repositories/{owner}/{name}/"))
 
     @handler
     def repository_paper_list(
@@ -454,7 +949,7 @@ class PapersWithCodeClient:
         Returns:
             Author object.
         """
-        return Author(**self.http.get(f"/authors/{author_id}/"))
+        return self.__model(Author, self.http.get(f"/authors/{author_id}/"))
 
     @handler
     def author_paper_list(
@@ -519,7 +1014,7 @@ class PapersWithCodeClient:
         Returns:
             Conference object.
         """
-        return Conference(**self.http.get(f"/conferences/{conference_id}/"))
+        return self.__model(Conference, self.http.get(f"/conferences/{conference_id}/"))
 
     @handler
     def proceeding_list(
@@ -557,10 +1052,9 @@ class PapersWithCodeClient:
         Returns:
             Proceeding object.
         """
-        return Proceeding(
-            **self.http.get(
-                f"/conferences/{conference_id}/proceedings/{proceeding_id}/"
-            )
+        return self.__model(
+            Proceeding,
+            self.http.get(f"/conferences/{conference_id}/proceedings/{proceeding_id}/"),
         )
 
     @handler
@@ -635,7 +1129,7 @@ class PapersWithCodeClient:
         Returns:
             Area object.
         """
-        return Area(**self.http.get(f"/areas/{area_id}/"))
+        return self.__model(Area, self.http.get(f"/areas/{area_id}/"))
 
     @handler
     def area_task_list(
@@ -703,9 +1197,10 @@ class PapersWithCodeClient:
         Returns:
             Task object.
         """
-        return Task(**self.http.get(f"/tasks/{task_id}/"))
+        return self.__model(Task, self.http.get(f"/tasks/{task_id}/"))
 
     @handler
+    @invalidates
     def task_add(self, task: TaskCreateRequest) -> Task:
         """Add a task.
 
@@ -715,9 +1210,10 @@ class PapersWithCodeClient:
         Returns:
             Created task.
         """
-        return Task(**self.http.post("/tasks/", data=task))
+        return self.__model(Task, self.http.post("/tasks/", data=task))
 
     @handler
+    @invalidates
     def task_update(self, task_id: str, task: TaskUpdateRequest) -> Task:
         """Update a task.
 
@@ -728,9 +1224,10 @@ class PapersWithCodeClient:
         Returns:
             Updated task.
         """
-        return Task(**self.http.patch(f"/tasks/{task_id}/", data=task))
+        return self.__model(Task, self.http.patch(f"/tasks/{task_id}/", data=task))
 
     @handler
+    @invalidates
     def task_delete(self, task_id: str):
         """Delete a task.
 
@@ -828,6 +1325,42 @@ class PapersWithCodeClient:
             EvaluationTables,
         )
 
+    def task_leaderboards(
+        self,
+        task_id: str,
+        refresh: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> list["Leaderboard"]:
+        """Return leaderboards for all evaluation tables of a selected task.
+
+        Evaluation tables, their metrics and results and the papers referenced by
+        the results are fetched concurrently and joined into one columnar
+        leaderboard per evaluation table. SOTA ranks take `Metric.is_loss` into
+        account. Leaderboards are cached for `cache.leaderboard_ttl` seconds or until
+        a write made through the client changes the evaluation tables. Concurrent
+        calls for the same task fetch the leaderboards once.
+
+        Args:
+            task_id: ID of the task.
+            refresh: Ignore the cached leaderboards and fetch them again.
+            concurrency: Maximal number of concurrent requests. Defaults to the
+                `performance.concurrency` setting.
+
+        Returns:
+            List of leaderboards.
+        """
+        from sotagents.analysis import materialize_leaderboards
+
+        key = f"/tasks/{task_id}/leaderboards/"
+        if refresh:
+            self._leaderboards.delete(key)
+        return self._leaderboards.get_or_set(
+            key,
+            lambda: materialize_leaderboards(
+                self, task_id, concurrency=concurrency or self.concurrency
+            ),
+        )
+
     @handler
     def dataset_list(
         self,
@@ -877,9 +1410,10 @@ class PapersWithCodeClient:
         Returns:
             Dataset object.
         """
-        return Dataset(**self.http.get(f"/datasets/{dataset_id}/"))
+        return self.__model(Dataset, self.http.get(f"/datasets/{dataset_id}/"))
 
     @handler
+    @invalidates
     def dataset_add(self, dataset: DatasetCreateRequest) -> Dataset:
         """Add a dataset.
 
@@ -889,9 +1423,10 @@ class PapersWithCodeClient:
         Returns:
             Created dataset.
         """
-        return Dataset(**self.http.post("/datasets/", data=dataset))
+        return self.__model(Dataset, self.http.post("/datasets/", data=dataset))
 
     @handler
+    @invalidates
     def dataset_update(self, dataset_id: str, dataset: DatasetUpdateRequest) -> Dataset:
         """Update a dataset.
 
@@ -902,9 +1437,12 @@ class PapersWithCodeClient:
         Returns:
             Updated dataset.
         """
-        return Dataset(**self.http.patch(f"/datasets/{dataset_id}/", data=dataset))
+        return self.__model(
+            Dataset, self.http.patch(f"/datasets/{dataset_id}/", data=dataset)
+        )
 
     @handler
+    @invalidates
     def dataset_delete(self, dataset_id: str):
         """Delete a dataset.
 
@@ -985,7 +1523,7 @@ class PapersWithCodeClient:
         Returns:
             Method object.
         """
-        return Method(**self.http.get(f"/methods/{method_id}/"))
+        return self.__model(Method, self.http.get(f"/methods/{method_id}/"))
 
     @handler
     def evaluation_list(
@@ -1017,9 +1555,12 @@ class PapersWithCodeClient:
         Returns:
             Evaluation table object.
         """
-        return EvaluationTable(**self.http.get(f"/evaluations/{evaluation_id}/"))
+        return self.__model(
+            EvaluationTable, self.http.get(f"/evaluations/{evaluation_id}/")
+        )
 
     @handler
+    @invalidates
     def evaluation_create(
         self,
         evaluation: EvaluationTableCreateRequest,
@@ -1032,9 +1573,12 @@ class PapersWithCodeClient:
         Returns:
             The new created evaluation table.
         """
-        return EvaluationTable(**self.http.post("/evaluations/", data=evaluation))
+        return self.__model(
+            EvaluationTable, self.http.post("/evaluations/", data=evaluation)
+        )
 
     @handler
+    @invalidates
     def evaluation_update(
         self,
         evaluation_id: str,
@@ -1049,11 +1593,13 @@ class PapersWithCodeClient:
         Returns:
             The updated evaluation table.
         """
-        return EvaluationTable(
-            **self.http.patch(f"/evaluations/{evaluation_id}/", data=evaluation)
+        return self.__model(
+            EvaluationTable,
+            self.http.patch(f"/evaluations/{evaluation_id}/", data=evaluation),
         )
 
     @handler
+    @invalidates
     def evaluation_delete(self, evaluation_id: str):
         """Delete an evaluation table.
 
@@ -1096,11 +1642,12 @@ class PapersWithCodeClient:
         Returns:
             Requested metric.
         """
-        return Metric(
-            **self.http.get(f"/evaluations/{evaluation_id}/metrics/{metric_id}/")
+        return self.__model(
+            Metric, self.http.get(f"/evaluations/{evaluation_id}/metrics/{metric_id}/")
         )
 
     @handler
+    @invalidates
     def evaluation_metric_add(
         self,
         evaluation_id: str,
@@ -1115,11 +1662,13 @@ class PapersWithCodeClient:
         Returns:
             Created metric.
         """
-        return Metric(
-            **self.http.post(f"/evaluations/{evaluation_id}/metrics/", data=metric)
+        return self.__model(
+            Metric,
+            self.http.post(f"/evaluations/{evaluation_id}/metrics/", data=metric),
         )
 
     @handler
+    @invalidates
     def evaluation_metric_update(
         self,
         evaluation_id: str,
@@ -1136,14 +1685,16 @@ class PapersWithCodeClient:
         Returns:
             Updated metric.
         """
-        return Metric(
-            **self.http.patch(
+        return self.__model(
+            Metric,
+            self.http.patch(
                 f"/evaluations/{evaluation_id}/metrics/{metric_id}/",
                 data=metric,
-            )
+            ),
         )
 
     @handler
+    @invalidates
     def evaluation_metric_delete(self, evaluation_id: str, metric_id: str):
         """Delete a metrics from the evaluation table.
 
@@ -1176,6 +1727,25 @@ class PapersWithCodeClient:
             Results,
         )
 
+    def evaluation_progression(self, evaluation_id: str) -> "SotaProgression":
+        """Return the best score over time for all metrics of an evaluation table.
+
+        The returned progression can be updated incrementally by adding new
+        results with `SotaProgression.add`.
+
+        Args:
+            evaluation_id: ID of the evaluation table.
+
+        Returns:
+            SotaProgression object.
+        """
+        from sotagents.analysis import SotaProgression
+
+        progression = SotaProgression(
+            metrics=self.iterate(self.evaluation_metric_list, evaluation_id)
+        )
+        return progression.add(self.iterate(self.evaluation_result_list, evaluation_id))
+
     @handler
     def evaluation_result_get(self, evaluation_id: str, result_id: str) -> Result:
         """Get a result from the evaluation table.
@@ -1187,11 +1757,12 @@ class PapersWithCodeClient:
         Returns:
             Requested result.
         """
-        return Result(
-            **self.http.get(f"/evaluations/{evaluation_id}/results/{result_id}/")
+        return self.__model(
+            Result, self.http.get(f"/evaluations/{evaluation_id}/results/{result_id}/")
         )
 
     @handler
+    @invalidates
     def evaluation_result_add(
         self,
         evaluation_id: str,
@@ -1206,11 +1777,13 @@ class PapersWithCodeClient:
         Returns:
             Created result.
         """
-        return Result(
-            **self.http.post(f"/evaluations/{evaluation_id}/results/", data=result)
+        return self.__model(
+            Result,
+            self.http.post(f"/evaluations/{evaluation_id}/results/", data=result),
         )
 
     @handler
+    @invalidates
     def evaluation_result_update(
         self,
         evaluation_id: str,
@@ -1227,14 +1800,16 @@ class PapersWithCodeClient:
         Returns:
             Updated result.
         """
-        return Result(
-            **self.http.patch(
+        return self.__model(
+            Result,
+            self.http.patch(
                 f"/evaluations/{evaluation_id}/results/{result_id}/",
                 data=result,
-            )
+            ),
         )
 
     @handler
+    @invalidates
     def evaluation_result_delete(self, evaluation_id: str, result_id: str):
         """Delete a result from the evaluation table.
 
@@ -1245,10 +1820,79 @@ class PapersWithCodeClient:
         self.http.delete(f"/evaluations/{evaluation_id}/results/{result_id}/")
 
     @handler
+    @invalidates
     def evaluation_synchronize(
         self,
         evaluation: EvaluationTableSyncRequest,
     ) -> EvaluationTableSyncResponse:
         d = self.http.post("/rpc/evaluation-synchronize/", data=evaluation)
         d["results"] = [result for result in d["results"]]
-        return EvaluationTableSyncResponse(**d)
+        return self.__model(EvaluationTableSyncResponse, d)
+
+    @validated
+    @invalidates
+    def evaluation_synchronize_stream(
+        self,
+        evaluation: EvaluationTableSyncRequest,
+        results: Iterable[ResultSyncRequest],
+        total: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        timeout: float = 300,
+    ) -> EvaluationTableSyncResponse:
+        """Synchronize a large evaluation table streaming the rows.
+
+        The request body is encoded incrementally from `results`, so rows can be
+        produced by a generator and client memory stays bounded by the chunk
+        size instead of the table size.
+
+        The synchronization always replaces the whole table, so `results` must
+        yield all rows of the table. Because a generator cannot be replayed the
+        request is never retried, not even when it's rejected with 401 because
+        the access token expired. The error is raised and the token is not
+        refreshed.
+
+        Args:
+            evaluation: Evaluation table with the table fields and metrics. Rows
+                in `evaluation.results` are sent before the rows from `results`.
+            results: Iterable of result rows.
+            total: Total number of rows, passed to the progress callback. If not
+                provided and `results` has a length it's used.
+            progress: Callback called with the number of rows sent so far and
+                the total number of rows.
+            timeout: How many seconds to wait for the server response.
+
+        Returns:
+            Synchronized evaluation table.
+        """
+        if total is None and hasattr(results, "__len__"):
+            total = len(evaluation.results) + len(results)
+        d = self.http.post(
+            "/rpc/evaluation-synchronize/",
+            data=iter_sync_body(evaluation, results, total=total, progress=progress),
+            timeout=timeout,
+        )
+        return self.__model(EvaluationTableSyncResponse, d)
+
+    def evaluation_synchronize_delta(
+        self,
+        evaluation: EvaluationTableSyncRequest,
+        store: Optional[SyncStateStore] = None,
+        force: bool = False,
+    ) -> SyncResult:
+        """Synchronize an evaluation table sending only the rows that changed.
+
+        Content hashes of the last synchronized state are kept locally. If
+        nothing changed no request is made, if only existing rows changed or
+        were removed the per-result endpoints are used and otherwise the full
+        table is synchronized. See `DeltaSynchronizer` for details.
+
+        Args:
+            evaluation: Evaluation table sync request.
+            store: Synchronization state store. Defaults to the store in the
+                configuration directory.
+            force: Always synchronize the full table.
+
+        Returns:
+            SyncResult object.
+        """
+        return DeltaSynchronizer(self, store=store).synchronize(evaluation, force=force)
@@ -1,9 +1,15 @@
 import json
+from typing import Optional
+
 import rich
-from typer import Typer
+from typer import Option, Typer
 
-from sotagents import errors
-from sotagents.config import config
+from sotagents import consts, errors
+from sotagents.enums import ConsoleFormat
+from sotagents.table import Column
+from sotagents.config import get_config, use_profile
+from sotagents.commands import entities
+from sotagents.commands.output import get_writer, output_format, set_format
 
 
 config_app = Typer(name="config", help="Configuration management.")
@@ -12,7 +18,9 @@ config_app = Typer(name="config", help="Configuration management.")
 @config_app.command(name="list")
 def list_values():
     """List all configuration values."""
-    if config.format == config.Format.text:
+    config = get_config()
+    format = output_format()
+    if format == config.Format.text:
         for i, (key, entries) in enumerate(config.entries.items()):
             if i > 0:
                 rich.print()
@@ -20,7 +28,7 @@ def list_values():
             for entry in entries:
                 rich.print(f"[green]{entry.key}[/]: {entry.value}")
 
-    elif config.format == config.Format.json:
+    elif format == config.Format.json:
         rich.print(
             json.dumps(
                 {
@@ -30,11 +38,19 @@ def list_values():
                 indent=2,
             )
         )
+    else:
+        with get_writer(format, fields=["section", "key", "value"]) as writer:
+            for section, entries in config.entries.items():
+                for entry in entries:
+                    writer.write(
+                        {"section": section, "key": entry.key, "value": entry.value}
+                    )
 
 
 @config_app.command(name="set")
 def set_value(key: str, value: str):
     """Set a configuration key."""
+    config = get_config()
     try:
         if key.count(".") != 1:
             raise ValueError(
@@ -58,5 +74,189 @@ def set_value(key: str, value: str):
     list_values()
 
 
+@config_app.command(name="profiles")
+def list_profiles():
+    """List configuration profiles."""
+    config = get_config()
+    format = output_format()
+    if format == config.Format.text:
+        for profile in config.profiles:
+            marker = "*" if profile == config.profile else " "
+            rich.print(f"{marker} [green]{profile}[/]")
+    elif format == config.Format.json:
+        rich.print(json.dumps({"active": config.profile, "profiles": config.profiles}))
+    else:
+        with get_writer(format, fields=["profile", "active"]) as writer:
+            for profile in config.profiles:
+                writer.write({"profile": profile, "active": profile == config.profile})
+
+
+daemon_app = Typer(
+    name="daemon", help="Background process that runs commands with a warm client."
+)
+
+
+@daemon_app.command(name="start")
+def daemon_start(
+    idle_timeout: Optional[float] = Option(
+        None,
+        "--idle-timeout",
+        help="Seconds without requests before stopping. Defaults to the "
+        "daemon.idle_timeout setting.",
+    ),
+):
+    """Run the daemon of the active profile in the foreground."""
+    from sotagents.daemon import serve
+
+    config = get_config()
+    serve(
+        config.profile,
+        idle_timeout=(
+            config.daemon_idle_timeout if idle_timeout is None else idle_timeout
+        ),
+    )
+
+
+@daemon_app.command(name="stop")
+def daemon_stop():
+    """Stop the daemon of the active profile."""
+    from sotagents.daemon import request
+
+    if request(get_config().profile, {"op": "stop"}) is None:
+        rich.print("Daemon is not running.")
+
+
+@daemon_app.command(name="status")
+def daemon_status():
+    """Show the status of the daemon of the active profile."""
+    from sotagents.daemon import request
+
+    config = get_config()
+    status = request(config.profile, {"op": "status"})
+    if output_format() != config.Format.text:
+        print(json.dumps(status))
+    elif status is None:
+        rich.print("Daemon is not running.")
+    else:
+        for key, value in status.items():
+            rich.print(f"[green]{key}[/]: {value}")
+
+
+mirror_app = Typer(name="mirror", help="Local SQLite mirror of the catalogue.")
+
+MIRROR_FIELDS = ("table", "full", "fetched", "deleted", "watermark", "seconds")
+MIRROR_COLUMNS = [
+    Column(title="Table", path="table"),
+    Column(title="Full", path="full", align=Column.Align.center),
+    Column(title="Fetched", path="fetched", align=Column.Align.right),
+    Column(title="Deleted", path="deleted", align=Column.Align.right),
+    Column(title="Watermark", path="watermark"),
+    Column(title="Seconds", path=lambda stats: f"{stats.seconds:.1f}"),
+]
+
+
+@mirror_app.command(name="sync")
+def mirror_sync(
+    tables: Optional[list[str]] = Option(
+        None, "--table", "-t", help="Table to sync, can be repeated."
+    ),
+    full: bool = Option(False, "--full", help="Fetch all rows."),
+    results: bool = Option(True, help="Sync results of the evaluation tables."),
+    path: Optional[str] = Option(
+        None,
+        help="Database file, defaults to mirror.sqlite in the cache directory of the"
+        " server.",
+    ),
+):
+    """Sync the local mirror with the server."""
+    from sotagents.client import PapersWithCodeClient
+    from sotagents.mirror import Mirror
+
+    with (
+        PapersWithCodeClient(trusted=True) as client,
+        Mirror(client, path=path) as mirror,
+    ):
+        report = mirror.sync(tables or None, full=full, results=results)
+    with get_writer(
+        output_format(), columns=MIRROR_COLUMNS, fields=list(MIRROR_FIELDS)
+    ) as writer:
+        writer.write_all(report)
+
+
 app = Typer(name="pwc", help="PapersWithCode client.")
+
+
+@app.command(name="proxy")
+def proxy(
+    host: str = Option("127.0.0.1", help="Address to listen on."),
+    port: int = Option(8765, help="Port to listen on."),
+    upstream: Optional[str] = Option(
+        None, help="Upstream server URL. Defaults to the server.url setting."
+    ),
+    ttl: Optional[float] = Option(
+        None,
+        help="Seconds GET responses are cached. Defaults to the cache.ttl "
+        "setting or 60.",
+    ),
+    rate_limit: Optional[float] = Option(
+        None,
+        help="Upstream requests per second of all clients. Defaults to the "
+        "performance.rate_limit setting.",
+    ),
+):
+    """Run a local caching proxy shared by all processes on the host."""
+    import logging
+
+    from sotagents.proxy import CachingProxy
+
+    config = get_config()
+    if config.debug:
+        logging.basicConfig(level=logging.INFO)
+    server = CachingProxy(
+        upstream=upstream or config.server_url,
+        ttl=ttl if ttl is not None else config.cache_ttl or 60,
+        rate_limit=rate_limit if rate_limit is not None else config.rate_limit,
+        max_connections=config.max_connections,
+        timeout=max(config.timeout, 60),
+    )
+    rich.print(f"Proxying [green]{server.upstream}[/] on http://{host}:{port}")
+    try:
+        server.serve(host, port)
+    except KeyboardInterrupt:
+        pass
+
+
 app.add_typer(config_app, name="config")
+app.add_typer(daemon_app, name="daemon")
+app.add_typer(mirror_app, name="mirror")
+app.add_typer(entities.papers_app, name="papers")
+app.add_typer(entities.repositories_app, name="repositories")
+app.add_typer(entities.authors_app, name="authors")
+app.add_typer(entities.conferences_app, name="conferences")
+app.add_typer(entities.tasks_app, name="tasks")
+app.add_typer(entities.datasets_app, name="datasets")
+app.add_typer(entities.methods_app, name="methods")
+app.add_typer(entities.evaluations_app, name="evaluations")
+
+
+@app.callback()
+def main(
+    profile: Optional[str] = Option(
+        None,
+        "--profile",
+        "-p",
+        envvar=consts.PROFILE_ENV_VAR,
+        help="Configuration profile.",
+    ),
+    format: Optional[ConsoleFormat] = Option(
+        None,
+        "--format",
+        "-f",
+        help="Output format, defaults to the configured one.",
+    ),
+):
+    """PapersWithCode client."""
+    # The daemon passes the profile of every command, it stays loaded.
+    if profile is not None and profile != get_config().profile:
+        use_profile(profile)
+    set_format(format)
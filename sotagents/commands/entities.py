@@ -0,0 +1,726 @@
+__all__ = [
+    "papers_app",
+    "repositories_app",
+    "authors_app",
+    "conferences_app",
+    "tasks_app",
+    "datasets_app",
+    "methods_app",
+    "evaluations_app",
+    "share_client",
+]
+
+import contextlib
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+from typer import Argument, Option, Typer
+
+from sotagents.table import Column
+from sotagents.enums import ConsoleFormat
+from sotagents.commands.output import get_writer, output_format
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+PAPER = [
+    Column(title="ID", path="id"),
+    Column(title="Title", path="title"),
+    Column(title="arXiv", path="arxiv_id"),
+    Column(title="Published", path="published"),
+]
+PAPER_REPO = [
+    Column(title="Paper", path="paper.id"),
+    Column(title="Title", path="paper.title"),
+    Column(
+        title="Repository",
+        path=lambda item: "" if item.repository is None else item.repository.url,
+    ),
+    Column(title="Official", path="is_official", align=Column.Align.center),
+]
+REPOSITORY = [
+    Column(title="URL", path="url"),
+    Column(title="Stars", path="stars", align=Column.Align.right),
+    Column(title="Framework", path="framework"),
+    Column(title="Official", path="is_official", align=Column.Align.center),
+]
+AUTHOR = [
+    Column(title="ID", path="id"),
+    Column(title="Full name", path="full_name"),
+]
+CONFERENCE = [
+    Column(title="ID", path="id"),
+    Column(title="Name", path="name"),
+]
+PROCEEDING = [
+    Column(title="ID", path="id"),
+    Column(title="Year", path="year", align=Column.Align.right),
+    Column(title="Month", path="month", align=Column.Align.right),
+]
+TASK = [
+    Column(title="ID", path="id"),
+    Column(title="Name", path="name"),
+]
+DATASET = [
+    Column(title="ID", path="id"),
+    Column(title="Name", path="name"),
+    Column(title="Full name", path="full_name"),
+]
+METHOD = [
+    Column(title="ID", path="id"),
+    Column(title="Name", path="name"),
+    Column(title="Full name", path="full_name"),
+    Column(title="Paper", path="paper"),
+]
+EVALUATION = [
+    Column(title="ID", path="id"),
+    Column(title="Task", path="task"),
+    Column(title="Dataset", path="dataset"),
+]
+METRIC = [
+    Column(title="ID", path="id"),
+    Column(title="Name", path="name"),
+    Column(title="Loss", path="is_loss", align=Column.Align.center),
+]
+RESULT = [
+    Column(title="ID", path="id"),
+    Column(title="Methodology", path="methodology"),
+    Column(title="Paper", path="paper"),
+    Column(title="Best metric", path="best_metric"),
+    Column(title="Rank", path="best_rank", align=Column.Align.right),
+]
+
+# Options shared by all list commands.
+ALL = Option(False, "--all", "-a", help="Stream items from all pages.")
+PAGE = Option(1, "--page", help="Page to show, or the first page with --all.")
+ITEMS_PER_PAGE = Option(50, "--items-per-page", "-n", help="Items per page.")
+CONCURRENCY = Option(
+    None,
+    "--concurrency",
+    "-c",
+    help="Pages fetched at once with --all. Defaults to performance.concurrency.",
+)
+FIELDS = Option(
+    None,
+    "--field",
+    "-F",
+    help="Output only this field, can be repeated. Nested fields use a dot.",
+)
+QUERY = Option(None, "--query", "-q", help="Search query.")
+ORDERING = Option(None, "--ordering", help="Field used to order the results.")
+OFFLINE = Option(
+    False, "--offline", help="Query the local mirror, see `pwc mirror sync`."
+)
+
+
+# Client kept open between the commands, used by the daemon.
+_shared: Optional["PapersWithCodeClient"] = None
+
+
+def share_client(client: Optional["PapersWithCodeClient"]):
+    """Run all following commands with the client instead of a new one."""
+    global _shared
+    _shared = client
+
+
+@contextlib.contextmanager
+def _client() -> Iterator["PapersWithCodeClient"]:
+    if _shared is not None:
+        yield _shared
+        return
+    # Imported here so the commands that don't talk to the server start fast.
+    from sotagents.client import PapersWithCodeClient
+
+    # Responses of the server don't need validation.
+    with PapersWithCodeClient(trusted=True) as client:
+        yield client
+
+
+def _columns(columns: list[Column], fields: Optional[list[str]]) -> list[Column]:
+    if not fields:
+        return columns
+    return [Column(title=field, path=field) for field in fields]
+
+
+def _list(
+    name: str,
+    columns: list[Column],
+    *args: str,
+    all: bool,
+    page: int,
+    items_per_page: int,
+    concurrency: Optional[int],
+    fields: Optional[list[str]],
+    **filters: Any,
+):
+    """Print items of a paginated list method of the client.
+
+    Text output is built from models, other formats are written straight from
+    the raw items.
+    """
+    format = output_format()
+    fields = fields or None
+    kwargs = {key: value for key, value in filters.items() if value is not None}
+    kwargs.update(page=page, items_per_page=items_per_page)
+    with _client() as client:
+        method = getattr(client, name)
+        if all:
+            concurrency = concurrency or client.concurrency
+            if format == ConsoleFormat.text:
+                items = client.iterate(method, *args, concurrency=concurrency, **kwargs)
+            else:
+                items = client.iterate_raw(
+                    method, *args, fields=fields, concurrency=concurrency, **kwargs
+                )
+        elif format == ConsoleFormat.text:
+            items = method(*args, **kwargs).results
+        else:
+            with client.raw(fields):
+                items = method(*args, **kwargs).results
+        with get_writer(format, columns=_columns(columns, fields), fields=fields) as w:
+            w.write_all(items)
+
+
+def _get(name: str, columns: list[Column], *args: str):
+    """Print a single object returned by a method of the client."""
+    with _client() as client:
+        item = getattr(client, name)(*args)
+    with get_writer(output_format(), columns=columns, single=True) as writer:
+        writer.write(item)
+
+
+papers_app = Typer(name="papers", help="Papers.")
+
+
+@papers_app.command(name="list")
+def paper_list(
+    q: Optional[str] = QUERY,
+    arxiv_id: Optional[str] = Option(None, help="Filter by arXiv ID."),
+    title: Optional[str] = Option(None, help="Filter by part of the title."),
+    abstract: Optional[str] = Option(None, help="Filter by part of the abstract."),
+    ordering: Optional[str] = ORDERING,
+    offline: bool = OFFLINE,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List papers."""
+    _list(
+        "paper_list",
+        PAPER,
+        q=q,
+        arxiv_id=arxiv_id,
+        title=title,
+        abstract=abstract,
+        ordering=ordering,
+        offline=offline,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@papers_app.command(name="search")
+def paper_search(
+    q: str = Argument(..., help="Search query."),
+    offline: bool = OFFLINE,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """Search papers and their repositories like the front page search."""
+    _list(
+        "search",
+        PAPER_REPO,
+        q=q,
+        offline=offline,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@papers_app.command(name="get")
+def paper_get(paper_id: str):
+    """Show a paper."""
+    _get("paper_get", PAPER, paper_id)
+
+
+def _paper_list_command(name: str, method: str, columns: list[Column], help: str):
+    """Register a command that lists objects related to a paper."""
+
+    @papers_app.command(name=name, help=help)
+    def command(
+        paper_id: str,
+        all: bool = ALL,
+        page: int = PAGE,
+        items_per_page: int = ITEMS_PER_PAGE,
+        concurrency: Optional[int] = CONCURRENCY,
+        fields: Optional[list[str]] = FIELDS,
+    ):
+        _list(
+            method,
+            columns,
+            paper_id,
+            all=all,
+            page=page,
+            items_per_page=items_per_page,
+            concurrency=concurrency,
+            fields=fields,
+        )
+
+
+_paper_list_command(
+    "repositories", "paper_repository_list", REPOSITORY, "List paper repositories."
+)
+_paper_list_command("datasets", "paper_dataset_list", DATASET, "List paper datasets.")
+_paper_list_command("tasks", "paper_task_list", TASK, "List paper tasks.")
+_paper_list_command("methods", "paper_method_list", METHOD, "List paper methods.")
+_paper_list_command("results", "paper_result_list", RESULT, "List paper results.")
+
+
+repositories_app = Typer(name="repositories", help="Repositories.")
+
+
+@repositories_app.command(name="list")
+def repository_list(
+    q: Optional[str] = QUERY,
+    owner: Optional[str] = Option(None, help="Filter by owner."),
+    name: Optional[str] = Option(None, help="Filter by name."),
+    stars: Optional[int] = Option(None, help="Filter by number of stars."),
+    framework: Optional[str] = Option(None, help="Filter by framework."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List repositories."""
+    _list(
+        "repository_list",
+        REPOSITORY,
+        q=q,
+        owner=owner,
+        name=name,
+        stars=stars,
+        framework=framework,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@repositories_app.command(name="get")
+def repository_get(owner: str, name: str):
+    """Show a repository."""
+    _get("repository_get", REPOSITORY, owner, name)
+
+
+@repositories_app.command(name="papers")
+def repository_paper_list(
+    owner: str,
+    name: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List papers implemented in a repository."""
+    _list(
+        "repository_paper_list",
+        PAPER,
+        owner,
+        name,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+authors_app = Typer(name="authors", help="Authors.")
+
+
+@authors_app.command(name="list")
+def author_list(
+    q: Optional[str] = QUERY,
+    full_name: Optional[str] = Option(None, help="Filter by full name."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List authors."""
+    _list(
+        "author_list",
+        AUTHOR,
+        q=q,
+        full_name=full_name,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@authors_app.command(name="get")
+def author_get(author_id: str):
+    """Show an author."""
+    _get("author_get", AUTHOR, author_id)
+
+
+@authors_app.command(name="papers")
+def author_paper_list(
+    author_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List papers of an author."""
+    _list(
+        "author_paper_list",
+        PAPER,
+        author_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+conferences_app = Typer(name="conferences", help="Conferences and proceedings.")
+
+
+@conferences_app.command(name="list")
+def conference_list(
+    q: Optional[str] = QUERY,
+    name: Optional[str] = Option(None, help="Filter by name."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List conferences."""
+    _list(
+        "conference_list",
+        CONFERENCE,
+        q=q,
+        name=name,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@conferences_app.command(name="get")
+def conference_get(conference_id: str):
+    """Show a conference."""
+    _get("conference_get", CONFERENCE, conference_id)
+
+
+@conferences_app.command(name="proceedings")
+def proceeding_list(
+    conference_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List proceedings of a conference."""
+    _list(
+        "proceeding_list",
+        PROCEEDING,
+        conference_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@conferences_app.command(name="papers")
+def proceeding_paper_list(
+    conference_id: str,
+    proceeding_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List papers of a conference proceeding."""
+    _list(
+        "proceeding_paper_list",
+        PAPER,
+        conference_id,
+        proceeding_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+tasks_app = Typer(name="tasks", help="Tasks.")
+
+
+@tasks_app.command(name="list")
+def task_list(
+    q: Optional[str] = QUERY,
+    name: Optional[str] = Option(None, help="Filter by name."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List tasks."""
+    _list(
+        "task_list",
+        TASK,
+        q=q,
+        name=name,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@tasks_app.command(name="get")
+def task_get(task_id: str):
+    """Show a task."""
+    _get("task_get", TASK, task_id)
+
+
+def _task_list_command(name: str, method: str, columns: list[Column], help: str):
+    """Register a command that lists objects related to a task."""
+
+    @tasks_app.command(name=name, help=help)
+    def command(
+        task_id: str,
+        all: bool = ALL,
+        page: int = PAGE,
+        items_per_page: int = ITEMS_PER_PAGE,
+        concurrency: Optional[int] = CONCURRENCY,
+        fields: Optional[list[str]] = FIELDS,
+    ):
+        _list(
+            method,
+            columns,
+            task_id,
+            all=all,
+            page=page,
+            items_per_page=items_per_page,
+            concurrency=concurrency,
+            fields=fields,
+        )
+
+
+_task_list_command("parents", "task_parent_list", TASK, "List parent tasks.")
+_task_list_command("children", "task_child_list", TASK, "List child tasks.")
+_task_list_command("papers", "task_paper_list", PAPER, "List task papers.")
+_task_list_command(
+    "evaluations", "task_evaluation_list", EVALUATION, "List task evaluation tables."
+)
+
+
+datasets_app = Typer(name="datasets", help="Datasets.")
+
+
+@datasets_app.command(name="list")
+def dataset_list(
+    q: Optional[str] = QUERY,
+    name: Optional[str] = Option(None, help="Filter by name."),
+    full_name: Optional[str] = Option(None, help="Filter by full name."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List datasets."""
+    _list(
+        "dataset_list",
+        DATASET,
+        q=q,
+        name=name,
+        full_name=full_name,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@datasets_app.command(name="get")
+def dataset_get(dataset_id: str):
+    """Show a dataset."""
+    _get("dataset_get", DATASET, dataset_id)
+
+
+@datasets_app.command(name="evaluations")
+def dataset_evaluation_list(
+    dataset_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List dataset evaluation tables."""
+    _list(
+        "dataset_evaluation_list",
+        EVALUATION,
+        dataset_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+methods_app = Typer(name="methods", help="Methods.")
+
+
+@methods_app.command(name="list")
+def method_list(
+    q: Optional[str] = QUERY,
+    name: Optional[str] = Option(None, help="Filter by name."),
+    full_name: Optional[str] = Option(None, help="Filter by full name."),
+    ordering: Optional[str] = ORDERING,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List methods."""
+    _list(
+        "method_list",
+        METHOD,
+        q=q,
+        name=name,
+        full_name=full_name,
+        ordering=ordering,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@methods_app.command(name="get")
+def method_get(method_id: str):
+    """Show a method."""
+    _get("method_get", METHOD, method_id)
+
+
+evaluations_app = Typer(name="evaluations", help="Evaluation tables.")
+
+
+@evaluations_app.command(name="list")
+def evaluation_list(
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List evaluation tables."""
+    _list(
+        "evaluation_list",
+        EVALUATION,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@evaluations_app.command(name="get")
+def evaluation_get(evaluation_id: str):
+    """Show an evaluation table."""
+    _get("evaluation_get", EVALUATION, evaluation_id)
+
+
+@evaluations_app.command(name="metrics")
+def evaluation_metric_list(
+    evaluation_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List metrics of an evaluation table."""
+    _list(
+        "evaluation_metric_list",
+        METRIC,
+        evaluation_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
+
+
+@evaluations_app.command(name="results")
+def evaluation_result_list(
+    evaluation_id: str,
+    all: bool = ALL,
+    page: int = PAGE,
+    items_per_page: int = ITEMS_PER_PAGE,
+    concurrency: Optional[int] = CONCURRENCY,
+    fields: Optional[list[str]] = FIELDS,
+):
+    """List results of an evaluation table."""
+    _list(
+        "evaluation_result_list",
+        RESULT,
+        evaluation_id,
+        all=all,
+        page=page,
+        items_per_page=items_per_page,
+        concurrency=concurrency,
+        fields=fields,
+    )
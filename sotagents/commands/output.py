@@ -0,0 +1,292 @@
+__all__ = [
+    "RecordWriter",
+    "TextWriter",
+    "JsonWriter",
+    "JsonLinesWriter",
+    "CsvWriter",
+    "get_writer",
+    "output_format",
+    "set_format",
+    "output_console",
+    "use_console",
+]
+
+import os
+import abc
+import sys
+import csv
+import json
+import threading
+import dataclasses
+from typing import TYPE_CHECKING, IO, Any, Optional, Sequence
+
+from sotagents.enums import ConsoleFormat
+from sotagents.config import get_config
+from sotagents.table import Column, StreamingTable
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+# Output settings of the command running in the current thread. The daemon runs
+# commands of different invocations in parallel threads.
+_local = threading.local()
+
+
+def set_format(format: Optional[ConsoleFormat]):
+    """Override the configured output format for the current command."""
+    _local.format = format
+
+
+def output_format() -> ConsoleFormat:
+    """Return the output format of the current command."""
+    format = getattr(_local, "format", None)
+    return get_config().format if format is None else format
+
+
+def use_console(console: Optional["Console"]):
+    """Set the console used for text output of the current command."""
+    _local.console = console
+
+
+def output_console() -> Optional["Console"]:
+    """Return the console of the current command, `None` for the global one."""
+    return getattr(_local, "console", None)
+
+
+def to_record(item: Any) -> Any:
+    """Convert a model or a dataclass to a dictionary.
+
+    Other records are returned as they are.
+    """
+    if dataclasses.is_dataclass(item):
+        return dataclasses.asdict(item)
+    # Models are recognized by their `dict` method, so pydantic isn't imported.
+    to_dict = getattr(item, "dict", None)
+    return item if to_dict is None else to_dict()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+class RecordWriter(abc.ABC):
+    """Writes records to a file one by one.
+
+    Every record is flushed as soon as it's written, so consumers reading from
+    a pipe get it right away. A closed pipe (e.g. `pwc ... | head`) ends the
+    output quietly.
+    """
+
+    def __init__(self, file: Optional[IO[str]] = None):
+        """Initialize.
+
+        Args:
+            file: Output file. Defaults to the standard output.
+        """
+        self.file = sys.stdout if file is None else file
+        self.count = 0
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            try:
+                self.end()
+            except BrokenPipeError:
+                self._discard()
+            return False
+        if issubclass(exc_type, BrokenPipeError):
+            self._discard()
+            return True
+        return False
+
+    def _discard(self):
+        # Python flushes the standard output on exit which would fail again.
+        try:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, self.file.fileno())
+        except (OSError, ValueError):
+            pass
+
+    def begin(self):
+        """Write what comes before the first record."""
+
+    def end(self):
+        """Write what comes after the last record."""
+
+    def write(self, item: Any):
+        """Write a single record."""
+        self._write(to_record(item))
+        self.count += 1
+        self.file.flush()
+
+    @abc.abstractmethod
+    def _write(self, record: Any):
+        """Write a single converted record."""
+
+    def write_all(self, items: Any) -> int:
+        """Write all records from an iterable.
+
+        Returns:
+            Number of written records.
+        """
+        for item in items:
+            self.write(item)
+        return self.count
+
+
+class TextWriter(RecordWriter):
+    """Prints records as a table, in chunks of rows."""
+
+    def __init__(
+        self,
+        columns: Sequence[Column],
+        file: Optional[IO[str]] = None,
+        chunk_size: int = 100,
+    ):
+        """Initialize.
+
+        Args:
+            columns: Table columns.
+            file: Output file. Defaults to the standard output.
+            chunk_size: Number of rows printed at once.
+        """
+        super().__init__(file=file)
+        from rich.console import Console
+
+        console = output_console() if file is None else Console(file=file)
+        self.table = StreamingTable(
+            list(columns), console=console, chunk_size=chunk_size
+        )
+
+    def end(self):
+        self.table.flush()
+
+    def write(self, item: Any):
+        # Tables format the objects with the column accessors, so they are not
+        # converted, and rows are flushed in chunks.
+        self._write(item)
+        self.count += 1
+
+    def _write(self, record: Any):
+        self.table.add(record)
+
+
+class JsonWriter(RecordWriter):
+    """Writes a JSON array, one record per line.
+
+    A single record is written as an indented JSON object instead if `single`
+    is set.
+    """
+
+    def __init__(self, file: Optional[IO[str]] = None, single: bool = False):
+        """Initialize.
+
+        Args:
+            file: Output file. Defaults to the standard output.
+            single: Write exactly one record as a JSON object.
+        """
+        super().__init__(file=file)
+        self.single = single
+
+    def begin(self):
+        if not self.single:
+            self.file.write("[")
+
+    def end(self):
+        if self.single:
+            if self.count != 1:
+                raise ValueError("Single JSON output needs exactly one record.")
+            return
+        self.file.write("\n]\n" if self.count > 0 else "]\n")
+        self.file.flush()
+
+    def _write(self, record: Any):
+        if self.single:
+            if self.count > 0:
+                raise ValueError("Single JSON output needs exactly one record.")
+            self.file.write(
+                json.dumps(record, default=str, ensure_ascii=False, indent=2) + "\n"
+            )
+            return
+        self.file.write(("\n  " if self.count == 0 else ",\n  ") + _dumps(record))
+
+
+class JsonLinesWriter(RecordWriter):
+    """Writes JSON Lines, one JSON object per line."""
+
+    def _write(self, record: Any):
+        self.file.write(_dumps(record) + "\n")
+
+
+class CsvWriter(RecordWriter):
+    """Writes CSV with a header row.
+
+    Nested values are written as JSON and missing values as empty cells.
+    """
+
+    def __init__(
+        self, fields: Optional[Sequence[str]] = None, file: Optional[IO[str]] = None
+    ):
+        """Initialize.
+
+        Args:
+            fields: Columns of the CSV. Defaults to the keys of the first record.
+            file: Output file. Defaults to the standard output.
+        """
+        super().__init__(file=file)
+        self.fields = None if fields is None else list(fields)
+        self._writer = csv.writer(self.file)
+        if self.fields is not None:
+            self._writer.writerow(self.fields)
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list, tuple)):
+            return _dumps(value)
+        return value
+
+    def _write(self, record: Any):
+        if isinstance(record, dict):
+            if self.fields is None:
+                self.fields = list(record)
+                self._writer.writerow(self.fields)
+            row = [record.get(field) for field in self.fields]
+        else:
+            row = list(record)
+        self._writer.writerow([self._cell(value) for value in row])
+
+
+def get_writer(
+    format: ConsoleFormat,
+    columns: Optional[Sequence[Column]] = None,
+    fields: Optional[Sequence[str]] = None,
+    file: Optional[IO[str]] = None,
+    single: bool = False,
+) -> RecordWriter:
+    """Return a writer for the output format.
+
+    Args:
+        format: Output format.
+        columns: Table columns used by the text format.
+        fields: CSV columns, defaults to the keys of the first record.
+        file: Output file. Defaults to the standard output.
+        single: Exactly one record is written, the JSON format writes it as
+            an object instead of an array.
+    """
+    if format == ConsoleFormat.text:
+        if columns is None:
+            raise ValueError("Text output needs table columns.")
+        return TextWriter(columns, file=file)
+    if format == ConsoleFormat.json:
+        return JsonWriter(file=file, single=single)
+    if format == ConsoleFormat.jsonl:
+        return JsonLinesWriter(file=file)
+    if format == ConsoleFormat.csv:
+        return CsvWriter(fields=fields, file=file)
+    raise ValueError(f"Unsupported output format: {format}")
@@ -0,0 +1,331 @@
+__all__ = [
+    "InternPool",
+    "CompactFrame",
+    "PapersFrame",
+    "RepositoriesFrame",
+    "EvaluationResultsFrame",
+]
+
+import abc
+from array import array
+from datetime import date
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Type, Union
+
+from sotagents.models import Model, Paper, Repository, Result
+
+
+class InternPool:
+    """Maps repeated values to small integer codes.
+
+    Every distinct value is stored once. A pool can be shared between frames so
+    values like author names are stored only once for all of them.
+    """
+
+    __slots__ = ("_codes", "_values")
+
+    def __init__(self):
+        self._codes: dict[Hashable, int] = {}
+        self._values: list[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def code(self, value: Hashable) -> int:
+        """Return the code of a value, adding it to the pool if it's new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def value(self, code: int) -> Hashable:
+        """Return the value for a code."""
+        return self._values[code]
+
+
+class _Column(abc.ABC):
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def append(self, value: Any):
+        """Add a value at the end of the column."""
+
+    @abc.abstractmethod
+    def get(self, index: int) -> Any:
+        """Return the value at the index."""
+
+
+class _TextColumn(_Column):
+    """Mostly unique strings, e.g. titles or abstracts."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, pool: InternPool):
+        self.values: list[Optional[str]] = []
+
+    def append(self, value: Optional[str]):
+        self.values.append(value)
+
+    def get(self, index: int) -> Optional[str]:
+        return self.values[index]
+
+
+class _CategoryColumn(_Column):
+    """Repeated values stored as codes in the intern pool, -1 is `None`."""
+
+    __slots__ = ("pool", "codes")
+
+    def __init__(self, pool: InternPool):
+        self.pool = pool
+        self.codes = array("l")
+
+    def append(self, value: Optional[Hashable]):
+        self.codes.append(-1 if value is None else self.pool.code(value))
+
+    def get(self, index: int) -> Optional[Hashable]:
+        code = self.codes[index]
+        return None if code < 0 else self.pool.value(code)
+
+
+class _IntColumn(_Column):
+    __slots__ = ("values",)
+
+    #: Stored in place of `None`.
+    MISSING = -(2**63)
+
+    def __init__(self, pool: InternPool):
+        self.values = array("q")
+
+    def append(self, value: Optional[int]):
+        self.values.append(self.MISSING if value is None else value)
+
+    def get(self, index: int) -> Optional[int]:
+        value = self.values[index]
+        return None if value == self.MISSING else value
+
+
+class _BoolColumn(_Column):
+    __slots__ = ("values",)
+
+    def __init__(self, pool: InternPool):
+        self.values = array("b")
+
+    def append(self, value: Optional[bool]):
+        self.values.append(-1 if value is None else int(value))
+
+    def get(self, index: int) -> Optional[bool]:
+        value = self.values[index]
+        return None if value < 0 else bool(value)
+
+
+class _DateColumn(_Column):
+    """Dates stored as proleptic Gregorian ordinals, 0 is `None`."""
+
+    __slots__ = ("ordinals",)
+
+    def __init__(self, pool: InternPool):
+        self.ordinals = array("l")
+
+    def append(self, value: Union[date, str, None]):
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        self.ordinals.append(0 if value is None else value.toordinal())
+
+    def get(self, index: int) -> Optional[date]:
+        ordinal = self.ordinals[index]
+        return None if ordinal == 0 else date.fromordinal(ordinal)
+
+
+class _ListColumn(_Column):
+    """Lists of repeated values, e.g. authors, stored as one flat code array."""
+
+    __slots__ = ("pool", "codes", "offsets")
+
+    def __init__(self, pool: InternPool):
+        self.pool = pool
+        self.codes = array("l")
+        self.offsets = array("q", [0])
+
+    def append(self, value: Optional[list]):
+        self.codes.extend(self.pool.code(item) for item in value or ())
+        self.offsets.append(len(self.codes))
+
+    def get(self, index: int) -> list:
+        value = self.pool.value
+        return [
+            value(code)
+            for code in self.codes[self.offsets[index] : self.offsets[index + 1]]
+        ]
+
+
+class _DictColumn(_Column):
+    """Flat dictionaries, e.g. metrics, with interned keys and string values.
+
+    Other values, which might not be hashable, are kept as they are and their
+    negative codes, starting at -1, index `objects`.
+    """
+
+    __slots__ = ("pool", "keys", "values", "objects", "offsets")
+
+    def __init__(self, pool: InternPool):
+        self.pool = pool
+        self.keys = array("l")
+        self.values = array("l")
+        self.objects: list[Any] = []
+        self.offsets = array("q", [0])
+
+    def append(self, value: Optional[dict]):
+        for key, item in (value or {}).items():
+            self.keys.append(self.pool.code(key))
+            if isinstance(item, str):
+                self.values.append(self.pool.code(item))
+            else:
+                self.objects.append(item)
+                self.values.append(-len(self.objects))
+        self.offsets.append(len(self.keys))
+
+    def _item(self, code: int) -> Any:
+        return self.pool.value(code) if code >= 0 else self.objects[-code - 1]
+
+    def get(self, index: int) -> dict:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        value = self.pool.value
+        return {
+            value(key): self._item(item)
+            for key, item in zip(self.keys[start:end], self.values[start:end])
+        }
+
+
+class CompactFrame:
+    """Base class for compact columnar containers of models.
+
+    Every field of the model is stored in a column backed by a typed array or a
+    list. Repeated values are interned in a shared `InternPool`. Models are
+    created only when rows are accessed.
+
+    Subclasses set `model` and the column type for every model field.
+    """
+
+    #: Model stored in the frame.
+    model: Type[Model]
+    #: Column type for every model field.
+    columns: dict[str, Callable[[InternPool], _Column]]
+
+    def __init__(
+        self,
+        items: Iterable[Union[Model, dict]] = (),
+        pool: Optional[InternPool] = None,
+    ):
+        """Initialize.
+
+        Args:
+            items: Models or deserialized JSON objects added to the frame.
+            pool: Intern pool, shared with other frames. A new pool is created
+                if it's not provided.
+        """
+        self.pool = InternPool() if pool is None else pool
+        self._columns = {
+            name: column(self.pool) for name, column in self.columns.items()
+        }
+        self._length = 0
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Model]:
+        return (self[index] for index in range(self._length))
+
+    def __getitem__(self, index: int) -> Model:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self.model.construct_trusted(self.row(index))
+
+    def append(self, item: Union[Model, dict]):
+        """Add a model or a deserialized JSON object to the frame."""
+        get = item.get if isinstance(item, dict) else item.__dict__.get
+        for name, column in self._columns.items():
+            column.append(get(name))
+        self._length += 1
+
+    def extend(self, items: Iterable[Union[Model, dict]]):
+        """Add models or deserialized JSON objects to the frame."""
+        for item in items:
+            self.append(item)
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return the row as a dictionary of field values."""
+        return {name: column.get(index) for name, column in self._columns.items()}
+
+    def column(self, name: str) -> list:
+        """Return all values of a field."""
+        column = self._columns[name]
+        return [column.get(index) for index in range(self._length)]
+
+    def to_models(self) -> list[Model]:
+        """Convert all rows to models."""
+        return list(self)
+
+
+class PapersFrame(CompactFrame):
+    """Compact container of papers.
+
+    Example:
+        >>> frame = PapersFrame(client.iterate(client.paper_list, q="transformer"))
+        >>> frame.column("conference")
+        >>> paper = frame[0]
+    """
+
+    model = Paper
+    columns = {
+        "id": _TextColumn,
+        "arxiv_id": _TextColumn,
+        "nips_id": _TextColumn,
+        "url_abs": _TextColumn,
+        "url_pdf": _TextColumn,
+        "title": _TextColumn,
+        "abstract": _TextColumn,
+        "authors": _ListColumn,
+        "published": _DateColumn,
+        "conference": _CategoryColumn,
+        "conference_url_abs": _TextColumn,
+        "conference_url_pdf": _TextColumn,
+        "proceeding": _CategoryColumn,
+    }
+
+
+class RepositoriesFrame(CompactFrame):
+    """Compact container of repositories."""
+
+    model = Repository
+    columns = {
+        "url": _TextColumn,
+        "owner": _CategoryColumn,
+        "name": _TextColumn,
+        "description": _TextColumn,
+        "stars": _IntColumn,
+        "framework": _CategoryColumn,
+        "is_official": _BoolColumn,
+    }
+
+
+class EvaluationResultsFrame(CompactFrame):
+    """Compact container of evaluation table results.
+
+    Metric names and values, methodologies and papers are interned.
+    """
+
+    model = Result
+    columns = {
+        "id": _TextColumn,
+        "best_rank": _IntColumn,
+        "metrics": _DictColumn,
+        "methodology": _CategoryColumn,
+        "uses_additional_data": _BoolColumn,
+        "paper": _CategoryColumn,
+        "best_metric": _CategoryColumn,
+        "evaluated_on": _CategoryColumn,
+        "external_source_url": _CategoryColumn,
+    }
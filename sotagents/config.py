@@ -1,6 +1,8 @@
 import io
 import os
 import json
+import tempfile
+import threading
 from pathlib import Path
 from dataclasses import dataclass
 from collections import defaultdict
@@ -19,6 +21,8 @@ class ConfigField:
     type: Type = str
     to_value: Optional[Callable[[Any], Any]] = None
     to_string: Optional[Callable[[Any], str]] = None
+    # Profiles that don't set the option use the value of the default profile.
+    inherited: bool = True
 
 
 @dataclass()
@@ -42,25 +46,113 @@ class Config:
             to_value=ConsoleFormat,
             to_string=lambda v: v.value,
         ),
-        "server_url": ConfigField(section="server", option="url"),
+        # The server and its tokens are never shared between profiles, the
+        # tokens would be sent to the server of another profile.
+        "server_url": ConfigField(section="server", option="url", inherited=False),
         "api_version": ConfigField(section="server", option="api_version", type=int),
-        "token_access": ConfigField(section="auth", option="token_access"),
-        "token_refresh": ConfigField(section="auth", option="token_refresh"),
+        "token_access": ConfigField(
+            section="auth", option="token_access", inherited=False
+        ),
+        "token_refresh": ConfigField(
+            section="auth", option="token_refresh", inherited=False
+        ),
+        "token_refresh_url": ConfigField(section="auth", option="refresh_url"),
+        "timeout": ConfigField(section="performance", option="timeout", type=float),
+        "max_connections": ConfigField(
+            section="performance", option="max_connections", type=int
+        ),
+        "concurrency": ConfigField(
+            section="performance", option="concurrency", type=int
+        ),
+        "retries": ConfigField(section="performance", option="retries", type=int),
+        "retry_backoff": ConfigField(
+            section="performance", option="retry_backoff", type=float
+        ),
+        "rate_limit": ConfigField(
+            section="performance", option="rate_limit", type=float
+        ),
+        "cache_dir": ConfigField(section="cache", option="dir"),
+        "cache_ttl": ConfigField(section="cache", option="ttl", type=float),
+        "leaderboard_ttl": ConfigField(
+            section="cache", option="leaderboard_ttl", type=float
+        ),
+        "daemon": ConfigField(section="daemon", option="enabled", type=bool),
+        "daemon_idle_timeout": ConfigField(
+            section="daemon", option="idle_timeout", type=float
+        ),
     }
 
-    def __init__(self):
-        # Path to the configuration file
+    def __init__(self, profile: Optional[str] = None):
+        """Initialize.
+
+        Args:
+            profile: Name of the configuration profile. Defaults to the value of
+                the `SOTAGENTS_PROFILE` environment variable or `default`.
+        """
+        self.profile = (
+            profile or os.environ.get(consts.PROFILE_ENV_VAR) or consts.DEFAULT_PROFILE
+        )
+
         self.debug = True
         self.format: ConsoleFormat = ConsoleFormat.text
         self.server_url = consts.PAPERSWITHCODE_URL
         self.api_version = 1
         self.token_access = None
         self.token_refresh = None
+        # Endpoint exchanging the refresh token for new tokens, relative to the
+        # API URL.
+        self.token_refresh_url = "/auth/token/refresh/"
+
+        # Performance settings
+        self.timeout = 10.0
+        self.max_connections = 10
+        self.concurrency = 8
+        self.retries = 0
+        self.retry_backoff = 0.5
+        self.rate_limit: Optional[float] = None
+        self.cache_dir = consts.DEFAULT_CACHE_PATH
+        self.cache_ttl: Optional[float] = None
+        self.leaderboard_ttl = 300.0
+
+        # Background process that runs the CLI commands
+        self.daemon = False
+        self.daemon_idle_timeout = 600.0
 
-        # Read the configuration file
+        # Path to the configuration file
         self.config_file = Path(consts.DEFAULT_CONFIG_PATH).expanduser().resolve()
         self.load()
-        self.save()
+        # Values as they are in the file, used to skip saving unchanged values.
+        self._saved = self._snapshot()
+
+    def _snapshot(self) -> dict[str, str]:
+        return {field: self.get(field) for field in self.ENTRIES}
+
+    @property
+    def changed(self) -> bool:
+        """Check if any value changed since it was loaded or saved."""
+        return self._snapshot() != self._saved
+
+    def section(self, field: str) -> str:
+        """Return the section in the configuration file for the active profile.
+
+        Sections of the default profile have plain names, e.g. `server`, and
+        sections of other profiles are prefixed with the profile name, e.g.
+        `local:server`.
+        """
+        section = self.ENTRIES[field].section
+        if self.profile == consts.DEFAULT_PROFILE:
+            return section
+        return f"{self.profile}:{section}"
+
+    @property
+    def profiles(self) -> list[str]:
+        """Names of all profiles in the configuration file."""
+        profiles = {consts.DEFAULT_PROFILE, self.profile}
+        if os.path.isfile(self.config_file):
+            cp = ConfigParser()
+            cp.read(self.config_file)
+            profiles.update(s.split(":")[0] for s in cp.sections() if ":" in s)
+        return sorted(profiles)
 
     @property
     def entries(self) -> dict[str, list[ConfigEntry]]:
@@ -91,6 +183,8 @@ class Config:
                 value = json.loads(value)
             except Exception:
                 raise ValueError(f"Cannot parse '{value}' as '{entry.type.__name__}'.")
+            if entry.type is float and isinstance(value, int):
+                value = float(value)
             if value is not None and not isinstance(value, entry.type):
                 raise ValueError(
                     f"Type mismatch. {entry.type.__name__} != "
@@ -130,9 +224,15 @@ class Config:
 
         for field, entry in self.ENTRIES.items():
             try:
-                if cp.has_option(entry.section, entry.option):
-                    value = cp.get(entry.section, entry.option)
-                    self.set(field, value)
+                # Profiles use the values of the default profile for the options
+                # they don't set.
+                sections = [self.section(field)]
+                if entry.inherited:
+                    sections.append(entry.section)
+                for section in sections:
+                    if cp.has_option(section, entry.option):
+                        self.set(field, cp.get(section, entry.option))
+                        break
             except errors.InvalidConfiguration:
                 raise
             except Exception as e:
@@ -142,22 +242,50 @@ class Config:
                     error=e,
                 )
 
-    def save(self):
+    def save(self, force: bool = False):
+        """Save configuration if any value changed.
+
+        Only the changed values are written to the sections of the active
+        profile.
+
+        Args:
+            force: Write all values even if nothing changed.
+        """
+        current = self._snapshot()
+        changed = [
+            field
+            for field in self.ENTRIES
+            if force or current[field] != self._saved[field]
+        ]
+        if len(changed) == 0:
+            return
         try:
-            # Create if it doesn't exist
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            cp = ConfigParser()
-            # If it already exists read the values
-            if os.path.isfile(self.config_file):
-                cp.read(self.config_file)
+            # Saves read and rewrite the whole file, e.g. refreshed tokens are
+            # saved from a background thread.
+            with _save_lock:
+                # Create if it doesn't exist
+                self.config_file.parent.mkdir(parents=True, exist_ok=True)
+                cp = ConfigParser()
+                # If it already exists read the values
+                if os.path.isfile(self.config_file):
+                    cp.read(self.config_file)
 
-            for field, entry in self.ENTRIES.items():
-                if not cp.has_section(entry.section):
-                    cp.add_section(entry.section)
-                cp.set(entry.section, entry.option, self.get(field))
+                for field in changed:
+                    section = self.section(field)
+                    if not cp.has_section(section):
+                        cp.add_section(section)
+                    cp.set(section, self.ENTRIES[field].option, current[field])
 
-            with io.open(self.config_file, "w") as f:
-                cp.write(f)
+                # Readers never see a partially written file.
+                fd, tmp = tempfile.mkstemp(dir=self.config_file.parent, suffix=".tmp")
+                try:
+                    with io.open(fd, "w") as f:
+                        cp.write(f)
+                    os.replace(tmp, self.config_file)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                self._saved = current
         except errors.InvalidConfiguration:
             raise
         except Exception as e:
@@ -166,4 +294,34 @@ class Config:
             )
 
 
-config = Config()
+_config: Optional[Config] = None
+_config_lock = threading.Lock()
+_save_lock = threading.Lock()
+
+
+def get_config() -> Config:
+    """Return the global configuration, loading it on first use."""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = Config()
+    return _config
+
+
+def use_profile(profile: str) -> Config:
+    """Switch the global configuration to another profile.
+
+    Clients created afterwards use the settings of the profile.
+    """
+    global _config
+    with _config_lock:
+        _config = Config(profile=profile)
+    return _config
+
+
+def __getattr__(name: str) -> Any:
+    # The global `config` is created only when it's used.
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
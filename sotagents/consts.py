@@ -1,3 +1,11 @@
 DEFAULT_CONFIG_PATH = "~/.sotagents/sotagents.ini"
+DEFAULT_SYNC_STATE_PATH = "~/.sotagents/sync"
+DEFAULT_JOURNAL_PATH = "~/.sotagents/journal"
+DEFAULT_CACHE_PATH = "~/.sotagents/cache"
+DEFAULT_DAEMON_PATH = "~/.sotagents/daemon"
+
+DEFAULT_PROFILE = "default"
+PROFILE_ENV_VAR = "SOTAGENTS_PROFILE"
+DAEMON_ENV_VAR = "SOTAGENTS_DAEMON"
 
 PAPERSWITHCODE_URL = "https://sotagents.com"
@@ -0,0 +1,533 @@
+"""Background process that runs `pwc` commands with a warm client.
+
+Starting the CLI imports the whole package, reads the configuration, opens new
+connections and starts with an empty cache. The daemon pays for that once and
+keeps a client with its connection pool and caches open. Thin `pwc`
+invocations forward the entity commands to it over a Unix domain socket and
+stream the output back.
+
+The daemon is started on first use when it's enabled with the
+`daemon.enabled` setting or the `SOTAGENTS_DAEMON` environment variable, and
+it stops itself after `daemon.idle_timeout` seconds without requests. Every
+profile has its own daemon.
+
+Forwarding imports only the standard library, this module must not import the
+rest of the package at the top level.
+
+Protocol:
+    The client sends one JSON line with the command and its profile, which is
+    never taken from the environment of the daemon. The daemon answers with
+    frames made of a channel byte, the payload length as a 4 byte big endian
+    integer and the payload. Channel `o` is the standard output, `e` the
+    standard error and `x` the exit code, which is always the last frame.
+"""
+
+__all__ = ["DaemonServer", "socket_path", "enabled", "forward", "serve", "request"]
+
+import io
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import socket
+import struct
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+from configparser import ConfigParser
+from typing import Any, BinaryIO, Optional
+
+from sotagents import consts
+
+
+FRAME = struct.Struct(">cI")
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+
+#: Commands that are forwarded to the daemon.
+FORWARDED = {
+    "papers",
+    "repositories",
+    "authors",
+    "conferences",
+    "tasks",
+    "datasets",
+    "methods",
+    "evaluations",
+}
+
+#: Seconds to wait for an automatically started daemon.
+START_TIMEOUT = 5.0
+
+
+def socket_path(profile: str) -> Path:
+    """Return the path of the socket of the profile's daemon."""
+    return Path(consts.DEFAULT_DAEMON_PATH).expanduser() / f"{profile}.sock"
+
+
+def enabled(profile: str) -> bool:
+    """Check if the commands should be forwarded to the daemon.
+
+    The environment variable has precedence over the `daemon.enabled` setting.
+    The configuration file is read directly, loading the configuration imports
+    too much for a thin client.
+    """
+    value = os.environ.get(consts.DAEMON_ENV_VAR)
+    if value is None:
+        path = Path(consts.DEFAULT_CONFIG_PATH).expanduser()
+        if not path.is_file():
+            return False
+        cp = ConfigParser()
+        try:
+            cp.read(path)
+        except Exception:
+            return False
+        for section in (f"{profile}:daemon", "daemon"):
+            if cp.has_option(section, "enabled"):
+                value = cp.get(section, "enabled")
+                break
+        else:
+            return False
+    return value.strip().strip('"').lower() in ("1", "true", "yes", "on")
+
+
+def _parse(argv: list[str]) -> tuple[Optional[str], Optional[str], list[str]]:
+    """Split the global options from the command.
+
+    Returns:
+        Profile, output format and the command arguments. Command arguments are
+        empty if the global options are not understood.
+    """
+    profile = None
+    format = None
+    i = 0
+    while i < len(argv) and argv[i].startswith("-"):
+        option, _, value = argv[i].partition("=")
+        if option not in ("-p", "--profile", "-f", "--format"):
+            return None, None, []
+        if value == "":
+            if i + 1 >= len(argv):
+                return None, None, []
+            i += 1
+            value = argv[i]
+        if option in ("-p", "--profile"):
+            profile = value
+        else:
+            format = value
+        i += 1
+    return profile, format, argv[i:]
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _start(profile: str) -> Optional[socket.socket]:
+    """Start the daemon in the background and connect to it."""
+    subprocess.Popen(
+        [sys.executable, "-m", "sotagents", "-p", profile, "daemon", "start"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    path = socket_path(profile)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        time.sleep(0.05)
+    return None
+
+
+def _read_frame(file: BinaryIO) -> tuple[bytes, bytes]:
+    header = file.read(FRAME.size)
+    if len(header) < FRAME.size:
+        raise ConnectionError("Daemon closed the connection.")
+    channel, size = FRAME.unpack(header)
+    payload = file.read(size)
+    if len(payload) < size:
+        raise ConnectionError("Daemon closed the connection.")
+    return channel, payload
+
+
+def request(profile: str, message: dict, start: bool = False) -> Optional[dict]:
+    """Send a control message to the daemon and return its answer.
+
+    Args:
+        profile: Profile of the daemon.
+        message: Message, e.g. `{"op": "status"}`.
+        start: Start the daemon if it's not running.
+
+    Returns:
+        Answer or `None` if the daemon is not running.
+    """
+    sock = _connect(socket_path(profile))
+    if sock is None and start:
+        sock = _start(profile)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as file:
+        file.write(json.dumps(message).encode("utf-8") + b"\n")
+        file.flush()
+        line = file.readline()
+    return json.loads(line) if line else None
+
+
+def forward(argv: Optional[list[str]] = None) -> Optional[int]:
+    """Run a CLI command in the daemon.
+
+    Args:
+        argv: Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        Exit code of the command or `None` if the command has to run in this
+        process, because it's not forwarded, the daemon is not enabled or it
+        could not be started.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    argv = sys.argv[1:] if argv is None else argv
+    profile, format, command = _parse(argv)
+    if len(command) == 0 or command[0] not in FORWARDED or "--help" in command:
+        return None
+    profile = (
+        profile or os.environ.get(consts.PROFILE_ENV_VAR) or consts.DEFAULT_PROFILE
+    )
+    if not enabled(profile):
+        return None
+    sock = _connect(socket_path(profile)) or _start(profile)
+    if sock is None:
+        return None
+
+    message = {
+        "op": "run",
+        "profile": profile,
+        "argv": command,
+        "format": format,
+        "width": shutil.get_terminal_size().columns,
+        "tty": sys.stdout.isatty(),
+    }
+    outputs = {STDOUT: sys.stdout.buffer, STDERR: sys.stderr.buffer}
+    with sock, sock.makefile("rwb") as file:
+        file.write(json.dumps(message).encode("utf-8") + b"\n")
+        file.flush()
+        try:
+            while True:
+                channel, payload = _read_frame(file)
+                if channel == EXIT:
+                    return int(payload)
+                output = outputs[channel]
+                output.write(payload)
+                output.flush()
+        except BrokenPipeError:
+            # Output closed, e.g. piped to `head`, the daemon stops the command.
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+        except ConnectionError as e:
+            sys.stderr.write(f"{e}\n")
+            return 1
+
+
+class _Channel(io.TextIOBase):
+    """Text stream that sends the written text to the client in frames."""
+
+    #: Text is sent when it's flushed or when this many characters are buffered.
+    BUFFER = 64 * 1024
+
+    def __init__(self, file: BinaryIO, channel: bytes, tty: bool, lock: threading.Lock):
+        self._file = file
+        self._channel = channel
+        self._tty = tty
+        self._lock = lock
+        self._buffer: list[str] = []
+        self._size = 0
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self.BUFFER:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._size == 0:
+            return
+        payload = "".join(self._buffer).encode("utf-8")
+        self._buffer = []
+        self._size = 0
+        with self._lock:
+            self._file.write(FRAME.pack(self._channel, len(payload)) + payload)
+            self._file.flush()
+
+
+class _LocalStream(io.TextIOBase):
+    """Standard stream that writes to the channel of the current thread."""
+
+    def __init__(self, default: Any):
+        self._default = default
+        self._local = threading.local()
+
+    @property
+    def target(self) -> Any:
+        return getattr(self._local, "stream", None) or self._default
+
+    @target.setter
+    def target(self, stream: Any):
+        self._local.stream = stream
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    def writable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.target.fileno()
+
+    def write(self, text: str) -> int:
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        message = json.loads(line)
+        op = message.get("op")
+        with self.server.activity():
+            if op == "run":
+                self.run(message)
+            elif op == "status":
+                self.answer(self.server.status())
+            elif op == "stop":
+                self.answer({"stopped": True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                self.answer({"error": f"Unknown operation: {op}"})
+
+    def answer(self, message: dict):
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    def run(self, message: dict):
+        import click
+        from rich.console import Console
+        from sotagents.commands import app
+        from sotagents.commands.output import use_console
+
+        lock = threading.Lock()
+        tty = bool(message.get("tty"))
+        stdout = _Channel(self.wfile, STDOUT, tty=tty, lock=lock)
+        stderr = _Channel(self.wfile, STDERR, tty=False, lock=lock)
+        profile = message.get("profile") or self.server.profile
+        if profile != self.server.profile:
+            stderr.write(
+                f"Daemon of profile '{self.server.profile}' cannot run commands "
+                f"of profile '{profile}'.\n"
+            )
+            self.exit(stdout, stderr, lock, 2)
+            return
+        # The profile is always passed, so the command never switches the
+        # configuration shared by all commands to the daemon's environment.
+        argv = ["--profile", profile]
+        if message.get("format"):
+            argv += ["--format", message["format"]]
+        argv += message["argv"]
+
+        self.server.refresh()
+        sys.stdout.target = stdout
+        sys.stderr.target = stderr
+        use_console(
+            Console(file=stdout, width=message.get("width"), force_terminal=tty)
+        )
+        try:
+            code = app(argv, prog_name="pwc", standalone_mode=False)
+            code = code if isinstance(code, int) else 0
+        except click.exceptions.Exit as e:
+            code = e.exit_code
+        except click.exceptions.Abort:
+            stderr.write("Aborted!\n")
+            code = 1
+        except SystemExit as e:
+            if isinstance(e.code, int) or e.code is None:
+                code = e.code or 0
+            else:
+                stderr.write(f"{e.code}\n")
+                code = 1
+        except click.exceptions.ClickException as e:
+            e.show(file=stderr)
+            code = e.exit_code
+        except (BrokenPipeError, ConnectionError):
+            # The client went away, there is nobody to answer to.
+            return
+        except Exception as e:
+            stderr.write(f"{e}\n")
+            code = 1
+        finally:
+            sys.stdout.target = None
+            sys.stderr.target = None
+            use_console(None)
+        self.exit(stdout, stderr, lock, code)
+
+    def exit(self, stdout: _Channel, stderr: _Channel, lock: threading.Lock, code: int):
+        """Send the remaining output and the exit code."""
+        try:
+            stdout.flush()
+            stderr.flush()
+            with lock:
+                payload = str(code).encode("ascii")
+                self.wfile.write(FRAME.pack(EXIT, len(payload)) + payload)
+        except OSError:
+            pass
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that runs the CLI commands with a shared client.
+
+    Every connection is handled in its own thread, the client and its caches
+    are shared by all of them.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, profile: str, idle_timeout: float):
+        """Initialize.
+
+        Args:
+            profile: Configuration profile.
+            idle_timeout: Seconds without requests after which the server stops.
+        """
+        self.profile = profile
+        self.idle_timeout = idle_timeout
+        self.path = socket_path(profile)
+        self.started = time.time()
+        self.requests = 0
+        self._active = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._config_mtime: Optional[float] = None
+        self._prepare(self.path)
+        self._load()
+        super().__init__(str(self.path), _Handler)
+        os.chmod(self.path, 0o600)
+
+    @staticmethod
+    def _prepare(path: Path):
+        """Create the socket directory and remove a stale socket."""
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not path.exists():
+            return
+        sock = _connect(path)
+        if sock is not None:
+            sock.close()
+            raise OSError(errno.EADDRINUSE, f"Daemon is already running: {path}")
+        path.unlink()
+
+    def activity(self) -> "_Activity":
+        return _Activity(self)
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "profile": self.profile,
+            "socket": str(self.path),
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "active": self._active - 1,
+        }
+
+    def _load(self):
+        from sotagents.client import PapersWithCodeClient
+        from sotagents.commands.entities import share_client
+
+        path = Path(consts.DEFAULT_CONFIG_PATH).expanduser()
+        self._config_mtime = path.stat().st_mtime if path.is_file() else None
+        # Commands that are still running keep using the previous client.
+        share_client(PapersWithCodeClient(trusted=True))
+
+    def refresh(self):
+        """Reload the configuration and the client if the file changed."""
+        from sotagents.config import use_profile
+
+        path = Path(consts.DEFAULT_CONFIG_PATH).expanduser()
+        mtime = path.stat().st_mtime if path.is_file() else None
+        with self._lock:
+            if mtime != self._config_mtime:
+                use_profile(self.profile)
+                self._load()
+
+    def watch(self):
+        """Stop the server after it has been idle for too long."""
+        while True:
+            time.sleep(min(self.idle_timeout, 5.0))
+            with self._lock:
+                idle = self._active == 0 and (
+                    time.monotonic() - self._last > self.idle_timeout
+                )
+            if idle:
+                self.shutdown()
+                return
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+class _Activity:
+    """Tracks the running requests of a server."""
+
+    def __init__(self, server: DaemonServer):
+        self.server = server
+
+    def __enter__(self):
+        with self.server._lock:
+            self.server._active += 1
+            self.server.requests += 1
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self.server._lock:
+            self.server._active -= 1
+            self.server._last = time.monotonic()
+
+
+def serve(profile: str, idle_timeout: float):
+    """Run the daemon until it's stopped or idle for `idle_timeout` seconds."""
+    server = DaemonServer(profile, idle_timeout=idle_timeout)
+    # Commands print to the standard streams, which are redirected to the
+    # client of the thread that runs the command.
+    sys.stdout = _LocalStream(sys.stdout)
+    sys.stderr = _LocalStream(sys.stderr)
+    threading.Thread(target=server.watch, name="sotagents-idle", daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        sys.stdout = sys.stdout._default
+        sys.stderr = sys.stderr._default
@@ -4,3 +4,5 @@ import enum
 class ConsoleFormat(str, enum.Enum):
     text = "text"
     json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
@@ -1,11 +1,13 @@
-__all__ = ["PapersWithCodeError"]
+__all__ = ["PapersWithCodeError", "is_transient"]
 
 import enum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from httpx import Response
 from pydantic import ValidationError as PydanticValidationError
 
+if TYPE_CHECKING:
+    from httpx import Response
+
 
 class PapersWithCodeError(Exception):
     """Base class for all errors."""
@@ -84,7 +86,7 @@ class HttpClientError(ClientError):
     def __init__(
         self,
         message: str,
-        response: Optional[Response] = None,
+        response: Optional["Response"] = None,
         status_code: int = 500,
     ):
         super().__init__(
@@ -134,3 +136,20 @@ class SerializationError(ClientError):
         """
         super().__init__("Serialization error.")
         self.errors = errors
+
+
+#: Status codes of responses after which a request can be safely retried.
+TRANSIENT_STATUS_CODES = {429, 502, 503, 504}
+
+
+def is_transient(error: Exception) -> bool:
+    """Check if the error is transient and the request can be retried.
+
+    Timeouts, connection errors and rate limit or server unavailable responses
+    are transient.
+    """
+    if isinstance(error, HttpClientTimeout):
+        return True
+    if isinstance(error, HttpClientError):
+        return error.response is None or error.status_code in TRANSIENT_STATUS_CODES
+    return False
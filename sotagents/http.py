@@ -1,11 +1,22 @@
+import time
 import enum
-from typing import Optional
-
-import httpx
+import json
+import fnmatch
+import threading
+import contextlib
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 
 from sotagents import errors
+from sotagents.cache import TTLCache
+from sotagents.ratelimit import RateLimiter
 from sotagents.models import Model
 
+if TYPE_CHECKING:
+    # HTTPX is imported when the first request is made.
+    import httpx
+
+    from sotagents.auth import TokenManager
+
 
 class AuthorizationMethod(enum.Enum):
     basic = "Basic"
@@ -37,6 +48,11 @@ class HttpClient:
         token: str = "",
         authorization_method: AuthorizationMethod = AuthorizationMethod.jwt,
         timeout: int = 10,
+        max_connections: int = 10,
+        cache: Optional[TTLCache] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         """Initialize.
 
@@ -45,25 +61,134 @@ class HttpClient:
             token: Traktor authentication token.
             authorization_method: Authorization method.
             timeout: Request timeout time.
+            max_connections: Maximal number of pooled connections to the server.
+            cache: Cache for GET responses. Responses are not cached if `None`.
+            retries: Number of retries of GET requests that failed with a
+                transient error, see `errors.is_transient`.
+            backoff: Initial delay between retries in seconds, doubled after
+                every retry. Longer delays requested by the server with the
+                `X-Ratelimit-Retry` or `Retry-After` headers are respected.
+            rate_limiter: Limits the rate of requests sent to the server.
         """
         self.url = url
         self.token = token
         self.authorization_method = authorization_method
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        # Provides fresh JWT access tokens, used instead of `token` if set.
+        self.token_manager: Optional["TokenManager"] = None
 
         # Setup headers
         self.headers = {"Content-Type": "application/json"}
 
         self.response = None
 
+        # Connection pool shared by all threads and per thread extra headers.
+        self._client: Optional["httpx.Client"] = None
+        self._client_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        self._local = threading.local()
+
+    @property
+    def client(self) -> "httpx.Client":
+        """Return the pooled `httpx.Client`, creating it on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+
+                    self._client = httpx.Client(
+                        base_url=self.url,
+                        headers=self.headers,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+        return self._client
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    @contextlib.contextmanager
+    def extra_headers(self, headers: dict[str, str]) -> Iterator[None]:
+        """Send additional headers with all requests made in this thread.
+
+        Example:
+            >>> with http.extra_headers({"Idempotency-Key": key}):
+            ...     http.post("/tasks/", data=task)
+        """
+        previous = getattr(self._local, "headers", {})
+        self._local.headers = {**previous, **headers}
+        try:
+            yield
+        finally:
+            self._local.headers = previous
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[dict[str, str]] = None) -> tuple:
+        """Return the response cache key for a GET request."""
+        return (url, tuple(sorted((params or {}).items())))
+
+    def invalidate(self, *patterns: str) -> int:
+        """Remove cached responses for URLs matching any of the patterns.
+
+        Args:
+            patterns: Shell style URL patterns, e.g. `/tasks/*/evaluations/`.
+
+        Returns:
+            Number of removed entries.
+        """
+        if self.cache is None:
+            return 0
+        with self._cache_lock:
+            # Responses of requests that were in flight may already be stale.
+            self._generation += 1
+        return self.cache.delete_where(
+            lambda key: any(fnmatch.fnmatchcase(key[0], p) for p in patterns)
+        )
+
+    @staticmethod
+    def encode(
+        data: Union[Model, bytes, Iterable[bytes], None], partial: bool = False
+    ) -> Union[bytes, Iterable[bytes]]:
+        """Encode request body.
+
+        Models are serialized to JSON. Bytes are sent as they are and any other
+        iterable is treated as an already encoded body and is streamed to the
+        server chunk by chunk.
+
+        Args:
+            data: Request body.
+            partial: Serialize only the fields that were explicitly set on the
+                model. Used for PATCH requests so unset fields are not cleared.
+        """
+        if data is None:
+            return b"{}"
+        if isinstance(data, Model):
+            return json.dumps(data.dict(exclude_unset=partial), default=str).encode(
+                "utf-8"
+            )
+        return data
+
     def request(
         self,
         method: str,
         url: str,
         headers: Optional[dict[str, str]] = None,
         params: Optional[dict[str, str]] = None,
-        data: Optional[Model] = None,
+        data: Union[Model, bytes, Iterable[bytes], None] = None,
         timeout: Optional[float] = None,
+        authenticate: bool = True,
     ) -> dict:
         """Request method.
 
@@ -75,58 +200,72 @@ class HttpClient:
             url: Partial url of the request. It is added to the base url
             headers: Dictionary of additional HTTP headers
             params: Dictionary of query parameters for the request
-            data: A JSON serializable Python object to send in the body of the request.
-                Used only in POST requests.
+            data: A model to send as JSON in the body of the request, an already
+                encoded body, or an iterable of encoded chunks that are streamed
+                as the body. Used only in POST and PATCH requests.
             timeout: How many seconds to wait for the server to send data before
                 giving up.
+            authenticate: Send the authorization header.
 
         Returns:
             Deserialized json response.
         """
-        headers = {**self.headers, **(headers or {})}
+        headers = {
+            **self.headers,
+            **getattr(self._local, "headers", {}),
+            **(headers or {}),
+        }
 
         # Set authorization token
-        if self.token.strip() != "":
-            headers["Authorization"] = f"{self.authorization_method.value} {self.token}"
+        if authenticate:
+            token = (
+                self.token if self.token_manager is None else self.token_manager.token()
+            )
+            if token.strip() != "":
+                headers["Authorization"] = f"{self.authorization_method.value} {token}"
 
         timeout = timeout or self.timeout
+        import httpx
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
 
         try:
-            with httpx.Client(base_url=self.url, headers=self.headers) as client:
-                if method.lower() == "get":
-                    self.response = client.get(
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        timeout=timeout,
-                    )
-                elif method.lower() == "patch":
-                    self.response = client.patch(
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        data=({} if data is None else data.dict()),
-                        timeout=timeout,
-                    )
-                elif method.lower() == "post":
-                    self.response = client.post(
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        data=({} if data is None else data.dict()),
-                        timeout=timeout,
-                    )
-                elif method.lower() == "delete":
-                    self.response = client.delete(
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        timeout=timeout,
-                    )
-                else:
-                    raise errors.HttpClientError(
-                        f"Unsupported method: {method}", status_code=405
-                    )
+            client = self.client
+            if method.lower() == "get":
+                response = client.get(
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    timeout=timeout,
+                )
+            elif method.lower() == "patch":
+                response = client.patch(
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=self.encode(data, partial=True),
+                    timeout=timeout,
+                )
+            elif method.lower() == "post":
+                response = client.post(
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=self.encode(data),
+                    timeout=timeout,
+                )
+            elif method.lower() == "delete":
+                response = client.delete(
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    timeout=timeout,
+                )
+            else:
+                raise errors.HttpClientError(
+                    f"Unsupported method: {method}", status_code=405
+                )
         except httpx.TimeoutException as e:
             # If request timed out, let upper level handle it they way it sees
             # fit one place might want to retry another might not.
@@ -138,25 +277,30 @@ class HttpClient:
         except Exception as e:
             raise errors.HttpClientError(f"Unknown error. {e!r}") from e
 
-        if 200 <= self.response.status_code <= 299:
+        # Keep the last response around for inspection. Use the local reference
+        # below so concurrent requests don't see each other's responses.
+        self.response = response
+
+        if 200 <= response.status_code <= 299:
             try:
-                return self.response.json() if self.response.text else {}
+                return response.json() if response.text else {}
             except Exception as e:
                 raise errors.HttpClientError(
                     f"Error while parsing server response: {e!r}",
-                    response=self.response,
+                    response=response,
                 ) from e
 
         # Check rate limit
-        limit = self.response.headers.get("X-Ratelimit-Limit", None)
+        limit = response.headers.get("X-Ratelimit-Limit", None)
         if limit is not None:
-            remaining = self.response.headers["X-Ratelimit-Remaining"]
-            reset = self.response.headers["X-Ratelimit-Reset"]
-            retry = self.response.headers["X-Ratelimit-Retry"]
+            remaining = response.headers["X-Ratelimit-Remaining"]
+            reset = response.headers["X-Ratelimit-Reset"]
+            retry = response.headers["X-Ratelimit-Retry"]
 
-            if remaining == 0:
+            # Header values are strings.
+            if remaining.strip() == "0":
                 raise errors.HttpRateLimitExceeded(
-                    response=self.response,
+                    response=response,
                     limit=limit,
                     remaining=remaining,
                     reset=reset,
@@ -164,23 +308,56 @@ class HttpClient:
                 )
 
         # Try known error messages
-        message = self.ERRORS.get(self.response.status_code, None)
+        message = self.ERRORS.get(response.status_code, None)
         if message is not None:
-            raise errors.HttpClientError(message, response=self.response)
+            raise errors.HttpClientError(message, response=response)
 
-        if self.response.status_code == 400:
+        if response.status_code == 400:
             try:
-                message = self.response.json()["error"]
+                message = response.json()["error"]
             except Exception:
                 message = "Bad Request."
-            raise errors.HttpClientError(message, response=self.response)
+            raise errors.HttpClientError(message, response=response)
 
         # Generalize unknown messages.
         try:
-            message = self.response.json()["message"]
+            message = response.json()["message"]
         except Exception:
             message = "Unknown error."
-        raise errors.HttpClientError(message, response=self.response)
+        raise errors.HttpClientError(message, response=response)
+
+    def __get(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]],
+        params: Optional[dict[str, str]],
+        timeout: Optional[float],
+    ) -> dict:
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return self.request(
+                    method="get",
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    timeout=timeout,
+                )
+            except errors.HttpClientError as e:
+                if attempt == self.retries or not errors.is_transient(e):
+                    raise
+                if isinstance(e, errors.HttpRateLimitExceeded):
+                    retry = e.retry
+                elif e.response is not None:
+                    retry = e.response.headers.get("Retry-After")
+                else:
+                    retry = None
+                try:
+                    delay = max(delay, float(retry))
+                except (TypeError, ValueError):
+                    pass
+                time.sleep(delay)
+                delay *= 2
 
     def get(
         self,
@@ -202,20 +379,24 @@ class HttpClient:
             Deserialized json response.
 
         """
-        return self.request(
-            method="get",
-            url=url,
-            headers=headers,
-            params=params,
-            timeout=timeout,
-        )
+        if self.cache is None:
+            return self.__get(url, headers, params, timeout)
+        key = self.cache_key(url, params)
+        response = self.cache.get(key)
+        if response is None:
+            generation = self._generation
+            response = self.__get(url, headers, params, timeout)
+            with self._cache_lock:
+                if generation == self._generation:
+                    self.cache.set(key, response)
+        return response
 
     def patch(
         self,
         url: str,
         headers: Optional[dict[str, str]] = None,
         params: Optional[dict[str, str]] = None,
-        data: Optional[Model] = None,
+        data: Union[Model, bytes, Iterable[bytes], None] = None,
         timeout: Optional[float] = None,
     ) -> dict:
         """Perform patch request.
@@ -224,7 +405,8 @@ class HttpClient:
             url: Partial url of the request. It is added to the base url
             headers: Dictionary of additional HTTP headers
             params: Dictionary of query parameters for the request
-            data: A JSON serializable Python object to send in the body of the request.
+            data: A model to send as JSON in the body of the request, or an iterable
+                of already encoded chunks that are streamed as the body.
             timeout: How many seconds to wait for the server to send data before
                 giving up.
 
@@ -246,7 +428,7 @@ class HttpClient:
         url: str,
         headers: Optional[dict[str, str]] = None,
         params: Optional[dict[str, str]] = None,
-        data: Optional[Model] = None,
+        data: Union[Model, bytes, Iterable[bytes], None] = None,
         timeout: Optional[float] = None,
     ) -> dict:
         """Perform post request.
@@ -255,7 +437,8 @@ class HttpClient:
             url: Partial url of the request. It is added to the base url
             headers: Dictionary of additional HTTP headers
             params: Dictionary of query parameters for the request
-            data: A JSON serializable Python object to send in the body of the request.
+            data: A model to send as JSON in the body of the request, or an iterable
+                of already encoded chunks that are streamed as the body.
             timeout: How many seconds to wait for the server to send
                 data before giving up
 
@@ -0,0 +1,416 @@
+__all__ = ["JournalEntry", "ReplayReport", "WriteJournal"]
+
+import io
+import os
+import json
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Type, Union
+
+from sotagents import consts
+from sotagents.config import get_config
+from sotagents.errors import is_transient
+from sotagents.bulk import IDEMPOTENCY_HEADER
+from sotagents.sync import DeltaSynchronizer
+from sotagents.writebehind import merge_update
+from sotagents.models import (
+    Model,
+    TaskCreateRequest,
+    TaskUpdateRequest,
+    DatasetCreateRequest,
+    DatasetUpdateRequest,
+    MetricCreateRequest,
+    MetricUpdateRequest,
+    ResultCreateRequest,
+    ResultUpdateRequest,
+    EvaluationTableCreateRequest,
+    EvaluationTableUpdateRequest,
+    EvaluationTableSyncRequest,
+)
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+#: Mutating client methods that can be journaled and their request models.
+JOURNALED_METHODS: dict[str, Optional[Type[Model]]] = {
+    "task_add": TaskCreateRequest,
+    "task_update": TaskUpdateRequest,
+    "task_delete": None,
+    "dataset_add": DatasetCreateRequest,
+    "dataset_update": DatasetUpdateRequest,
+    "dataset_delete": None,
+    "evaluation_create": EvaluationTableCreateRequest,
+    "evaluation_update": EvaluationTableUpdateRequest,
+    "evaluation_delete": None,
+    "evaluation_metric_add": MetricCreateRequest,
+    "evaluation_metric_update": MetricUpdateRequest,
+    "evaluation_metric_delete": None,
+    "evaluation_result_add": ResultCreateRequest,
+    "evaluation_result_update": ResultUpdateRequest,
+    "evaluation_result_delete": None,
+    "evaluation_synchronize": EvaluationTableSyncRequest,
+}
+
+
+@dataclass
+class JournalEntry:
+    """Single recorded write.
+
+    Attributes:
+        id: Unique entry ID, also used as the idempotency key on replay.
+        method: Name of the client method.
+        args: Positional arguments of the method before the request.
+        data: Fields explicitly set on the request, `None` for deletes.
+        ts: Unix timestamp when the write was recorded.
+        offset: Byte offset just after the entry in the journal file.
+    """
+
+    id: str
+    method: str
+    args: list[str]
+    data: Optional[dict] = None
+    ts: float = 0.0
+    offset: int = 0
+
+    @property
+    def request(self) -> Optional[Model]:
+        model = JOURNALED_METHODS[self.method]
+        return None if model is None or self.data is None else model(**self.data)
+
+    @property
+    def resource(self) -> Optional[tuple]:
+        """Key of the resource the entry modifies, `None` for creates."""
+        if self.method == "evaluation_synchronize":
+            return (self.method, DeltaSynchronizer.key(self.request))
+        for suffix in ("_update", "_delete"):
+            if self.method.endswith(suffix):
+                return (self.method[: -len(suffix)], *self.args)
+        return None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "id": self.id,
+                "ts": self.ts,
+                "method": self.method,
+                "args": self.args,
+                "data": self.data,
+            },
+            default=str,
+        )
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a journal replay.
+
+    Attributes:
+        applied: Number of requests sent to the server.
+        superseded: Number of entries that were merged into or replaced by a
+            later entry and didn't need a request of their own.
+        failed: Entries rejected by the server and their errors. They are moved
+            to the dead letter file and are not replayed again.
+        remaining: `True` if the replay stopped on a transient error and there
+            are entries left in the journal.
+    """
+
+    applied: int = 0
+    superseded: int = 0
+    failed: list[tuple[JournalEntry, Exception]] = field(default_factory=list)
+    remaining: bool = False
+
+
+class _Operation:
+    __slots__ = ("entry", "request", "entries", "superseded")
+
+    def __init__(self, entry: JournalEntry):
+        self.entry = entry
+        self.request = entry.request
+        self.entries = [entry]
+        self.superseded = False
+
+
+class WriteJournal:
+    """Durable append-only journal of write operations.
+
+    Producers record mutating calls in a local JSON lines file and never talk
+    to the server. The journal is later replayed in order against a client.
+    Replay progress is checkpointed, so an interrupted replay continues where it
+    stopped.
+
+    Journals belong to a configuration profile and are replayed only with
+    clients of the same profile, IDs in the entries are valid on its server
+    only.
+
+    Every journaled client method is available on the journal with the same
+    signature, e.g. `journal.task_update(task_id, TaskUpdateRequest(...))`.
+
+    Example:
+        >>> journal = WriteJournal("ingest")
+        >>> journal.task_add(TaskCreateRequest(name="Image Classification"))
+        >>> report = journal.replay(client)
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        path: Union[str, Path] = consts.DEFAULT_JOURNAL_PATH,
+        fsync: bool = True,
+        profile: Optional[str] = None,
+    ):
+        """Initialize.
+
+        Args:
+            name: Journal name.
+            path: Directory where journals are stored, in a subdirectory per
+                profile.
+            fsync: Flush every recorded entry to disk before returning.
+            profile: Configuration profile of the journal. Defaults to the
+                active profile.
+        """
+        self.profile = profile or get_config().profile
+        self.path = Path(path).expanduser().resolve() / self.profile
+        self.name = name
+        self.fsync = fsync
+        self.journal_file = self.path / f"{name}.jsonl"
+        self.checkpoint_file = self.path / f"{name}.checkpoint"
+        self.failed_file = self.path / f"{name}.failed.jsonl"
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Callable[..., JournalEntry]:
+        if name not in JOURNALED_METHODS:
+            raise AttributeError(name)
+
+        def record(*args: Any) -> JournalEntry:
+            return self.record(name, *args)
+
+        record.__name__ = name
+        return record
+
+    def _append(self, file: Path, entry: JournalEntry):
+        self.path.mkdir(parents=True, exist_ok=True)
+        with io.open(file, "a", encoding="utf-8") as f:
+            f.write(entry.to_json() + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def record(self, method: str, *args: Any) -> JournalEntry:
+        """Record a write.
+
+        Args:
+            method: Name of the client method.
+            args: Method arguments. The request, if the method takes one, must be
+                the last argument.
+
+        Returns:
+            Recorded entry.
+        """
+        if method not in JOURNALED_METHODS:
+            raise ValueError(f"Method cannot be journaled: {method}")
+        request = None
+        if JOURNALED_METHODS[method] is not None:
+            *args, request = args
+            if not isinstance(request, JOURNALED_METHODS[method]):
+                raise TypeError(
+                    f"{method} expects {JOURNALED_METHODS[method].__name__}, "
+                    f"got {type(request).__name__}."
+                )
+        entry = JournalEntry(
+            id=str(uuid.uuid4()),
+            method=method,
+            args=[str(arg) for arg in args],
+            data=None if request is None else request.dict(exclude_unset=True),
+            ts=time.time(),
+        )
+        with self._lock:
+            self._append(self.journal_file, entry)
+        return entry
+
+    @property
+    def checkpoint(self) -> int:
+        """Byte offset up to which the journal was replayed."""
+        try:
+            return int(self.checkpoint_file.read_text().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _save_checkpoint(self, offset: int):
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with io.open(fd, "w") as f:
+            f.write(str(offset))
+        os.replace(tmp, self.checkpoint_file)
+
+    def entries(self, offset: Optional[int] = None) -> Iterator[JournalEntry]:
+        """Iterate over the entries recorded after the offset.
+
+        Args:
+            offset: Byte offset to start from. Defaults to the checkpoint.
+        """
+        offset = self.checkpoint if offset is None else offset
+        try:
+            f = io.open(self.journal_file, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Entry is still being written.
+                    return
+                offset += len(line)
+                data = json.loads(line)
+                yield JournalEntry(offset=offset, **data)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.entries())
+
+    @staticmethod
+    def _coalesce(batch: list[JournalEntry]) -> list[_Operation]:
+        """Merge successive updates and drop writes superseded by later ones.
+
+        Merged updates are sent at the position of the last merged entry, so
+        they never run before a write they might depend on.
+        """
+        operations: list[_Operation] = []
+        updates: dict[tuple, _Operation] = {}
+        syncs: dict[tuple, _Operation] = {}
+        for entry in batch:
+            resource = entry.resource
+            if entry.method.endswith("_update"):
+                operation = updates.get(resource)
+                if operation is None:
+                    operation = updates[resource] = _Operation(entry)
+                else:
+                    operation.request = merge_update(operation.request, entry.request)
+                    operation.entries.append(entry)
+                    operations.remove(operation)
+            elif entry.method.endswith("_delete"):
+                # Updates of a resource that is deleted afterwards are not needed.
+                superseded = updates.pop(resource, None)
+                if superseded is not None:
+                    superseded.superseded = True
+                operation = _Operation(entry)
+            elif entry.method == "evaluation_synchronize":
+                # Synchronization replaces the whole table so only the last one
+                # is needed.
+                superseded = syncs.get(resource)
+                if superseded is not None:
+                    superseded.superseded = True
+                operation = syncs[resource] = _Operation(entry)
+            else:
+                operation = _Operation(entry)
+            if entry.method.startswith("evaluation_") and resource not in syncs:
+                # Evaluation tables were modified in between, the following
+                # synchronizations can't replace the previous ones.
+                syncs.clear()
+            operations.append(operation)
+        return operations
+
+    def _apply(self, client: "PapersWithCodeClient", operation: _Operation):
+        entry = operation.entry
+        method = getattr(client, entry.method)
+        args = (
+            entry.args
+            if operation.request is None
+            else [*entry.args, operation.request]
+        )
+        key = operation.entries[-1].id
+        with client.http.extra_headers({IDEMPOTENCY_HEADER: key}):
+            method(*args)
+
+    def replay(
+        self,
+        client: "PapersWithCodeClient",
+        batch_size: int = 100,
+        on_error: Optional[Callable[[JournalEntry, Exception], None]] = None,
+    ) -> ReplayReport:
+        """Replay the recorded writes in order.
+
+        Entries are read in batches. Within a batch successive updates of the
+        same resource are merged into one request, updates of resources deleted
+        later in the batch are dropped and only the last synchronization of an
+        evaluation table is sent. The checkpoint is saved after every batch.
+
+        Replay stops on transient errors (timeouts, connection errors, rate
+        limits) so it can be resumed later. Writes rejected by the server are
+        moved to the dead letter file and replay continues.
+
+        Args:
+            client: Client used to send the writes.
+            batch_size: Number of entries read and coalesced at once.
+            on_error: Callback called for every rejected entry.
+
+        Returns:
+            ReplayReport object.
+        """
+        if client.config.profile != self.profile:
+            raise ValueError(
+                f"Journal of profile '{self.profile}' cannot be replayed with a "
+                f"client of profile '{client.config.profile}'."
+            )
+        report = ReplayReport()
+        entries = self.entries()
+        while True:
+            batch = [entry for _, entry in zip(range(batch_size), entries)]
+            if len(batch) == 0:
+                return report
+            done: set[str] = set()
+            try:
+                for operation in self._coalesce(batch):
+                    if operation.superseded:
+                        report.superseded += len(operation.entries)
+                    else:
+                        try:
+                            self._apply(client, operation)
+                            report.applied += 1
+                            report.superseded += len(operation.entries) - 1
+                        except Exception as e:
+                            if is_transient(e):
+                                raise
+                            logger.warning(
+                                "Journal entry %s failed: %s", operation.entry.id, e
+                            )
+                            for entry in operation.entries:
+                                report.failed.append((entry, e))
+                                self._append(self.failed_file, entry)
+                                if on_error is not None:
+                                    on_error(entry, e)
+                    done.update(entry.id for entry in operation.entries)
+            except Exception as e:
+                logger.warning("Journal replay interrupted: %s", e)
+                report.remaining = True
+                return report
+            finally:
+                # Checkpoint the longest prefix of the batch that is done.
+                offset = None
+                for entry in batch:
+                    if entry.id not in done:
+                        break
+                    offset = entry.offset
+                if offset is not None:
+                    self._save_checkpoint(offset)
+
+    def compact(self):
+        """Remove replayed entries from the journal file.
+
+        Must not run while other processes are recording into the journal.
+        """
+        with self._lock:
+            entries = list(self.entries())
+            self.path.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with io.open(fd, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(entry.to_json() + "\n")
+            os.replace(tmp, self.journal_file)
+            self._save_checkpoint(0)
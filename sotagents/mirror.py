@@ -0,0 +1,681 @@
+__all__ = ["MirrorTable", "MirrorStats", "Mirror"]
+
+import re
+import json
+import time
+import sqlite3
+import logging
+import datetime
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MirrorTable:
+    """Local table filled from a paginated list method.
+
+    Attributes:
+        name: Table name.
+        method: Name of the client list method.
+        key: Primary key column.
+        columns: Columns in the order of the `CREATE TABLE` statement. JSON
+            columns are stored as JSON text.
+        ordering: Ordering used by incremental syncs, newest rows first.
+        watermark: Column that grows with the ordering. Tables without it are
+            synced fully every time.
+        json_columns: Columns holding lists or dictionaries.
+    """
+
+    name: str
+    method: str
+    key: str
+    columns: tuple[str, ...]
+    ordering: Optional[str] = None
+    watermark: Optional[str] = None
+    json_columns: tuple[str, ...] = ()
+
+
+@dataclass
+class MirrorStats:
+    """Outcome of syncing a table.
+
+    Attributes:
+        table: Table name.
+        full: Whether all rows were fetched.
+        fetched: Number of rows fetched from the server.
+        deleted: Number of rows removed because they are gone from the server.
+        watermark: Watermark after the sync.
+        seconds: Duration of the sync.
+    """
+
+    table: str
+    full: bool
+    fetched: int = 0
+    deleted: int = 0
+    watermark: Optional[str] = None
+    seconds: float = 0.0
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    arxiv_id TEXT,
+    nips_id TEXT,
+    url_abs TEXT,
+    url_pdf TEXT,
+    title TEXT NOT NULL,
+    abstract TEXT,
+    authors TEXT,
+    published TEXT,
+    conference TEXT,
+    conference_url_abs TEXT,
+    conference_url_pdf TEXT,
+    proceeding TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_arxiv_id ON papers (arxiv_id);
+CREATE INDEX IF NOT EXISTS papers_published ON papers (published);
+CREATE INDEX IF NOT EXISTS papers_conference ON papers (conference, proceeding);
+
+CREATE TABLE IF NOT EXISTS repositories (
+    url TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    stars INTEGER,
+    framework TEXT,
+    is_official INTEGER,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS repositories_owner_name ON repositories (owner, name);
+CREATE INDEX IF NOT EXISTS repositories_stars ON repositories (stars);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_name ON tasks (name);
+
+CREATE TABLE IF NOT EXISTS datasets (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    full_name TEXT,
+    url TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS datasets_name ON datasets (name);
+
+CREATE TABLE IF NOT EXISTS methods (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    full_name TEXT,
+    description TEXT,
+    paper TEXT REFERENCES papers (id),
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS methods_name ON methods (name);
+CREATE INDEX IF NOT EXISTS methods_paper ON methods (paper);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    id TEXT PRIMARY KEY,
+    task TEXT REFERENCES tasks (id),
+    dataset TEXT REFERENCES datasets (id),
+    description TEXT,
+    mirror_url TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evaluations_task ON evaluations (task);
+CREATE INDEX IF NOT EXISTS evaluations_dataset ON evaluations (dataset);
+
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    evaluation TEXT NOT NULL REFERENCES evaluations (id),
+    best_rank INTEGER,
+    metrics TEXT,
+    methodology TEXT,
+    uses_additional_data INTEGER,
+    paper TEXT REFERENCES papers (id),
+    best_metric TEXT,
+    evaluated_on TEXT,
+    external_source_url TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_evaluation ON results (evaluation);
+CREATE INDEX IF NOT EXISTS results_paper ON results (paper);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5 (
+    title,
+    abstract,
+    content = 'papers',
+    tokenize = 'porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract)
+    VALUES (new.rowid, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+    VALUES ('delete', old.rowid, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, abstract ON papers
+WHEN old.title IS NOT new.title OR old.abstract IS NOT new.abstract BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+    VALUES ('delete', old.rowid, old.title, old.abstract);
+    INSERT INTO papers_fts (rowid, title, abstract)
+    VALUES (new.rowid, new.title, new.abstract);
+END;
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    name TEXT PRIMARY KEY,
+    value TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class Mirror:
+    """Local SQLite copy of the catalogue.
+
+    The first sync loads all rows of the list endpoints. Later syncs of tables
+    with a watermark fetch rows in `ordering` order only until they reach rows
+    older than the watermark, other tables are fetched fully. Full syncs also
+    remove rows that are gone from the server.
+
+    Foreign keys document the relations and are used by joins, but they are
+    not enforced. Rows can reference objects that are not mirrored yet, see
+    `dangling`, and results of removed evaluation tables are deleted by the
+    results sync.
+
+    Example:
+        >>> with Mirror(client) as mirror:
+        ...     mirror.sync()
+        ...     rows = mirror.query(
+        ...         "SELECT p.title FROM results r JOIN papers p ON p.id = r.paper "
+        ...         "WHERE r.evaluation = ?",
+        ...         ("imagenet-image-classification",),
+        ...     )
+    """
+
+    TABLES: dict[str, MirrorTable] = {
+        table.name: table
+        for table in (
+            MirrorTable(
+                name="papers",
+                method="paper_list",
+                key="id",
+                columns=(
+                    "id",
+                    "arxiv_id",
+                    "nips_id",
+                    "url_abs",
+                    "url_pdf",
+                    "title",
+                    "abstract",
+                    "authors",
+                    "published",
+                    "conference",
+                    "conference_url_abs",
+                    "conference_url_pdf",
+                    "proceeding",
+                ),
+                ordering="-published",
+                watermark="published",
+                json_columns=("authors",),
+            ),
+            MirrorTable(
+                name="repositories",
+                method="repository_list",
+                key="url",
+                columns=(
+                    "url",
+                    "owner",
+                    "name",
+                    "description",
+                    "stars",
+                    "framework",
+                    "is_official",
+                ),
+            ),
+            MirrorTable(
+                name="tasks",
+                method="task_list",
+                key="id",
+                columns=("id", "name", "description"),
+            ),
+            MirrorTable(
+                name="datasets",
+                method="dataset_list",
+                key="id",
+                columns=("id", "name", "full_name", "url"),
+            ),
+            MirrorTable(
+                name="methods",
+                method="method_list",
+                key="id",
+                columns=("id", "name", "full_name", "description", "paper"),
+            ),
+            MirrorTable(
+                name="evaluations",
+                method="evaluation_list",
+                key="id",
+                columns=("id", "task", "dataset", "description", "mirror_url"),
+            ),
+        )
+    }
+
+    #: Columns of the results table, filled per evaluation table.
+    RESULT_COLUMNS = (
+        "id",
+        "evaluation",
+        "best_rank",
+        "metrics",
+        "methodology",
+        "uses_additional_data",
+        "paper",
+        "best_metric",
+        "evaluated_on",
+        "external_source_url",
+    )
+
+    @staticmethod
+    def default_path(client: "PapersWithCodeClient") -> Path:
+        """Path of the database file of the client if no path is given."""
+        return client.server_cache_dir / "mirror.sqlite"
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        path: Union[str, Path, None] = None,
+        items_per_page: int = 500,
+        concurrency: Optional[int] = None,
+        overlap: float = 7,
+    ):
+        """Initialize.
+
+        Args:
+            client: Client used to fetch the rows.
+            path: Path to the database file. Defaults to `mirror.sqlite` in the
+                server cache directory of the client, see
+                `PapersWithCodeClient.server_cache_dir`.
+            items_per_page: Number of rows fetched per request.
+            concurrency: Maximal number of concurrent requests. Defaults to the
+                concurrency of the client.
+            overlap: Incremental syncs fetch rows up to this many days older
+                than the watermark, to catch rows added late.
+        """
+        self.client = client
+        self.path = Path(path) if path is not None else self.default_path(client)
+        self.items_per_page = items_per_page
+        self.concurrency = concurrency or client.concurrency
+        self.overlap = overlap
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            indexed = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'"
+            ).fetchone()
+            self.connection.executescript(SCHEMA)
+            if indexed is None:
+                # Mirrors created before the full-text index was added.
+                self.connection.execute(
+                    "INSERT INTO papers_fts (papers_fts) VALUES ('rebuild')"
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        """Run a read query on the mirror."""
+        with self._lock:
+            return self.connection.execute(sql, tuple(params)).fetchall()
+
+    def watermarks(self) -> dict[str, Optional[str]]:
+        """Return the watermark of every synced table."""
+        return {
+            row["name"]: row["value"] for row in self.query("SELECT * FROM watermarks")
+        }
+
+    def dangling(self) -> list[tuple[str, int, str]]:
+        """Return rows that reference objects missing from the mirror.
+
+        Returns:
+            Table, row ID and referenced table of every dangling reference.
+        """
+        return [
+            (row[0], row[1], row[2]) for row in self.query("PRAGMA foreign_key_check")
+        ]
+
+    @staticmethod
+    def match_query(q: str) -> Optional[str]:
+        """Convert free text to a full-text query matching all of its words.
+
+        Returns:
+            FTS5 query or `None` if the text has no words.
+        """
+        words = re.findall(r"\w+", q.lower())
+        if len(words) == 0:
+            return None
+        return " ".join(f'"{word}"' for word in words)
+
+    def papers(
+        self,
+        q: Optional[str] = None,
+        arxiv_id: Optional[str] = None,
+        title: Optional[str] = None,
+        abstract: Optional[str] = None,
+        ordering: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[dict]]:
+        """Query the mirrored papers.
+
+        Takes the same filters as `PapersWithCodeClient.paper_list`. Papers
+        matching `q` are ranked with BM25 over the title and the abstract,
+        with title matches weighted higher, unless `ordering` is given.
+
+        Args:
+            q: Words that must appear in the title or the abstract.
+            arxiv_id: Filter papers by arxiv id.
+            title: Filter papers by part of the title.
+            abstract: Filter papers by part of the abstract.
+            ordering: Column to order by, prefixed with `-` for descending
+                order, e.g. `-published`.
+            limit: Maximal number of returned papers.
+            offset: Number of skipped papers.
+
+        Returns:
+            Number of all matching papers and the papers on the requested page
+            in the format of the API.
+        """
+        table = self.TABLES["papers"]
+        columns = table.columns
+        joins = ""
+        where = []
+        params: list[Any] = []
+        order = "p.rowid"
+        if q is not None:
+            match = self.match_query(q)
+            if match is None:
+                return 0, []
+            joins = "JOIN papers_fts ON papers_fts.rowid = p.rowid"
+            where.append("papers_fts MATCH ?")
+            params.append(match)
+            order = "bm25(papers_fts, 10.0, 1.0)"
+        if arxiv_id is not None:
+            where.append("p.arxiv_id = ?")
+            params.append(arxiv_id)
+        if title is not None:
+            where.append("instr(lower(p.title), lower(?)) > 0")
+            params.append(title)
+        if abstract is not None:
+            where.append("instr(lower(p.abstract), lower(?)) > 0")
+            params.append(abstract)
+        if ordering is not None:
+            column = ordering.lstrip("-")
+            if column not in columns:
+                raise ValueError(f"Invalid ordering: {ordering}")
+            order = f"p.{column} {'DESC' if ordering.startswith('-') else 'ASC'}"
+
+        sql = f"FROM papers p {joins} {'WHERE ' + ' AND '.join(where) if where else ''}"
+        count = self.query(f"SELECT count(*) {sql}", params)[0][0]
+        rows = self.query(
+            f"SELECT {', '.join(f'p.{c}' for c in columns)} {sql} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        papers = []
+        for row in rows:
+            paper = dict(zip(columns, row))
+            for column in table.json_columns:
+                if paper[column] is not None:
+                    paper[column] = json.loads(paper[column])
+            papers.append(paper)
+        return count, papers
+
+    @staticmethod
+    def _row(table: MirrorTable, item: dict, synced_at: float) -> tuple:
+        values = []
+        for column in table.columns:
+            value = item.get(column)
+            if column in table.json_columns and value is not None:
+                value = json.dumps(value)
+            values.append(value)
+        values.append(synced_at)
+        return tuple(values)
+
+    def _upsert(self, name: str, key: str, columns: Iterable[str], rows: list[tuple]):
+        # Updated in place, a replace would skip the full-text index triggers.
+        columns = (*columns, "synced_at")
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+        sql = (
+            f"INSERT INTO {name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        )
+        with self._lock, self.connection:
+            self.connection.executemany(sql, rows)
+
+    def _set_watermark(self, name: str, value: Optional[str]):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO watermarks (name, value, synced_at) "
+                "VALUES (?, ?, ?)",
+                (name, value, time.time()),
+            )
+
+    def _delete_stale(
+        self, name: str, synced_at: float, where: str = "", params: tuple = ()
+    ) -> int:
+        with self._lock, self.connection:
+            return self.connection.execute(
+                f"DELETE FROM {name} WHERE synced_at < ? {where}", (synced_at, *params)
+            ).rowcount
+
+    def _batches(self, items: Iterator[dict], size: int) -> Iterator[list[dict]]:
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def sync_table(self, name: str, full: bool = False) -> MirrorStats:
+        """Sync a single table.
+
+        Args:
+            name: Table name, one of `TABLES`.
+            full: Fetch all rows even if the table has a watermark.
+
+        Returns:
+            Sync statistics.
+        """
+        table = self.TABLES[name]
+        start = time.time()
+        watermark = self.watermarks().get(name)
+        incremental = not full and table.watermark is not None and watermark is not None
+        stats = MirrorStats(table=name, full=not incremental, watermark=watermark)
+        method = getattr(self.client, table.method)
+        kwargs: dict[str, Any] = {"items_per_page": self.items_per_page}
+
+        if incremental:
+            # Newest rows first, stop at the first page older than the watermark.
+            kwargs["ordering"] = table.ordering
+            cutoff = self._cutoff(watermark)
+            items = self.client.iterate_raw(method, **kwargs)
+        else:
+            if table.ordering is not None:
+                kwargs["ordering"] = table.ordering
+            cutoff = None
+            items = self.client.iterate_raw(
+                method, concurrency=self.concurrency, **kwargs
+            )
+
+        highest = watermark
+        try:
+            for batch in self._batches(items, self.items_per_page):
+                self._upsert(
+                    name,
+                    table.key,
+                    table.columns,
+                    [self._row(table, item, start) for item in batch],
+                )
+                stats.fetched += len(batch)
+                if table.watermark is not None:
+                    values = [
+                        item[table.watermark]
+                        for item in batch
+                        if item.get(table.watermark) is not None
+                    ]
+                    if values and (highest is None or max(values) > highest):
+                        highest = max(values)
+                    if cutoff is not None and values and max(values) < cutoff:
+                        break
+        finally:
+            items.close()
+
+        if not incremental:
+            stats.deleted = self._delete_stale(name, start)
+        stats.watermark = highest
+        self._set_watermark(name, highest)
+        stats.seconds = time.time() - start
+        return stats
+
+    def _cutoff(self, watermark: str) -> str:
+        try:
+            date = datetime.date.fromisoformat(watermark[:10])
+        except ValueError:
+            return watermark
+        return (date - datetime.timedelta(days=self.overlap)).isoformat()
+
+    def _result_row(self, evaluation_id: str, item: dict, synced_at: float) -> tuple:
+        values = {**item, "evaluation": evaluation_id}
+        metrics = values.get("metrics")
+        if metrics is not None:
+            values["metrics"] = json.dumps(metrics)
+        return (*(values.get(column) for column in self.RESULT_COLUMNS), synced_at)
+
+    def sync_results(self, evaluations: Optional[Iterable[str]] = None) -> MirrorStats:
+        """Sync results of evaluation tables.
+
+        Results are fetched concurrently, one list per evaluation table, and
+        results removed from the server are deleted.
+
+        Args:
+            evaluations: IDs of the evaluation tables. Defaults to all mirrored
+                evaluation tables.
+
+        Returns:
+            Sync statistics.
+        """
+        start = time.time()
+        stats = MirrorStats(table="results", full=evaluations is None)
+        if evaluations is None:
+            evaluations = [
+                row["id"] for row in self.query("SELECT id FROM evaluations")
+            ]
+        evaluations = list(evaluations)
+
+        def fetch(evaluation_id: str) -> list[tuple]:
+            return [
+                self._result_row(evaluation_id, item, start)
+                for item in self.client.iterate_raw(
+                    self.client.evaluation_result_list,
+                    evaluation_id,
+                    items_per_page=self.items_per_page,
+                )
+            ]
+
+        with ThreadPoolExecutor(
+            self.concurrency, thread_name_prefix="sotagents"
+        ) as pool:
+            for evaluation_id, rows in zip(evaluations, pool.map(fetch, evaluations)):
+                self._upsert("results", "id", self.RESULT_COLUMNS, rows)
+                stats.fetched += len(rows)
+                stats.deleted += self._delete_stale(
+                    "results",
+                    start,
+                    where="AND evaluation = ?",
+                    params=(evaluation_id,),
+                )
+        with self._lock, self.connection:
+            # Results of evaluation tables that are gone.
+            stats.deleted += self.connection.execute(
+                "DELETE FROM results "
+                "WHERE evaluation NOT IN (SELECT id FROM evaluations)"
+            ).rowcount
+        self._set_watermark("results", None)
+        stats.seconds = time.time() - start
+        return stats
+
+    def sync(
+        self,
+        tables: Optional[Iterable[str]] = None,
+        full: bool = False,
+        results: bool = True,
+    ) -> list[MirrorStats]:
+        """Sync the mirror with the server.
+
+        Tables are synced in dependency order. Results are fetched for all
+        evaluation tables on full syncs and only for new evaluation tables on
+        incremental syncs, use `sync_results` to refresh the others.
+
+        Args:
+            tables: Names of the tables to sync. Defaults to all tables.
+            full: Fetch all rows even for tables with a watermark.
+            results: Sync results of the evaluation tables.
+
+        Returns:
+            Statistics of every synced table.
+        """
+        names = list(self.TABLES) if tables is None else list(tables)
+        unknown = set(names) - set(self.TABLES) - {"results"}
+        if unknown:
+            raise ValueError(f"Unknown mirror tables: {', '.join(sorted(unknown))}")
+        known = {row["id"] for row in self.query("SELECT id FROM evaluations")}
+        first = "results" not in self.watermarks()
+        report = []
+        for name in self.TABLES:
+            if name in names:
+                stats = self.sync_table(name, full=full)
+                logger.info(
+                    "Synced %s: %d fetched, %d deleted in %.1fs",
+                    name,
+                    stats.fetched,
+                    stats.deleted,
+                    stats.seconds,
+                )
+                report.append(stats)
+        if results or "results" in names:
+            evaluations = None
+            if not full and not first:
+                evaluations = [
+                    row["id"]
+                    for row in self.query("SELECT id FROM evaluations")
+                    if row["id"] not in known
+                ]
+            report.append(self.sync_results(evaluations))
+        return report
@@ -1,5 +1,6 @@
 __all__ = [
     "Page",
+    "LazyResults",
     "Model",
     "Paper",
     "Papers",
@@ -45,7 +46,7 @@ __all__ = [
     "EvaluationTableSyncResponse",
 ]
 
-from sotagents.models.page import Page
+from sotagents.models.page import Page, LazyResults
 from sotagents.models.model import Model
 from sotagents.models.paper import Paper, Papers
 from sotagents.models.repository import Repository, Repositories
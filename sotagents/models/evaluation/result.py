@@ -52,7 +52,7 @@ class _ResultRequest(Model):
         include=None,
         exclude=None,
         by_alias: bool = False,
-        skip_defaults: bool = False,
+        skip_defaults: Optional[bool] = None,
         exclude_unset: bool = False,
         exclude_defaults: bool = False,
         exclude_none: bool = False,
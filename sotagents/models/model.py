@@ -1,5 +1,80 @@
+from datetime import date, datetime
+from typing import Any, Callable, Optional, TypeVar
+
 from pydantic import BaseModel
+from pydantic.datetime_parse import parse_datetime
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+
+M = TypeVar("M", bound="Model")
+
+_Converter = Optional[Callable[[Any], Any]]
+
+
+def _nullable(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else convert(value)
+
+
+def _converter(field: ModelField) -> _Converter:
+    """Return the minimal conversion needed for a trusted field value.
+
+    Nested models are constructed, ISO dates are parsed and everything else is
+    used as is.
+    """
+    if isinstance(field.type_, type) and issubclass(field.type_, Model):
+        model = field.type_
+        if field.shape == SHAPE_LIST:
+            return _nullable(lambda items: [model.construct_trusted(i) for i in items])
+        if field.shape == SHAPE_SINGLETON:
+            return _nullable(model.construct_trusted)
+    elif field.shape == SHAPE_SINGLETON:
+        if field.type_ is datetime:
+            return _nullable(parse_datetime)
+        if field.type_ is date:
+            return _nullable(
+                lambda value: (
+                    value if isinstance(value, date) else date.fromisoformat(value)
+                )
+            )
+    return None
 
 
 class Model(BaseModel):
-    pass
+    @classmethod
+    def construct_trusted(cls: type[M], data: dict) -> M:
+        """Create a model from trusted data without validating it.
+
+        Nested models are constructed recursively and ISO formatted dates are
+        parsed, all other values are used as they are. Use it only for data
+        that is known to match the model, e.g. responses of the PapersWithCode
+        API. Missing optional fields get their default values.
+
+        Args:
+            data: Deserialized JSON object.
+
+        Returns:
+            Model instance.
+        """
+        plan = cls.__dict__.get("_trusted_plan")
+        if plan is None:
+            plan = [
+                (name, field, _converter(field))
+                for name, field in cls.__fields__.items()
+            ]
+            # Stored on the class directly so subclasses get their own plan.
+            type.__setattr__(cls, "_trusted_plan", plan)
+        values = {}
+        fields_set = set()
+        for name, field, convert in plan:
+            if field.alias in data:
+                value = data[field.alias]
+                values[name] = value if convert is None else convert(value)
+                fields_set.add(name)
+            else:
+                values[name] = field.get_default()
+        # Same as `BaseModel.construct` without its per call overhead.
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", fields_set)
+        model._init_private_attributes()
+        return model
@@ -1,8 +1,81 @@
-from typing import Optional
+from collections.abc import Sequence
+from typing import Any, Optional, Type, Union
 
+from pydantic import ValidationError as PydanticValidationError
+
+from sotagents.errors import ValidationError
 from sotagents.models.model import Model
 
 
+class LazyResults(Sequence):
+    """Results of a page that are converted to models only when accessed.
+
+    Raw items are kept as returned by the server and every item is converted
+    the first time it's accessed. Converted items are cached.
+    """
+
+    __slots__ = ("_items", "_models", "_model", "_trusted")
+
+    def __init__(self, items: list[dict], model: Type[Model], trusted: bool = False):
+        """Initialize.
+
+        Args:
+            items: Deserialized JSON objects.
+            model: Model of the items.
+            trusted: Build the models without validation.
+        """
+        self._items = items
+        self._models: list[Optional[Model]] = [None] * len(items)
+        self._model = model
+        self._trusted = trusted
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _get(self, index: int) -> Model:
+        model = self._models[index]
+        if model is None:
+            data = self._items[index]
+            try:
+                if self._trusted:
+                    model = self._model.construct_trusted(data)
+                else:
+                    model = self._model(**data)
+            except PydanticValidationError as e:
+                raise ValidationError(error=e)
+            self._models[index] = model
+        return model
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Model, list[Model]]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        return self._get(index)
+
+    def __iter__(self):
+        return (self._get(index) for index in range(len(self)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyResults)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        materialized = sum(model is not None for model in self._models)
+        return (
+            f"LazyResults({self._model.__name__}, "
+            f"{materialized}/{len(self)} materialized)"
+        )
+
+    @property
+    def raw(self) -> list[dict]:
+        """Items as returned by the server."""
+        return self._items
+
+
 class Page(Model):
     """Page model.
 
@@ -15,3 +88,40 @@ class Page(Model):
     count: int
     next_page: Optional[int]
     previous_page: Optional[int]
+
+    @classmethod
+    def construct_lazy(
+        cls,
+        count: int,
+        next_page: Optional[int],
+        previous_page: Optional[int],
+        results: list[dict],
+        trusted: bool = False,
+    ) -> "Page":
+        """Create a page whose results are converted to models on access.
+
+        Args:
+            count: Number of elements matching the query.
+            next_page: Number of the next page.
+            previous_page: Number of the previous page.
+            results: Deserialized JSON objects of the items on the page.
+            trusted: Build the item models without validation.
+
+        Returns:
+            Page with `LazyResults` as results.
+        """
+        return cls.construct(
+            count=count,
+            next_page=next_page,
+            previous_page=previous_page,
+            results=LazyResults(
+                results, cls.__fields__["results"].type_, trusted=trusted
+            ),
+        )
+
+    def _iter(self, *args, **kwargs):
+        # Used by `dict`, `json`, `copy` and comparison, which need real models.
+        results = self.__dict__.get("results")
+        if isinstance(results, LazyResults):
+            self.__dict__["results"] = list(results)
+        return super()._iter(*args, **kwargs)
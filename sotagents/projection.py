@@ -0,0 +1,86 @@
+__all__ = ["Projection"]
+
+from operator import itemgetter
+from typing import Any, Callable, Optional, Sequence, Union
+
+from sotagents.models import Model
+
+
+def _getter(field: str) -> Callable[[dict], Any]:
+    """Return a getter for a possibly dotted field, e.g. `paper.title`."""
+    keys = field.split(".")
+    if len(keys) == 1:
+        return lambda item: item.get(field)
+
+    def get(item: dict) -> Any:
+        for key in keys:
+            if item is None:
+                return None
+            item = item.get(key)
+        return item
+
+    return get
+
+
+class Projection:
+    """Converts raw items to dictionaries or tuples of selected fields.
+
+    Example:
+        >>> projection = Projection(["id", "paper.title"], tuples=True)
+        >>> projection([{"id": "1", "paper": {"title": "Title"}}])
+        [('1', 'Title')]
+    """
+
+    __slots__ = ("fields", "tuples", "_project")
+
+    def __init__(self, fields: Optional[Sequence[str]] = None, tuples: bool = False):
+        """Initialize.
+
+        Args:
+            fields: Fields to keep, nested fields are separated with a dot. All
+                fields are kept if not provided.
+            tuples: Return tuples of field values in the order of `fields`
+                instead of dictionaries.
+        """
+        self.fields = None if fields is None else list(fields)
+        self.tuples = tuples
+        self._project: Optional[Callable[[dict], Union[dict, tuple]]] = None
+        if self.fields is not None:
+            self._project = self._compile(self.fields)
+
+    def _compile(self, fields: list[str]) -> Callable[[dict], Union[dict, tuple]]:
+        if self.tuples and all("." not in field for field in fields):
+            if len(fields) == 1:
+                return lambda item: (item.get(fields[0]),)
+            try_get = itemgetter(*fields)
+
+            def project(item: dict) -> tuple:
+                try:
+                    return try_get(item)
+                except KeyError:
+                    return tuple(item.get(field) for field in fields)
+
+            return project
+        getters = [(field, _getter(field)) for field in fields]
+        if self.tuples:
+            return lambda item: tuple(get(item) for _, get in getters)
+        return lambda item: {field: get(item) for field, get in getters}
+
+    def __call__(
+        self, items: list[dict], model: Optional[type[Model]] = None
+    ) -> list[Union[dict, tuple]]:
+        """Project raw items.
+
+        Args:
+            items: Deserialized JSON objects.
+            model: Model of the items. Its fields are used for tuples if no
+                fields were selected.
+        """
+        project = self._project
+        if project is None:
+            if not self.tuples:
+                return items
+            if model is None:
+                return [tuple(item.values()) for item in items]
+            project = self._compile(list(model.__fields__))
+        return [project(item) for item in items]
@@ -0,0 +1,363 @@
+"""Local caching proxy shared by all processes on a host.
+
+The proxy serves the same routes as the upstream server, so clients use it by
+setting `server.url` to the proxy URL. It keeps one connection pool to the
+upstream server, caches successful GET responses, makes a single upstream
+request for identical GET requests that arrive at the same time and limits
+the rate of all upstream requests together.
+
+Responses are cached per authorization header, so clients with different
+tokens never see each other's responses. Writes are passed through and clear
+the whole cache, the proxy doesn't know which reads a write affects.
+
+Example:
+    $ pwc proxy --port 8765 --ttl 300 --rate-limit 10
+    $ pwc config set server.url http://127.0.0.1:8765
+"""
+
+__all__ = ["CachedResponse", "CachingProxy", "ProxyStats"]
+
+import json
+import hashlib
+import logging
+import threading
+from urllib import parse
+from dataclasses import asdict, dataclass
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Optional
+
+from sotagents.cache import TTLCache
+from sotagents.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    import httpx
+
+
+logger = logging.getLogger(__name__)
+
+#: Headers that apply to a single connection and are not forwarded.
+HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+    # Bodies are decoded by the upstream client.
+    "content-encoding",
+}
+
+#: Path of the proxy statistics.
+STATS_PATH = "/_proxy/stats"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Upstream response as it's sent to the clients."""
+
+    status: int
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+
+
+@dataclass
+class ProxyStats:
+    """Request counters of the proxy.
+
+    Attributes:
+        requests: Requests received from the clients.
+        hits: GET requests served from the cache.
+        coalesced: GET requests that waited for an identical request.
+        upstream: Requests sent to the upstream server.
+        errors: Requests that failed to reach the upstream server.
+    """
+
+    requests: int = 0
+    hits: int = 0
+    coalesced: int = 0
+    upstream: int = 0
+    errors: int = 0
+
+
+class CachingProxy:
+    """Forwards requests to the upstream server with a shared cache.
+
+    Example:
+        >>> proxy = CachingProxy("https://sotagents.com", ttl=300, rate_limit=10)
+        >>> proxy.serve("127.0.0.1", 8765)
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        ttl: float = 60,
+        max_size: int = 4096,
+        rate_limit: Optional[float] = None,
+        max_connections: int = 10,
+        timeout: float = 60,
+    ):
+        """Initialize.
+
+        Args:
+            upstream: URL of the upstream server.
+            ttl: Number of seconds GET responses are cached. Responses are not
+                cached if it's not positive, identical requests are still
+                coalesced.
+            max_size: Maximal number of cached responses.
+            rate_limit: Maximal number of upstream requests per second of all
+                clients together. Not limited if `None`.
+            max_connections: Maximal number of connections to the upstream
+                server.
+            timeout: Upstream request timeout in seconds.
+        """
+        self.upstream = upstream.rstrip("/")
+        self.ttl = ttl
+        self.cache = TTLCache(ttl=ttl, max_size=max_size)
+        self.rate_limiter = None if rate_limit is None else RateLimiter(rate_limit)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.stats = ProxyStats()
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple, Future] = {}
+        self._generation = 0
+        self._client: Optional["httpx.Client"] = None
+
+    @property
+    def client(self) -> "httpx.Client":
+        """Return the pooled upstream client, creating it on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+
+                    self._client = httpx.Client(
+                        base_url=self.upstream,
+                        timeout=self.timeout,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+        return self._client
+
+    def close(self):
+        """Close the upstream connections."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._count_locked(counter)
+
+    def _count_locked(self, counter: str):
+        """Increment a counter, the caller holds the lock."""
+        setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    @staticmethod
+    def cache_key(path: str, headers: dict[str, str]) -> tuple:
+        """Return the cache key of a GET request.
+
+        Query parameters are sorted so their order doesn't matter, and the
+        authorization header is hashed so tokens are not kept in memory.
+        """
+        url = parse.urlsplit(path)
+        query = tuple(sorted(parse.parse_qsl(url.query, keep_blank_values=True)))
+        authorization = headers.get("authorization", "")
+        if authorization != "":
+            authorization = hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+        return url.path, query, authorization
+
+    def _upstream(
+        self, method: str, path: str, headers: dict[str, str], body: bytes
+    ) -> CachedResponse:
+        """Send the request to the upstream server."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self._count("upstream")
+        try:
+            response = self.client.request(
+                method, path, headers=headers, content=body or None
+            )
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Upstream request %s %s failed: %r", method, path, e)
+            return CachedResponse(
+                status=502,
+                headers=(("Content-Type", "application/json"),),
+                body=json.dumps({"message": f"Upstream error. {e!r}"}).encode("utf-8"),
+            )
+        return CachedResponse(
+            status=response.status_code,
+            headers=tuple(
+                (key, value)
+                for key, value in response.headers.items()
+                if key.lower() not in HOP_BY_HOP
+            ),
+            body=response.content,
+        )
+
+    def get(self, path: str, headers: dict[str, str]) -> tuple[CachedResponse, str]:
+        """Return the response to a GET request.
+
+        Returns:
+            Response and how it was served: `hit`, `coalesced` or `miss`.
+        """
+        key = self.cache_key(path, headers)
+        response = self.cache.get(key)
+        if response is not None:
+            self._count("hits")
+            return response, "hit"
+
+        with self._lock:
+            # The leader of an identical request might have just finished.
+            response = self.cache.get(key)
+            if response is not None:
+                self._count_locked("hits")
+                return response, "hit"
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            generation = self._generation
+        if not leader:
+            self._count("coalesced")
+            return future.result(), "coalesced"
+
+        try:
+            response = self._upstream("GET", path, headers, b"")
+            # Responses of requests that were in flight during a write may
+            # already be stale.
+            if response.status == 200 and self.ttl > 0:
+                with self._lock:
+                    if generation == self._generation:
+                        self.cache.set(key, response)
+            future.set_result(response)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return response, "miss"
+
+    def forward(
+        self, method: str, path: str, headers: dict[str, str], body: bytes
+    ) -> CachedResponse:
+        """Pass a write request through and clear the cache if it succeeded."""
+        response = self._upstream(method, path, headers, body)
+        if response.status < 400 and parse.urlsplit(path).path.startswith("/api/"):
+            with self._lock:
+                self._generation += 1
+            self.cache.clear()
+        return response
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        """Return the request handler class of the HTTP server."""
+        return type("Handler", (_ProxyHandler,), {"proxy": self})
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """Serve the clients until interrupted."""
+        server = ThreadingHTTPServer((host, port), self.handler())
+        server.daemon_threads = True
+        logger.info("Proxying %s on http://%s:%d", self.upstream, host, port)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.close()
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    # Clients keep their connections to the proxy open.
+    protocol_version = "HTTP/1.1"
+    proxy: CachingProxy
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            key.lower(): value
+            for key, value in self.headers.items()
+            if key.lower() not in HOP_BY_HOP
+        }
+
+    def _body(self) -> Optional[bytes]:
+        """Read the request body, `None` if it can't be read."""
+        encoding = self.headers.get("Transfer-Encoding", "").strip().lower()
+        if encoding == "chunked":
+            return self._chunked()
+        if encoding != "":
+            return None
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length > 0 else b""
+
+    def _chunked(self) -> Optional[bytes]:
+        """Read a chunked body, the upstream request is sent with its length."""
+        chunks = []
+        while True:
+            line = self.rfile.readline(65537)
+            try:
+                # Chunk extensions after the size are ignored.
+                size = int(line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                return None
+            if size == 0:
+                break
+            chunk = self.rfile.read(size)
+            if len(chunk) < size or self.rfile.readline(65537).strip() != b"":
+                return None
+            chunks.append(chunk)
+        # Trailers are not forwarded.
+        while self.rfile.readline(65537).strip() != b"":
+            pass
+        return b"".join(chunks)
+
+    def _error(self, status: int, message: str):
+        body = json.dumps({"message": message}).encode("utf-8")
+        headers = (("Content-Type", "application/json"), ("Connection", "close"))
+        # The rest of the body can't be skipped, so the connection is closed.
+        self.close_connection = True
+        self._send(CachedResponse(status=status, headers=headers, body=body))
+
+    def _send(self, response: CachedResponse, cache: Optional[str] = None):
+        self.send_response(response.status)
+        for key, value in response.headers:
+            self.send_header(key, value)
+        if cache is not None:
+            self.send_header("X-Cache", cache)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    def do_GET(self):
+        self.proxy._count("requests")
+        if self.path == STATS_PATH:
+            body = json.dumps(asdict(self.proxy.stats)).encode("utf-8")
+            headers = (("Content-Type", "application/json"),)
+            self._send(CachedResponse(status=200, headers=headers, body=body))
+            return
+        response, cache = self.proxy.get(self.path, self._headers())
+        self._send(response, cache=cache)
+
+    # Answered from the GET response, `_send` leaves the body out.
+    do_HEAD = do_GET
+
+    def _forward(self):
+        self.proxy._count("requests")
+        body = self._body()
+        if body is None:
+            self._error(400, "Unsupported or malformed request body.")
+            return
+        response = self.proxy.forward(self.command, self.path, self._headers(), body)
+        self._send(response)
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = _forward
+
+    def log_message(self, format: str, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
@@ -0,0 +1,62 @@
+__all__ = ["RateLimiter"]
+
+import time
+import threading
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread safe token bucket rate limiter.
+
+    Allows `rate` requests per second on average and bursts of up to `burst`
+    requests.
+
+    Example:
+        >>> limiter = RateLimiter(rate=5)
+        >>> limiter.acquire()  # Blocks until a request is allowed.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """Initialize.
+
+        Args:
+            rate: Number of requests allowed per second.
+            burst: Maximal number of requests allowed at once. Defaults to one
+                second worth of requests.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}.")
+        self.rate = rate
+        self.burst = max(1, int(rate) if burst is None else burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Wait until a request is allowed.
+
+        Returns:
+            Number of seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve the token now so waiting threads are served in order.
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+        return wait
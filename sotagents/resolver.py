@@ -0,0 +1,366 @@
+"""Resolution of names to IDs for create and sync workflows.
+
+Requests like `TaskCreateRequest` and `EvaluationTableSyncRequest` reference
+other objects by ID, while the data being synced usually has names, arXiv IDs
+or repository names. `NameResolver` looks every distinct key up once, in
+parallel, and remembers the outcome in the cache directory, so following runs
+don't look it up again for a week. Keys that don't resolve are remembered for a
+shorter time, new objects may appear on the server.
+
+Example:
+    >>> resolver = NameResolver(client)
+    >>> request = resolver.resolve_evaluation_table(
+    ...     EvaluationTableSyncRequest(
+    ...         task="Image Classification",
+    ...         dataset="ImageNet",
+    ...         results=[ResultSyncRequest(paper="1512.03385", ...), ...],
+    ...     )
+    ... )
+    >>> request.task, request.results[0].paper
+    ('image-classification', 'deep-residual-learning-for-image')
+"""
+
+__all__ = ["NameResolver"]
+
+import io
+import os
+import re
+import json
+import time
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from sotagents.errors import HttpClientError
+from sotagents.models import EvaluationTableSyncRequest, TaskCreateRequest
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+#: arXiv identifiers, e.g. `1512.03385`, `1512.03385v2` or `cs/0112017`.
+ARXIV_ID = re.compile(r"^(\d{4}\.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?/\d{7})(v\d+)?$")
+
+
+class NameResolver:
+    """Resolves names, arXiv IDs and repository names to IDs.
+
+    Supported kinds of keys:
+
+    - `areas`, `tasks`, `datasets` and `methods`: names, matched exactly and
+      case insensitively if there's no case sensitive match,
+    - `papers`: arXiv IDs,
+    - `repositories`: `owner/name`, resolved to the repository URL.
+    """
+
+    #: List methods of the client by kind of names.
+    NAMED = {
+        "areas": "area_list",
+        "tasks": "task_list",
+        "datasets": "dataset_list",
+        "methods": "method_list",
+    }
+
+    #: All supported kinds of keys.
+    KINDS = (*NAMED, "papers", "repositories")
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        path: Union[str, Path, None] = None,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        negative_ttl: float = 3600,
+        concurrency: Optional[int] = None,
+    ):
+        """Initialize.
+
+        Args:
+            client: Client used for the lookups.
+            path: Path to the stored memo. Defaults to `resolver.json` in the
+                server cache directory of the client, see
+                `PapersWithCodeClient.server_cache_dir`. Nothing is stored if
+                it's an empty string.
+            ttl: Number of seconds resolved keys are remembered, a week by
+                default. Objects may be deleted or renamed on the server.
+                Forever if `None`.
+            negative_ttl: Number of seconds keys that didn't resolve are
+                remembered.
+            concurrency: Maximal number of concurrent lookups. Defaults to the
+                concurrency of the client.
+        """
+        self.client = client
+        if path == "":
+            self.path = None
+        else:
+            self.path = (
+                Path(path)
+                if path is not None
+                else client.server_cache_dir / "resolver.json"
+            )
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.concurrency = concurrency or client.concurrency
+        # Resolved ID (`None` if the key didn't resolve) and expiration time by
+        # kind and key.
+        self._memo: dict[str, dict[str, tuple[Optional[str], Optional[float]]]] = {
+            kind: {} for kind in self.KINDS
+        }
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def _check(kind: str):
+        if kind not in NameResolver.KINDS:
+            raise ValueError(f"Unknown kind: {kind}")
+
+    def load(self):
+        """Load the stored memo, dropping expired keys."""
+        if self.path is None:
+            return
+        try:
+            with io.open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning("Ignoring corrupted resolver memo %s: %s", self.path, e)
+            return
+        now = time.time()
+        with self._lock:
+            for kind, entries in data.items():
+                if kind in self._memo:
+                    self._memo[kind].update(
+                        (key, (id, expires))
+                        for key, (id, expires) in entries.items()
+                        if expires is None or expires > now
+                    )
+
+    def save(self):
+        """Store the memo, replacing the previous one atomically."""
+        if self.path is None:
+            return
+        with self._lock:
+            content = json.dumps(self._memo, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with io.open(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def forget(self, kind: Optional[str] = None):
+        """Drop remembered keys.
+
+        Args:
+            kind: Kind of the dropped keys. All keys are dropped if `None`.
+        """
+        with self._lock:
+            for k in self.KINDS if kind is None else (kind,):
+                self._check(k)
+                self._memo[k].clear()
+
+    def _remembered(self, kind: str, key: str) -> tuple[bool, Optional[str]]:
+        entry = self._memo[kind].get(key)
+        if entry is None:
+            return False, None
+        id, expires = entry
+        if expires is not None and expires <= time.time():
+            del self._memo[kind][key]
+            return False, None
+        return True, id
+
+    def _lookup(self, kind: str, key: str) -> Optional[str]:
+        """Look the key up on the server."""
+        client = self.client
+        if kind == "repositories":
+            owner, _, name = key.partition("/")
+            try:
+                return client.repository_get(owner, name).url
+            except HttpClientError as e:
+                if e.status_code == 404:
+                    return None
+                raise
+        if kind == "papers":
+            with client.raw(["id"], tuples=True):
+                results = client.paper_list(arxiv_id=key, items_per_page=1).results
+            return results[0][0] if len(results) > 0 else None
+
+        # The name filter matches parts of the names.
+        method = getattr(client, self.NAMED[kind])
+        candidates = list(
+            client.iterate_raw(method, fields=["id", "name"], name=key, tuples=True)
+        )
+        for matches in (
+            [id for id, name in candidates if name == key],
+            [id for id, name in candidates if name.casefold() == key.casefold()],
+        ):
+            if len(matches) == 1:
+                return matches[0]
+            if len(matches) > 1:
+                logger.warning("Ambiguous %s name %r: %s", kind, key, matches)
+                return None
+        return None
+
+    def _remember(self, kind: str, key: str, id: Optional[str]):
+        ttl = self.ttl if id is not None else self.negative_ttl
+        with self._lock:
+            self._memo[kind][key] = (id, None if ttl is None else time.time() + ttl)
+
+    def prefetch(self, kind: str, keys: Iterable[str]) -> int:
+        """Look up all distinct keys that are not remembered yet, in parallel.
+
+        Every key is remembered as soon as it's looked up. If lookups fail, the
+        keys looked up successfully are still stored before the first error is
+        raised, so they are not looked up again.
+
+        Args:
+            kind: Kind of the keys.
+            keys: Keys to look up, duplicates are looked up once.
+
+        Returns:
+            Number of keys looked up on the server.
+        """
+        self._check(kind)
+        with self._lock:
+            missing = [
+                key
+                for key in dict.fromkeys(keys)
+                if key is not None and not self._remembered(kind, key)[0]
+            ]
+        if len(missing) == 0:
+            return 0
+        errors = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(missing))
+            ) as executor:
+                futures = {
+                    executor.submit(self._lookup, kind, key): key for key in missing
+                }
+                for future in as_completed(futures):
+                    try:
+                        id = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                    else:
+                        self._remember(kind, futures[future], id)
+        finally:
+            self.save()
+        if len(errors) > 0:
+            raise errors[0]
+        return len(missing)
+
+    def resolve_many(self, kind: str, keys: Iterable[str]) -> dict[str, Optional[str]]:
+        """Resolve keys to IDs.
+
+        Args:
+            kind: Kind of the keys.
+            keys: Keys to resolve.
+
+        Returns:
+            ID of every key, `None` for keys that didn't resolve.
+        """
+        keys = list(dict.fromkeys(keys))
+        self.prefetch(kind, keys)
+        resolved = {}
+        for key in keys:
+            with self._lock:
+                remembered, id = self._remembered(kind, key)
+            if not remembered:
+                # Expired in the meantime.
+                id = self._lookup(kind, key)
+                self._remember(kind, key, id)
+            resolved[key] = id
+        return resolved
+
+    def resolve(self, kind: str, key: str) -> Optional[str]:
+        """Resolve a key to an ID.
+
+        Args:
+            kind: `areas`, `tasks`, `datasets`, `methods`, `papers` (arXiv ID)
+                or `repositories` (`owner/name`).
+            key: Key to resolve.
+
+        Returns:
+            ID or `None` if the key didn't resolve.
+        """
+        return self.resolve_many(kind, [key])[key]
+
+    def resolve_tasks(
+        self, requests: list[TaskCreateRequest]
+    ) -> list[TaskCreateRequest]:
+        """Replace area names in task create requests with the area IDs.
+
+        Areas that don't resolve are left as they are, they might be IDs
+        already.
+
+        Returns:
+            Copies of the requests.
+        """
+        areas = self.resolve_many(
+            "areas", [r.area for r in requests if r.area is not None]
+        )
+        return [r.copy(update={"area": areas.get(r.area) or r.area}) for r in requests]
+
+    def resolve_evaluation_tables(
+        self, requests: list[EvaluationTableSyncRequest]
+    ) -> list[EvaluationTableSyncRequest]:
+        """Replace names in evaluation table sync requests with IDs.
+
+        Task and dataset names are resolved, and so are the papers of results
+        given as arXiv IDs. Values that don't resolve are left as they are,
+        they might be IDs already.
+
+        All distinct keys of all requests are looked up together.
+
+        Returns:
+            Copies of the requests.
+        """
+        papers = {
+            result.paper
+            for request in requests
+            for result in request.results
+            if result.paper is not None and ARXIV_ID.match(result.paper)
+        }
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            tasks, datasets, papers = executor.map(
+                self.resolve_many,
+                ("tasks", "datasets", "papers"),
+                (
+                    [r.task for r in requests],
+                    [r.dataset for r in requests],
+                    sorted(papers),
+                ),
+            )
+        return [
+            request.copy(
+                update={
+                    "task": tasks.get(request.task) or request.task,
+                    "dataset": datasets.get(request.dataset) or request.dataset,
+                    "results": [
+                        result.copy(
+                            update={"paper": papers.get(result.paper) or result.paper}
+                        )
+                        for result in request.results
+                    ],
+                }
+            )
+            for request in requests
+        ]
+
+    def resolve_evaluation_table(
+        self, request: EvaluationTableSyncRequest
+    ) -> EvaluationTableSyncRequest:
+        """Replace names in an evaluation table sync request with IDs.
+
+        See `resolve_evaluation_tables`.
+        """
+        return self.resolve_evaluation_tables([request])[0]
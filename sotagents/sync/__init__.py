@@ -0,0 +1,23 @@
+__all__ = [
+    "content_hash",
+    "RowState",
+    "SyncState",
+    "SyncStateStore",
+    "SyncMode",
+    "SyncDelta",
+    "SyncResult",
+    "compute_delta",
+    "DeltaSynchronizer",
+    "ProgressCallback",
+    "iter_sync_body",
+]
+
+from sotagents.sync.state import content_hash, RowState, SyncState, SyncStateStore
+from sotagents.sync.delta import (
+    SyncMode,
+    SyncDelta,
+    SyncResult,
+    compute_delta,
+    DeltaSynchronizer,
+)
+from sotagents.sync.stream import ProgressCallback, iter_sync_body
@@ -0,0 +1,259 @@
+import enum
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from sotagents.sync.state import RowState, SyncState, SyncStateStore, content_hash
+from sotagents.models import (
+    ResultUpdateRequest,
+    ResultSyncRequest,
+    ResultSyncResponse,
+    MetricSyncResponse,
+    EvaluationTableSyncRequest,
+    EvaluationTableSyncResponse,
+)
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class SyncMode(str, enum.Enum):
+    skipped = "skipped"
+    partial = "partial"
+    full = "full"
+
+
+@dataclass
+class SyncDelta:
+    """Difference between an evaluation table and its last synchronized state.
+
+    Attributes:
+        added: Rows that were not synchronized before.
+        changed: Rows whose content changed since the last synchronization.
+        removed: External IDs of rows that are no longer present.
+        unchanged: Number of rows that didn't change.
+        table_changed: Table fields or metrics changed, or there is no state.
+    """
+
+    added: list[ResultSyncRequest] = field(default_factory=list)
+    changed: list[ResultSyncRequest] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    table_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.table_changed)
+
+
+@dataclass
+class SyncResult:
+    """Result of a delta synchronization.
+
+    Attributes:
+        mode: How the table was synchronized.
+        delta: Computed difference.
+        response: State of the evaluation table after the synchronization.
+    """
+
+    mode: SyncMode
+    delta: SyncDelta
+    response: EvaluationTableSyncResponse
+
+
+def table_hash(evaluation: EvaluationTableSyncRequest) -> str:
+    """Return a content hash of the table fields and metrics."""
+    return content_hash(evaluation.dict(exclude={"results"}))
+
+
+def compute_delta(
+    evaluation: EvaluationTableSyncRequest, state: Optional[SyncState]
+) -> SyncDelta:
+    """Compare an evaluation table with its last synchronized state.
+
+    Args:
+        evaluation: Evaluation table sync request.
+        state: Last synchronized state or `None` if the table was never
+            synchronized.
+
+    Returns:
+        SyncDelta object.
+    """
+    previous = {} if state is None else state.results
+    delta = SyncDelta(
+        table_changed=state is None or state.table_hash != table_hash(evaluation)
+    )
+    seen = set()
+    for result in evaluation.results:
+        seen.add(result.external_id)
+        row = previous.get(result.external_id)
+        if row is None:
+            delta.added.append(result)
+        elif row.hash != content_hash(result):
+            delta.changed.append(result)
+        else:
+            delta.unchanged += 1
+    delta.removed = [external_id for external_id in previous if external_id not in seen]
+    return delta
+
+
+class DeltaSynchronizer:
+    """Synchronizes evaluation tables by sending only what changed.
+
+    Content hashes of the last synchronized rows are kept in a `SyncStateStore`
+    keyed by the server URL and `ResultSyncRequest.external_id`. On every
+    synchronization the difference is computed locally:
+
+    - If nothing changed no request is made.
+    - If only existing rows changed or were removed, they are updated or deleted
+      through the per-result endpoints.
+    - Otherwise (new rows, changed table fields or metrics, rows without an
+      external ID, rows without a known server ID, or no previous state) the
+      full table is synchronized with
+      `evaluation_synchronize`. New rows always go through the full sync because
+      the per-result endpoints cannot set the external ID.
+    """
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        store: Optional[SyncStateStore] = None,
+    ):
+        """Initialize.
+
+        Args:
+            client: Client used for synchronization.
+            store: Synchronization state store. Defaults to the store in the
+                configuration directory.
+        """
+        self.client = client
+        self.store = store or SyncStateStore()
+
+    @staticmethod
+    def key(evaluation: EvaluationTableSyncRequest) -> str:
+        """Return the key identifying the evaluation table in the store."""
+        if evaluation.external_id:
+            return f"external:{evaluation.external_id}"
+        return f"table:{evaluation.task}/{evaluation.dataset}"
+
+    def state_key(self, evaluation: EvaluationTableSyncRequest) -> str:
+        """Return the key of the table state, scoped to the server of the client.
+
+        IDs in the state are only valid on the server they came from.
+        """
+        return f"{self.client.http.url} {self.key(evaluation)}"
+
+    def diff(self, evaluation: EvaluationTableSyncRequest) -> SyncDelta:
+        """Compute the difference against the last synchronized state."""
+        return compute_delta(evaluation, self.store.get(self.state_key(evaluation)))
+
+    @staticmethod
+    def _trackable(evaluation: EvaluationTableSyncRequest) -> bool:
+        external_ids = [result.external_id for result in evaluation.results]
+        return all(external_ids) and len(set(external_ids)) == len(external_ids)
+
+    def synchronize(
+        self, evaluation: EvaluationTableSyncRequest, force: bool = False
+    ) -> SyncResult:
+        """Synchronize the evaluation table.
+
+        Args:
+            evaluation: Evaluation table sync request.
+            force: Always synchronize the full table.
+
+        Returns:
+            SyncResult object.
+        """
+        key = self.state_key(evaluation)
+        state = self.store.get(key)
+        delta = compute_delta(evaluation, state)
+
+        if (
+            force
+            or state is None
+            or state.table_id is None
+            or delta.table_changed
+            or delta.added
+            or not self._trackable(evaluation)
+            # Rows of the last full sync missing from its response.
+            or any(row.id is None for row in state.results.values())
+        ):
+            response = self.client.evaluation_synchronize(evaluation)
+            self.store.set(self._state_from_response(key, evaluation, response))
+            return SyncResult(mode=SyncMode.full, delta=delta, response=response)
+
+        if delta.is_empty:
+            return SyncResult(
+                mode=SyncMode.skipped,
+                delta=delta,
+                response=self._response_from_state(evaluation, state),
+            )
+
+        try:
+            for result in delta.changed:
+                row = state.results[result.external_id]
+                self.client.evaluation_result_update(
+                    state.table_id,
+                    row.id,
+                    ResultUpdateRequest(
+                        **result.dict(include=set(ResultUpdateRequest.__fields__))
+                    ),
+                )
+                row.hash = content_hash(result)
+            for external_id in delta.removed:
+                self.client.evaluation_result_delete(
+                    state.table_id, state.results[external_id].id
+                )
+                del state.results[external_id]
+        finally:
+            # Record the rows that were synchronized, even if a later one failed.
+            self.store.set(state)
+
+        return SyncResult(
+            mode=SyncMode.partial,
+            delta=delta,
+            response=self._response_from_state(evaluation, state),
+        )
+
+    @staticmethod
+    def _state_from_response(
+        key: str,
+        evaluation: EvaluationTableSyncRequest,
+        response: EvaluationTableSyncResponse,
+    ) -> SyncState:
+        ids = {result.external_id: result.id for result in response.results}
+        return SyncState(
+            key=key,
+            table_id=response.id,
+            table_hash=table_hash(evaluation),
+            results={
+                result.external_id: RowState(
+                    hash=content_hash(result), id=ids.get(result.external_id)
+                )
+                for result in evaluation.results
+                if result.external_id
+            },
+        )
+
+    @staticmethod
+    def _response_from_state(
+        evaluation: EvaluationTableSyncRequest, state: SyncState
+    ) -> EvaluationTableSyncResponse:
+        return EvaluationTableSyncResponse(
+            id=state.table_id,
+            task=evaluation.task,
+            dataset=evaluation.dataset,
+            description=evaluation.description,
+            mirror_url=evaluation.mirror_url,
+            external_id=evaluation.external_id,
+            metrics=[MetricSyncResponse(**m.dict()) for m in evaluation.metrics],
+            results=[
+                ResultSyncResponse(
+                    id=state.results[result.external_id].id, **result.dict()
+                )
+                for result in evaluation.results
+            ],
+        )
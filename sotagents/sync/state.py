@@ -0,0 +1,106 @@
+import io
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+from dataclasses import asdict, dataclass, field
+
+from sotagents import consts
+from sotagents.models import Model
+
+
+def content_hash(model: Union[Model, dict]) -> str:
+    """Return a stable hash of the model content."""
+    data = model.dict() if isinstance(model, Model) else model
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RowState:
+    """Last synchronized state of a single result row.
+
+    Attributes:
+        hash: Content hash of the `ResultSyncRequest`.
+        id: ID of the result on the server.
+    """
+
+    hash: str
+    id: Optional[str] = None
+
+
+@dataclass
+class SyncState:
+    """Last synchronized state of an evaluation table.
+
+    Attributes:
+        key: Key identifying the evaluation table.
+        table_id: ID of the evaluation table on the server.
+        table_hash: Content hash of the table fields and metrics.
+        results: Row states keyed by `ResultSyncRequest.external_id`.
+    """
+
+    key: str
+    table_id: Optional[str] = None
+    table_hash: Optional[str] = None
+    results: dict[str, RowState] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SyncState":
+        return cls(
+            key=data["key"],
+            table_id=data.get("table_id"),
+            table_hash=data.get("table_hash"),
+            results={
+                external_id: RowState(**row)
+                for external_id, row in data.get("results", {}).items()
+            },
+        )
+
+
+class SyncStateStore:
+    """Stores synchronization state as JSON files in a directory."""
+
+    def __init__(self, path: Union[str, Path] = consts.DEFAULT_SYNC_STATE_PATH):
+        """Initialize.
+
+        Args:
+            path: Directory in which the state files are stored.
+        """
+        self.path = Path(path).expanduser().resolve()
+
+    def _file(self, key: str) -> Path:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.path / f"{name}.json"
+
+    def get(self, key: str) -> Optional[SyncState]:
+        """Return the stored state or `None` if there is none."""
+        try:
+            with io.open(self._file(key), "r", encoding="utf-8") as f:
+                return SyncState.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def set(self, state: SyncState):
+        """Store the state, replacing the previous one atomically."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with io.open(fd, "w", encoding="utf-8") as f:
+                json.dump(state.to_dict(), f)
+            os.replace(tmp, self._file(state.key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def delete(self, key: str):
+        """Remove the stored state."""
+        try:
+            os.unlink(self._file(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,59 @@
+import json
+from typing import Callable, Iterable, Iterator, Optional
+
+from sotagents.models import ResultSyncRequest, EvaluationTableSyncRequest
+
+
+#: Progress callback, called with the number of rows sent so far and the total
+#: number of rows if it is known.
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def iter_sync_body(
+    evaluation: EvaluationTableSyncRequest,
+    results: Iterable[ResultSyncRequest],
+    chunk_size: int = 64 * 1024,
+    total: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[bytes]:
+    """Encode an evaluation table sync request as a stream of JSON chunks.
+
+    Only one chunk of rows is held in memory at a time, so the rows can be
+    produced lazily by a generator.
+
+    Args:
+        evaluation: Evaluation table with the table fields and metrics. Its
+            `results` are sent before the rows from `results`.
+        results: Iterable of result rows.
+        chunk_size: Approximate size of every chunk in bytes.
+        total: Total number of rows, passed to the progress callback.
+        progress: Progress callback.
+
+    Yields:
+        Encoded chunks of the request body.
+    """
+    header = evaluation.dict(exclude={"results"})
+    # Open the JSON object and the results array, the header is never empty
+    # because `task` and `dataset` are required.
+    buffer = [json.dumps(header, default=str)[:-1], ',"results":[']
+    size = sum(len(part) for part in buffer)
+    sent = 0
+
+    def rows() -> Iterator[ResultSyncRequest]:
+        yield from evaluation.results
+        yield from results
+
+    for i, row in enumerate(rows()):
+        encoded = json.dumps(row.dict(), default=str)
+        buffer.append(encoded if i == 0 else f",{encoded}")
+        size += len(encoded) + 1
+        sent += 1
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+            if progress is not None:
+                progress(sent, total)
+    buffer.append("]}")
+    yield "".join(buffer).encode("utf-8")
+    if progress is not None:
+        progress(sent, total)
@@ -1,15 +1,17 @@
 import enum
+from operator import attrgetter
 from dataclasses import dataclass
-from typing import Any, Callable, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Union
 
-from rich.table import Table
-from rich.console import JustifyMethod
+if TYPE_CHECKING:
+    from rich.table import Table
+    from rich.console import Console, JustifyMethod
 
 
 class Align(enum.Enum):
-    left: JustifyMethod = "left"
-    center: JustifyMethod = "center"
-    right: JustifyMethod = "right"
+    left: "JustifyMethod" = "left"
+    center: "JustifyMethod" = "center"
+    right: "JustifyMethod" = "right"
 
 
 @dataclass
@@ -20,28 +22,170 @@ class Column:
     path: Union[str, Callable[[Any], str]]
     align: Align = Align.left
 
+    def compile(self) -> Callable[[Any], str]:
+        """Return a function that formats the column value of an object."""
+        if callable(self.path):
+            path = self.path
+            return lambda obj: f"{path(obj)}"
 
-def _get_path(obj, path) -> str:
-    if callable(path):
-        obj = path(obj)
-    else:
-        path = path.split(".")
-        for item in path:
-            obj = getattr(obj, item)
-        if isinstance(obj, bool):
-            obj = ":white_check_mark:" if obj else ":cross_mark:"
-    return f"{obj}"
+        get = attrgetter(self.path)
+
+        def accessor(obj) -> str:
+            value = get(obj)
+            if isinstance(value, bool):
+                return ":white_check_mark:" if value else ":cross_mark:"
+            return f"{value}"
+
+        return accessor
+
+
+def compile_columns(columns: list[Column]) -> Callable[[Any], list[str]]:
+    """Return a function that formats all column values of an object."""
+    accessors = [column.compile() for column in columns]
+    return lambda obj: [accessor(obj) for accessor in accessors]
 
 
 class RichTableMixin:
     HEADERS: list[Column] = []
 
     @classmethod
-    def get_rich_table(cls, header_style="bold magenta") -> Table:
+    def get_rich_table(cls, header_style="bold magenta") -> "Table":
+        from rich.table import Table
+
         table = Table(show_header=True, header_style=header_style)
         for column in cls.HEADERS:
             table.add_column(header=column.title, justify=column.align.value)
         return table
 
+    @classmethod
+    def _row_accessor(cls) -> Callable[[Any], list[str]]:
+        # Compiled once per class, subclasses with other headers get their own.
+        accessor = cls.__dict__.get("_compiled_row")
+        if accessor is None:
+            accessor = compile_columns(cls.HEADERS)
+            setattr(cls, "_compiled_row", accessor)
+        return accessor
+
     def to_rich_row(self) -> list:
-        return [_get_path(self, column.path) for column in self.HEADERS]
+        return self._row_accessor()(self)
+
+    @classmethod
+    def print_rich_table(
+        cls,
+        items: Iterable["RichTableMixin"],
+        console: Optional["Console"] = None,
+        chunk_size: int = 100,
+    ) -> int:
+        """Print items as a table while they are produced.
+
+        Returns:
+            Number of printed rows.
+        """
+        with StreamingTable(cls.HEADERS, console=console, chunk_size=chunk_size) as t:
+            for item in items:
+                t.add(item)
+        return t.rows
+
+
+class StreamingTable:
+    """Prints a rich table in chunks of rows.
+
+    Rows are printed as soon as a chunk is full, so large listings start showing
+    right away and only one chunk is kept in memory. Column widths are fixed by
+    the first chunk so all chunks line up.
+
+    Example:
+        >>> columns = [
+        ...     Column(title="ID", path="id"),
+        ...     Column(title="Title", path="title"),
+        ...     Column(title="Published", path="published"),
+        ... ]
+        >>> with StreamingTable(columns) as table:
+        ...     for paper in client.iterate(client.paper_list):
+        ...         table.add(paper)
+    """
+
+    def __init__(
+        self,
+        columns: list[Column],
+        console: Optional["Console"] = None,
+        chunk_size: int = 100,
+        header_style: str = "bold magenta",
+    ):
+        """Initialize.
+
+        Args:
+            columns: Table columns.
+            console: Console to print to. Defaults to the global rich console.
+            chunk_size: Number of rows printed at once.
+            header_style: Style of the header row.
+        """
+        import rich
+
+        self.columns = columns
+        self.console = rich.get_console() if console is None else console
+        self.chunk_size = chunk_size
+        self.header_style = header_style
+        self.rows = 0
+        self._format = compile_columns(columns)
+        self._chunk: list[list[str]] = []
+        self._widths: Optional[list[int]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+
+    def add(self, item: Any):
+        """Add an object, formatted with the column accessors."""
+        self.add_row(self._format(item))
+
+    def add_row(self, cells: list[str]):
+        """Add already formatted cells."""
+        self._chunk.append(cells)
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def _compute_widths(self) -> list[int]:
+        measure = self.console.render_str
+        widths = [len(column.title) for column in self.columns]
+        for row in self._chunk:
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], measure(cell).cell_len)
+        # Leave room for the padding between columns.
+        available = max(len(widths), self.console.width - 3 * len(widths))
+        while sum(widths) > available and max(widths) > 8:
+            widest = widths.index(max(widths))
+            widths[widest] = max(8, widths[widest] - (sum(widths) - available))
+        return widths
+
+    def flush(self):
+        """Print the buffered rows."""
+        if len(self._chunk) == 0 and self._widths is not None:
+            return
+        from rich import box
+        from rich.table import Table
+
+        first = self._widths is None
+        if first:
+            self._widths = self._compute_widths()
+        table = Table(
+            show_header=first,
+            header_style=self.header_style,
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        for column, width in zip(self.columns, self._widths):
+            table.add_column(
+                header=column.title,
+                justify=column.align.value,
+                width=width,
+                overflow="fold",
+            )
+        for row in self._chunk:
+            table.add_row(*row)
+        self.console.print(table)
+        self.rows += len(self._chunk)
+        self._chunk = []
@@ -0,0 +1,123 @@
+import math
+
+import numpy as np
+import pytest
+
+from sotagents.analysis import (
+    ResultsFrame,
+    parse_metric_value,
+    parse_metric_values,
+    rank,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("92.3", 92.3),
+        ("92.3%", 92.3),
+        (" 92.3 % ", 92.3),
+        ("1.2M", 1.2e6),
+        ("3.5k", 3.5e3),
+        ("7B", 7e9),
+        ("1,234.5", 1234.5),
+        ("-0.5", -0.5),
+        (".5", 0.5),
+        ("1e-3", 1e-3),
+        ("92.3 ± 0.1", 92.3),
+        ("12 Mpixels", 12.0),
+        (42, 42.0),
+        (0.25, 0.25),
+        (None, None),
+        (True, None),
+        ("", None),
+        ("-", None),
+        ("n/a", None),
+    ],
+)
+def test_parse_metric_value(value, expected):
+    parsed = parse_metric_value(value)
+    if expected is None:
+        assert parsed is None
+    else:
+        assert parsed == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["1.5", "2", None], [1.5, 2.0, math.nan]),
+        ([1, 2.5, None], [1.0, 2.5, math.nan]),
+        (["92.3%", "1.2M", "n/a", None], [92.3, 1.2e6, math.nan, math.nan]),
+        ([], []),
+    ],
+)
+def test_parse_metric_values(values, expected):
+    parsed = parse_metric_values(values)
+    assert parsed.dtype == np.float64
+    np.testing.assert_allclose(parsed, expected)
+
+
+@pytest.mark.parametrize(
+    "values, is_loss, expected",
+    [
+        ([1.0, 3.0, 2.0], False, [3, 1, 2]),
+        ([1.0, 3.0, 2.0], True, [1, 3, 2]),
+        ([2.0, 3.0, 3.0, 1.0], False, [3, 1, 1, 4]),
+        ([2.0, 1.0, 1.0, 3.0], True, [3, 1, 1, 4]),
+        ([math.nan, 2.0, 1.0], False, [math.nan, 1, 2]),
+        ([math.nan, math.nan], True, [math.nan, math.nan]),
+    ],
+)
+def test_rank(values, is_loss, expected):
+    np.testing.assert_array_equal(rank(np.array(values), is_loss=is_loss), expected)
+
+
+def frame(values, is_loss=False):
+    return ResultsFrame(
+        ids=np.array([f"r{i}" for i in range(len(values))], dtype=object),
+        papers=np.array([None] * len(values), dtype=object),
+        values={"metric": np.array(values, dtype=np.float64)},
+        is_loss={"metric": is_loss},
+    )
+
+
+@pytest.mark.parametrize(
+    "values, is_loss, k, expected",
+    [
+        ([1.0, 3.0, 2.0], False, 2, [1, 2]),
+        ([1.0, 3.0, 2.0], True, 2, [0, 2]),
+        ([1.0, 3.0, 2.0], False, 10, [1, 2, 0]),
+        ([1.0, math.nan, 2.0], False, 3, [2, 0]),
+        ([math.nan, math.nan], False, 1, []),
+        ([1.0, 2.0], False, 0, []),
+        # Ties are returned in row order, also at the cut.
+        ([2.0, 1.0, 2.0, 2.0, 3.0], False, 3, [4, 0, 2]),
+        ([2.0, 1.0, 1.0, 1.0, 3.0], True, 2, [1, 2]),
+    ],
+)
+def test_top_k(values, is_loss, k, expected):
+    assert frame(values, is_loss).top_k("metric", k).tolist() == expected
+
+
+@pytest.mark.parametrize("is_loss, best", [(False, 3.0), (True, 1.0)])
+def test_stats(is_loss, best):
+    stats = frame([1.0, math.nan, 3.0, 2.0], is_loss).stats("metric")
+    assert stats.count == 3
+    assert stats.mean == pytest.approx(2.0)
+    assert stats.min == 1.0
+    assert stats.median == 2.0
+    assert stats.max == 3.0
+    assert stats.best == best
+
+
+def test_stats_without_values():
+    stats = frame([math.nan]).stats("metric")
+    assert stats.count == 0
+    assert math.isnan(stats.best)
+
+
+def test_frame_ranks_follow_the_loss_direction():
+    results = frame([0.1, 0.3, 0.2], is_loss=True)
+    np.testing.assert_array_equal(results.rank("metric"), [1, 3, 2])
+    assert results.take([2, 0]).ids.tolist() == ["r2", "r0"]
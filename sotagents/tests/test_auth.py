@@ -0,0 +1,69 @@
+import json
+import time
+import base64
+
+import pytest
+
+from sotagents.auth import TokenManager, jwt_expiry
+from sotagents.errors import HttpClientError
+
+
+def jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode()
+    return f"header.{payload.rstrip('=')}.signature"
+
+
+class FakeHttp:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+
+    def request(self, method, url, data=None, authenticate=True):
+        self.requests.append((method, url, data))
+        if self.fail:
+            raise HttpClientError("Server not reachable.")
+        return {"access": jwt(time.time() + 3600), "refresh": "new-refresh"}
+
+
+def test_jwt_expiry():
+    assert jwt_expiry(jwt(123)) == 123
+    assert jwt_expiry("not a jwt") is None
+
+
+def test_refresh_sends_plain_json_body():
+    http = FakeHttp()
+    saved = []
+    manager = TokenManager(
+        http,
+        access=jwt(time.time() - 1),
+        refresh="refresh",
+        refresh_url="/token/refresh/",
+        on_refresh=lambda *tokens: saved.append(tokens),
+    )
+    access = manager.token()
+    assert jwt_expiry(access) > time.time()
+    ((method, url, data),) = http.requests
+    assert (method, url) == ("post", "/token/refresh/")
+    assert isinstance(data, bytes)
+    assert json.loads(data) == {"refresh": "refresh"}
+    for _ in range(100):
+        if saved:
+            break
+        time.sleep(0.01)
+    assert saved == [(access, "new-refresh")]
+
+
+def test_failed_refresh_is_not_retried_during_cooldown():
+    http = FakeHttp(fail=True)
+    expired = jwt(time.time() - 1)
+    manager = TokenManager(http, access=expired, refresh="refresh", cooldown=60)
+    for _ in range(5):
+        assert manager.token() == expired
+    with pytest.raises(HttpClientError):
+        manager.refresh()
+    assert len(http.requests) == 1
+
+    manager._failed_until = 0
+    http.fail = False
+    assert manager.refresh() != expired
+    assert len(http.requests) == 2
@@ -0,0 +1,131 @@
+import time
+import threading
+import contextlib
+
+import httpx
+import pytest
+
+from sotagents.bulk import BulkWriter, IDEMPOTENCY_HEADER
+from sotagents.errors import HttpClientError, HttpClientTimeout
+from sotagents.models import TaskCreateRequest
+
+
+class FakeHttp:
+    def __init__(self):
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def extra_headers(self, headers):
+        self._local.headers = headers
+        try:
+            yield
+        finally:
+            self._local.headers = {}
+
+    @property
+    def key(self):
+        return self._local.headers[IDEMPOTENCY_HEADER]
+
+
+class FakeClient:
+    concurrency = 2
+
+    def __init__(self, failures=None, gate=None):
+        self.http = FakeHttp()
+        self.calls = []
+        # Number of transient failures left by task name.
+        self.failures = dict(failures or {})
+        self.gate = gate
+        self._lock = threading.Lock()
+
+    def task_add(self, request):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        with self._lock:
+            self.calls.append((request.name, self.http.key))
+            if request.name == "bad":
+                raise HttpClientError("Bad request", response=httpx.Response(400))
+            if self.failures.get(request.name, 0) > 0:
+                self.failures[request.name] -= 1
+                raise HttpClientTimeout()
+        return request
+
+
+def test_report_in_input_order():
+    client = FakeClient()
+    names = [f"task-{i}" for i in range(10)]
+    report = BulkWriter(client).tasks(TaskCreateRequest(name=name) for name in names)
+    assert report.ok
+    assert len(report) == 10
+    assert [item.index for item in report.items] == list(range(10))
+    assert [item.response.name for item in report.items] == names
+
+
+def test_identical_requests_get_different_keys():
+    client = FakeClient()
+    report = BulkWriter(client).tasks([TaskCreateRequest(name="same")] * 2)
+    assert report.ok
+    keys = [key for _, key in client.calls]
+    assert len(set(keys)) == 2
+    assert sorted(keys) == sorted(item.key for item in report.items)
+
+
+def test_retries_reuse_the_key():
+    client = FakeClient(failures={"flaky": 2})
+    report = BulkWriter(client, retries=3, backoff=0).tasks(
+        [TaskCreateRequest(name="flaky")]
+    )
+    assert report.ok
+    (item,) = report.items
+    assert item.attempts == 3
+    assert [key for _, key in client.calls] == [item.key] * 3
+
+
+def test_failures_are_reported():
+    client = FakeClient(failures={"flaky": 5})
+    report = BulkWriter(client, retries=2, backoff=0).tasks(
+        TaskCreateRequest(name=name) for name in ["ok", "bad", "flaky"]
+    )
+    assert not report.ok
+    assert [item.request.name for item in report.succeeded] == ["ok"]
+    bad, flaky = report.failed
+    assert bad.attempts == 1
+    assert isinstance(bad.error, HttpClientError)
+    assert flaky.attempts == 3
+    assert isinstance(flaky.error, HttpClientTimeout)
+
+
+def test_in_flight_requests_are_bounded():
+    gate = threading.Event()
+    client = FakeClient(gate=gate)
+    consumed = []
+
+    def requests():
+        for i in range(20):
+            consumed.append(i)
+            yield TaskCreateRequest(name=f"task-{i}")
+
+    writer = BulkWriter(client, concurrency=2)
+    reports = []
+    thread = threading.Thread(target=lambda: reports.append(writer.tasks(requests())))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(consumed) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert len(consumed) == 2 * writer.concurrency
+    finally:
+        gate.set()
+        thread.join(timeout=5)
+    assert len(reports[0]) == 20
+    assert reports[0].ok
+
+
+@pytest.mark.parametrize("retries", [0, 1])
+def test_non_transient_errors_are_not_retried(retries):
+    client = FakeClient()
+    report = BulkWriter(client, retries=retries, backoff=0).tasks(
+        [TaskCreateRequest(name="bad")]
+    )
+    assert report.items[0].attempts == 1
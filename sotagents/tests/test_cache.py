@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sotagents.cache import TTLCache
+
+
+def test_get_or_set_caches():
+    cache = TTLCache()
+    assert cache.get_or_set("key", lambda: 1) == 1
+    assert cache.get_or_set("key", lambda: 2) == 1
+
+
+def test_concurrent_get_or_set_calls_factory_once():
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def factory():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(cache.get_or_set, "key", factory)
+        started.wait(timeout=5)
+        followers = [
+            executor.submit(cache.get_or_set, "key", factory) for _ in range(7)
+        ]
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_get_or_set_error_is_shared_and_not_cached():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(timeout=5)
+        raise ValueError("Failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(cache.get_or_set, "key", failing)
+        started.wait(timeout=5)
+        follower = executor.submit(cache.get_or_set, "key", failing)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert "key" not in cache
+    assert cache.get_or_set("key", lambda: 1) == 1
+
+
+def test_value_computed_during_a_delete_is_not_cached():
+    cache = TTLCache()
+
+    def factory():
+        cache.delete("key")
+        return "stale"
+
+    assert cache.get_or_set("key", factory) == "stale"
+    assert "key" not in cache
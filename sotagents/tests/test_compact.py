@@ -0,0 +1,41 @@
+import pytest
+
+from sotagents.compact import EvaluationResultsFrame, InternPool, _Column
+
+
+def result(id, metrics):
+    return {
+        "id": id,
+        "best_rank": None,
+        "metrics": metrics,
+        "methodology": "ResNet",
+        "uses_additional_data": False,
+        "paper": "paper",
+        "best_metric": None,
+        "evaluated_on": "2020-01-01",
+        "external_source_url": None,
+    }
+
+
+def test_metrics_with_unhashable_values():
+    metrics = [
+        {"acc": "90%", "err": 1.5},
+        {"acc": "90%", "per_class": [1, 2], "extra": {"a": 1}},
+        {},
+    ]
+    frame = EvaluationResultsFrame([result(str(i), m) for i, m in enumerate(metrics)])
+    assert frame.column("metrics") == metrics
+    assert frame[1].metrics["per_class"] == [1, 2]
+
+
+def test_string_metric_values_are_interned():
+    pool = InternPool()
+    EvaluationResultsFrame([result("a", {"acc": "90%"})], pool=pool)
+    size = len(pool)
+    EvaluationResultsFrame([result("b", {"acc": "90%"})], pool=pool)
+    assert len(pool) == size
+
+
+def test_columns_are_abstract():
+    with pytest.raises(TypeError):
+        _Column()
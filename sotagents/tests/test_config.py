@@ -0,0 +1,52 @@
+from sotagents import consts
+from sotagents.config import Config
+
+
+def write_config(home, text):
+    path = home / ".sotagents" / "sotagents.ini"
+    path.parent.mkdir(parents=True)
+    path.write_text(text)
+
+
+def test_profiles_inherit_settings_but_not_server_or_tokens(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    write_config(
+        tmp_path,
+        "[server]\nurl = https://prod.example\n"
+        "[auth]\ntoken_access = access\ntoken_refresh = refresh\n"
+        "[performance]\ntimeout = 30\n"
+        "[staging:server]\nurl = https://staging.example\n",
+    )
+    default = Config(profile="default")
+    assert default.server_url == "https://prod.example"
+    assert default.token_access == "access"
+
+    staging = Config(profile="staging")
+    assert staging.server_url == "https://staging.example"
+    assert staging.token_access is None
+    assert staging.token_refresh is None
+    assert staging.timeout == 30
+
+    other = Config(profile="other")
+    assert other.server_url == consts.PAPERSWITHCODE_URL
+    assert other.token_access is None
+
+
+def test_concurrent_saves_keep_all_values(tmp_path, monkeypatch):
+    import threading
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    configs = [Config(profile=f"p{i}") for i in range(8)]
+
+    def save(config):
+        config.token_access = f"{config.profile}-access"
+        config.save()
+
+    threads = [threading.Thread(target=save, args=(c,)) for c in configs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i in range(8):
+        assert Config(profile=f"p{i}").token_access == f"p{i}-access"
+    assert list((tmp_path / ".sotagents").glob("*.tmp")) == []
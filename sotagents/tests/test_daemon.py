@@ -0,0 +1,67 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from sotagents import daemon
+from sotagents.commands import app
+from sotagents.config import get_config, use_profile
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available."
+)
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("SOTAGENTS_PROFILE", raising=False)
+    use_profile("default")
+    server = daemon.DaemonServer("default", idle_timeout=60)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    use_profile("default")
+
+
+@pytest.fixture
+def command():
+    @app.command(name="test-exit")
+    def test_exit(code: int):
+        raise SystemExit(code)
+
+    yield
+    app.registered_commands.pop()
+
+
+def run(server, message):
+    sock = daemon._connect(server.path)
+    output = {daemon.STDOUT: b"", daemon.STDERR: b""}
+    with sock, sock.makefile("rwb") as file:
+        file.write(json.dumps({"op": "run", **message}).encode("utf-8") + b"\n")
+        file.flush()
+        while True:
+            channel, payload = daemon._read_frame(file)
+            if channel == daemon.EXIT:
+                return int(payload), output
+            output[channel] += payload
+
+
+def test_system_exit_sends_exit_code(server, command):
+    code, _ = run(server, {"profile": "default", "argv": ["test-exit", "3"]})
+    assert code == 3
+
+
+def test_profile_comes_from_the_request(server, command, monkeypatch):
+    monkeypatch.setenv("SOTAGENTS_PROFILE", "other")
+    code, _ = run(server, {"profile": "default", "argv": ["test-exit", "0"]})
+    assert code == 0
+    assert get_config().profile == "default"
+
+    code, output = run(server, {"profile": "other", "argv": ["test-exit", "0"]})
+    assert code == 2
+    assert b"profile 'other'" in output[daemon.STDERR]
+    assert get_config().profile == "default"
@@ -0,0 +1,96 @@
+from sotagents.sync import DeltaSynchronizer, SyncStateStore
+from sotagents.sync.delta import SyncMode
+from sotagents.models import (
+    ResultSyncRequest,
+    ResultSyncResponse,
+    EvaluationTableSyncRequest,
+    EvaluationTableSyncResponse,
+)
+
+
+class FakeHttp:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeClient:
+    def __init__(self, url="https://a.example/api/v1", missing=()):
+        self.http = FakeHttp(url)
+        self.missing = set(missing)
+        self.calls = []
+
+    def evaluation_synchronize(self, evaluation):
+        self.calls.append(("evaluation_synchronize",))
+        return EvaluationTableSyncResponse(
+            id="table",
+            task=evaluation.task,
+            dataset=evaluation.dataset,
+            results=[
+                ResultSyncResponse(id=f"id-{r.external_id}", **r.dict())
+                for r in evaluation.results
+                if r.external_id not in self.missing
+            ],
+        )
+
+    def evaluation_result_update(self, table_id, result_id, request):
+        self.calls.append(("evaluation_result_update", table_id, result_id))
+
+    def evaluation_result_delete(self, table_id, result_id):
+        self.calls.append(("evaluation_result_delete", table_id, result_id))
+
+
+def result(external_id, methodology="m"):
+    return ResultSyncRequest(
+        metrics={"acc": "90"},
+        methodology=methodology,
+        paper=None,
+        external_id=external_id,
+        evaluated_on="2020-01-01",
+    )
+
+
+def table(*results):
+    return EvaluationTableSyncRequest(
+        task="task", dataset="dataset", results=list(results)
+    )
+
+
+def test_partial_and_skipped(tmp_path):
+    client = FakeClient()
+    sync = DeltaSynchronizer(client, store=SyncStateStore(tmp_path))
+    assert sync.synchronize(table(result("a"), result("b"))).mode == SyncMode.full
+
+    skipped = sync.synchronize(table(result("a"), result("b")))
+    assert skipped.mode == SyncMode.skipped
+    assert [r.id for r in skipped.response.results] == ["id-a", "id-b"]
+
+    client.calls.clear()
+    partial = sync.synchronize(table(result("a", methodology="new")))
+    assert partial.mode == SyncMode.partial
+    assert client.calls == [
+        ("evaluation_result_update", "table", "id-a"),
+        ("evaluation_result_delete", "table", "id-b"),
+    ]
+
+
+def test_state_is_scoped_by_server(tmp_path):
+    store = SyncStateStore(tmp_path)
+    DeltaSynchronizer(FakeClient(), store=store).synchronize(table(result("a")))
+
+    other = FakeClient(url="https://b.example/api/v1")
+    sync = DeltaSynchronizer(other, store=store)
+    assert sync.synchronize(table(result("a"))).mode == SyncMode.full
+
+
+def test_rows_without_id_force_full_sync(tmp_path):
+    client = FakeClient(missing={"b"})
+    sync = DeltaSynchronizer(client, store=SyncStateStore(tmp_path))
+    sync.synchronize(table(result("a"), result("b")))
+
+    # Removed, unchanged and skipped rows without an ID are not sent as `None`.
+    client.missing.clear()
+    assert sync.synchronize(table(result("a"))).mode == SyncMode.full
+    client.missing.add("b")
+    sync.synchronize(table(result("a"), result("b")))
+    assert sync.synchronize(table(result("a"), result("b"))).mode == SyncMode.full
+    assert all(call[-1] is not None for call in client.calls)
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from sotagents.client import PapersWithCodeClient
+from sotagents.commands import app, entities
+from sotagents.commands.output import set_format
+from sotagents.config import use_profile
+
+PAPERS = [
+    {
+        "id": f"p{number}",
+        "arxiv_id": f"2001.0000{number}",
+        "nips_id": None,
+        "url_abs": f"https://arxiv.org/abs/2001.0000{number}",
+        "url_pdf": f"https://arxiv.org/pdf/2001.0000{number}",
+        "title": f"Paper {number}",
+        "abstract": "Abstract",
+        "authors": ["Author"],
+        "published": "2020-01-01",
+        "conference": None,
+        "conference_url_abs": None,
+        "conference_url_pdf": None,
+        "proceeding": None,
+    }
+    for number in range(1, 4)
+]
+
+
+def respond(request):
+    path = request.url.path
+    if path == "/api/v1/papers/":
+        page = int(request.url.params.get("page", 1))
+        size = int(request.url.params["items_per_page"])
+        results = PAPERS[(page - 1) * size : page * size]
+        more = page * size < len(PAPERS)
+        return httpx.Response(
+            200,
+            json={
+                "count": len(PAPERS),
+                "next": (
+                    f"{request.url.copy_with(query=None)}?page={page + 1}"
+                    if more
+                    else None
+                ),
+                "previous": None,
+                "results": results,
+            },
+        )
+    for paper in PAPERS:
+        if path == f"/api/v1/papers/{paper['id']}/":
+            return httpx.Response(200, json=paper)
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("SOTAGENTS_PROFILE", raising=False)
+    use_profile("default")
+    client = PapersWithCodeClient(url="https://example.com", trusted=True)
+    client.http._client = httpx.Client(
+        base_url=client.http.url, transport=httpx.MockTransport(respond)
+    )
+    entities.share_client(client)
+    yield CliRunner()
+    entities.share_client(None)
+    set_format(None)
+
+
+def invoke(runner, *args):
+    result = runner.invoke(app, list(args), catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_list_all_text(runner):
+    output = invoke(runner, "-f", "text", "papers", "list", "--all", "-n", "2")
+    for paper in PAPERS:
+        assert paper["title"] in output
+
+
+def test_list_all_json(runner):
+    output = invoke(runner, "-f", "json", "papers", "list", "--all", "-n", "2")
+    assert [paper["id"] for paper in json.loads(output)] == ["p1", "p2", "p3"]
+
+
+def test_list_all_jsonl(runner):
+    output = invoke(runner, "-f", "jsonl", "papers", "list", "--all", "-n", "2")
+    assert [json.loads(line)["id"] for line in output.splitlines()] == [
+        "p1",
+        "p2",
+        "p3",
+    ]
+
+
+def test_list_all_csv(runner):
+    output = invoke(
+        runner, "-f", "csv", "papers", "list", "--all", "-n", "2", "-F", "id"
+    )
+    assert list(csv.reader(io.StringIO(output))) == [["id"], ["p1"], ["p2"], ["p3"]]
+
+
+def test_get_text(runner):
+    output = invoke(runner, "-f", "text", "papers", "get", "p3")
+    assert "Paper 3" in output
+
+
+def test_get_json_is_an_object(runner):
+    output = invoke(runner, "-f", "json", "papers", "get", "p3")
+    paper = json.loads(output)
+    assert paper["id"] == "p3"
+    assert paper["published"] == "2020-01-01"
+
+
+def test_get_jsonl(runner):
+    output = invoke(runner, "-f", "jsonl", "papers", "get", "p3")
+    assert json.loads(output)["id"] == "p3"
+
+
+def test_get_csv(runner):
+    rows = list(
+        csv.DictReader(io.StringIO(invoke(runner, "-f", "csv", "papers", "get", "p3")))
+    )
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Paper 3"
@@ -0,0 +1,42 @@
+import httpx
+import pytest
+
+from sotagents.client import PapersWithCodeClient
+from sotagents.errors import HttpClientError
+from sotagents.mirror import Mirror
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    client = PapersWithCodeClient(url="https://example.com")
+    client.http._client = httpx.Client(
+        base_url=client.http.url,
+        transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+    )
+    return client
+
+
+def test_no_fallback_without_mirror(client):
+    with pytest.raises(HttpClientError):
+        client.paper_list(fallback=True)
+    assert not Mirror.default_path(client).exists()
+
+
+def test_no_fallback_without_synced_papers(client):
+    with Mirror(client):
+        pass
+    with pytest.raises(HttpClientError):
+        client.paper_list(fallback=True)
+
+
+def test_fallback_to_synced_papers(client):
+    with Mirror(client) as mirror:
+        with mirror.connection:
+            mirror.connection.execute(
+                "INSERT INTO watermarks (name, value, synced_at) VALUES (?, ?, ?)",
+                ("papers", "2020-01-01", 0),
+            )
+    papers = client.paper_list(fallback=True)
+    assert papers.count == 0
+    assert papers.results == []
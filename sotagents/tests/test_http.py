@@ -0,0 +1,76 @@
+import httpx
+import pytest
+
+from sotagents import errors
+from sotagents.http import HttpClient
+
+RATE_LIMITED = {
+    "X-Ratelimit-Limit": "100",
+    "X-Ratelimit-Remaining": "0",
+    "X-Ratelimit-Reset": "60",
+    "X-Ratelimit-Retry": "1",
+}
+
+
+def make_client(responses, **kwargs):
+    responses = iter(responses)
+    http = HttpClient(url="https://example.com/api/v1", **kwargs)
+    http._client = httpx.Client(
+        base_url=http.url,
+        transport=httpx.MockTransport(lambda request: next(responses)),
+    )
+    return http
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("sotagents.http.time.sleep", sleeps.append)
+    return sleeps
+
+
+def test_exhausted_rate_limit_raises():
+    http = make_client([httpx.Response(429, headers=RATE_LIMITED)])
+    with pytest.raises(errors.HttpRateLimitExceeded) as info:
+        http.get("/papers/")
+    assert info.value.retry == "1"
+
+
+def test_remaining_rate_limit_is_not_exceeded():
+    headers = {**RATE_LIMITED, "X-Ratelimit-Remaining": "10"}
+    http = make_client([httpx.Response(429, headers=headers)])
+    with pytest.raises(errors.HttpClientError) as info:
+        http.get("/papers/")
+    assert not isinstance(info.value, errors.HttpRateLimitExceeded)
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [RATE_LIMITED, {"Retry-After": "1"}],
+    ids=["x-ratelimit-retry", "retry-after"],
+)
+def test_retry_waits_as_requested(sleeps, headers):
+    http = make_client(
+        [httpx.Response(429, headers=headers), httpx.Response(200, json={"id": 1})],
+        retries=1,
+        backoff=0.01,
+    )
+    assert http.get("/papers/") == {"id": 1}
+    assert sleeps == [1.0]
+
+
+def test_retry_backs_off(sleeps):
+    http = make_client(
+        [httpx.Response(503), httpx.Response(503), httpx.Response(200, json={})],
+        retries=2,
+        backoff=0.01,
+    )
+    assert http.get("/papers/") == {}
+    assert sleeps == [0.01, 0.02]
+
+
+def test_retries_are_limited(sleeps):
+    http = make_client([httpx.Response(503)] * 2, retries=1, backoff=0.01)
+    with pytest.raises(errors.HttpClientError):
+        http.get("/papers/")
+    assert len(sleeps) == 1
@@ -0,0 +1,107 @@
+import inspect
+from collections import Counter
+
+import httpx
+import pytest
+
+from sotagents.client import INVALIDATES, PapersWithCodeClient
+from sotagents.models import (
+    ResultCreateRequest,
+    TaskUpdateRequest,
+)
+
+PAGE = {"count": 0, "next": None, "previous": None, "results": []}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    client = PapersWithCodeClient(url="https://example.com", cache_ttl=60)
+    client.gets = Counter()
+
+    def respond(request):
+        path = request.url.path[len("/api/v1") :]
+        if request.method == "GET":
+            client.gets[path] += 1
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        if path.endswith("/results/") and request.method == "POST":
+            return httpx.Response(201, json=RESULT)
+        if path.endswith("s/"):
+            return httpx.Response(200, json=PAGE)
+        if "/results/" in path:
+            return httpx.Response(200, json=RESULT)
+        return httpx.Response(200, json=TASK)
+
+    client.http._client = httpx.Client(
+        base_url=client.http.url, transport=httpx.MockTransport(respond)
+    )
+    return client
+
+
+TASK = {"id": "t1", "name": "Task", "description": ""}
+RESULT = {
+    "id": "r1",
+    "best_rank": None,
+    "metrics": {},
+    "methodology": "Method",
+    "uses_additional_data": False,
+    "paper": None,
+    "best_metric": None,
+    "evaluated_on": None,
+    "external_source_url": None,
+}
+
+
+def test_update_invalidates_object_and_lists(client):
+    client.task_get("t1")
+    client.task_list()
+    client.dataset_list()
+    client.task_update("t1", TaskUpdateRequest(name="New"))
+    client.task_get("t1")
+    client.task_list()
+    assert client.gets["/tasks/t1/"] == 2
+    assert client.gets["/tasks/"] == 2
+    # Unrelated reads stay cached.
+    client.dataset_list()
+    assert client.gets["/datasets/"] == 1
+
+
+def test_add_invalidates_lists(client):
+    client.evaluation_result_list("e1")
+    client.evaluation_result_list("e2")
+    client.evaluation_result_add(
+        "e1", ResultCreateRequest(metrics={"acc": "90"}, methodology="Method")
+    )
+    client.evaluation_result_list("e1")
+    client.evaluation_result_list("e2")
+    assert client.gets["/evaluations/e1/results/"] == 2
+    assert client.gets["/evaluations/e2/results/"] == 1
+
+
+def test_delete_invalidates_object_and_lists(client):
+    client.evaluation_result_get("e1", "r1")
+    client.evaluation_result_get("e1", "r2")
+    client.evaluation_result_list("e1")
+    client.evaluation_result_delete("e1", "r1")
+    client.evaluation_result_get("e1", "r1")
+    client.evaluation_result_get("e1", "r2")
+    client.evaluation_result_list("e1")
+    assert client.gets["/evaluations/e1/results/r1/"] == 2
+    assert client.gets["/evaluations/e1/results/r2/"] == 1
+    assert client.gets["/evaluations/e1/results/"] == 2
+
+
+def test_reads_are_cached(client):
+    client.task_get("t1")
+    client.task_get("t1")
+    assert client.gets["/tasks/t1/"] == 1
+
+
+@pytest.mark.parametrize("name", sorted(INVALIDATES))
+def test_patterns_match_method_arguments(name):
+    method = getattr(PapersWithCodeClient, name)
+    parameters = inspect.signature(method).parameters
+    for pattern in INVALIDATES[name]:
+        pattern.format(**{parameter: "x" for parameter in parameters})
+        assert pattern.startswith("/") and pattern.endswith(("/", "*"))
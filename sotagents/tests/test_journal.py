@@ -0,0 +1,72 @@
+import json
+import contextlib
+
+import pytest
+
+from sotagents.http import HttpClient
+from sotagents.journal import WriteJournal
+from sotagents.models import ResultUpdateRequest, TaskCreateRequest
+
+
+class FakeConfig:
+    def __init__(self, profile):
+        self.profile = profile
+
+
+class FakeHttp:
+    @contextlib.contextmanager
+    def extra_headers(self, headers):
+        yield
+
+
+class FakeClient:
+    def __init__(self, profile="default"):
+        self.config = FakeConfig(profile)
+        self.http = FakeHttp()
+        self.calls = []
+
+    def task_add(self, task):
+        self.calls.append(("task_add", task))
+
+    def evaluation_result_update(self, evaluation_id, result_id, result):
+        self.calls.append(
+            ("evaluation_result_update", evaluation_id, result_id, result)
+        )
+
+
+def test_replay_sends_only_set_result_fields(tmp_path):
+    journal = WriteJournal("test", path=tmp_path, fsync=False, profile="default")
+    journal.evaluation_result_update(
+        "table", "row", ResultUpdateRequest(metrics={"acc": "90"})
+    )
+    journal.evaluation_result_update(
+        "table", "row", ResultUpdateRequest(methodology="New")
+    )
+    assert [entry.data for entry in journal.entries()] == [
+        {"metrics": {"acc": "90"}},
+        {"methodology": "New"},
+    ]
+
+    client = FakeClient()
+    report = journal.replay(client)
+    assert report.applied == 1
+    assert report.superseded == 1
+    ((_, evaluation_id, result_id, request),) = client.calls
+    assert (evaluation_id, result_id) == ("table", "row")
+    assert json.loads(HttpClient.encode(request, partial=True)) == {
+        "metrics": {"acc": "90"},
+        "methodology": "New",
+    }
+    assert len(journal) == 0
+
+
+def test_journals_are_scoped_by_profile(tmp_path):
+    default = WriteJournal("test", path=tmp_path, fsync=False, profile="default")
+    staging = WriteJournal("test", path=tmp_path, fsync=False, profile="staging")
+    default.task_add(TaskCreateRequest(name="Task"))
+    assert len(default) == 1
+    assert len(staging) == 0
+
+    with pytest.raises(ValueError):
+        default.replay(FakeClient(profile="staging"))
+    assert len(default) == 1
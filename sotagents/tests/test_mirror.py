@@ -0,0 +1,48 @@
+from sotagents.client import PapersWithCodeClient
+from sotagents.mirror import Mirror
+
+
+def test_default_path_is_scoped_by_server(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    first = PapersWithCodeClient(url="https://one.example.com")
+    second = PapersWithCodeClient(url="http://127.0.0.1:8765")
+    assert Mirror.default_path(first) != Mirror.default_path(second)
+    assert Mirror.default_path(first).parent.parent == first.cache_dir
+    assert Mirror.default_path(first) == Mirror.default_path(
+        PapersWithCodeClient(url="https://one.example.com")
+    )
+
+
+def test_watermarks_are_kept_per_server(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    first = PapersWithCodeClient(url="https://one.example.com")
+    second = PapersWithCodeClient(url="https://two.example.com")
+    with Mirror(first) as mirror:
+        with mirror.connection:
+            mirror.connection.execute(
+                "INSERT INTO watermarks (name, value, synced_at) VALUES (?, ?, ?)",
+                ("papers", "2020-01-01", 0),
+            )
+    with Mirror(second) as mirror:
+        assert mirror.watermarks() == {}
+    with Mirror(first) as mirror:
+        assert "papers" in mirror.watermarks()
+
+
+def test_foreign_keys_are_not_enforced(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    client = PapersWithCodeClient(url="https://one.example.com")
+    with Mirror(client) as mirror:
+        assert mirror.query("PRAGMA foreign_keys")[0][0] == 0
+        assert (
+            "CASCADE"
+            not in mirror.query("SELECT sql FROM sqlite_master WHERE name = 'results'")[
+                0
+            ][0]
+        )
+        with mirror.connection:
+            mirror.connection.execute(
+                "INSERT INTO results (id, evaluation, synced_at) VALUES (?, ?, ?)",
+                ("r1", "missing", 0),
+            )
+        assert [table for table, _, _ in mirror.dangling()] == ["results"]
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from sotagents.commands.output import CsvWriter, JsonWriter, RecordWriter
+
+
+class ClosedPipe(io.StringIO):
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        if self.flushes > self.fail_after:
+            raise BrokenPipeError()
+
+    def fileno(self):
+        raise ValueError("no file descriptor")
+
+
+def test_json_writer():
+    file = io.StringIO()
+    with JsonWriter(file=file) as writer:
+        writer.write_all([{"a": 1}, {"a": 2}])
+    assert json.loads(file.getvalue()) == [{"a": 1}, {"a": 2}]
+
+
+def test_csv_writer():
+    file = io.StringIO()
+    with CsvWriter(file=file) as writer:
+        writer.write({"a": 1, "b": [1, 2], "c": None})
+    assert file.getvalue().splitlines() == ["a,b,c", '1,"[1, 2]",']
+
+
+def test_broken_pipe_in_body_is_quiet():
+    with JsonWriter(file=ClosedPipe(fail_after=0)) as writer:
+        writer.write({"a": 1})
+
+
+def test_broken_pipe_at_end_is_quiet():
+    file = ClosedPipe(fail_after=1)
+    with JsonWriter(file=file) as writer:
+        writer.write({"a": 1})
+    assert file.flushes == 2
+
+
+def test_record_writer_is_abstract():
+    with pytest.raises(TypeError):
+        RecordWriter()
@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+
+from sotagents.analysis import ResultsFrame, SotaProgression
+
+ROWS = [
+    ("r0", "2020-01-01", 70.0),
+    ("r1", "2020-01-01", 75.0),
+    ("r2", "2020-01-03", 72.0),
+    ("r3", "2020-01-05", 80.0),
+    ("r4", "2020-01-05", 78.0),
+    ("r5", "2020-01-07", None),
+    ("r6", "2020-01-09", 81.0),
+    ("r7", "2020-01-09", 85.0),
+    ("r8", None, 99.0),
+]
+
+
+def frame(rows, is_loss=False):
+    return ResultsFrame(
+        ids=np.array([id for id, _, _ in rows], dtype=object),
+        papers=np.array([None] * len(rows), dtype=object),
+        evaluated_on=np.array(
+            ["NaT" if date is None else date for _, date, _ in rows],
+            dtype="datetime64[D]",
+        ),
+        values={
+            "acc": np.array(
+                [np.nan if value is None else value for _, _, value in rows]
+            )
+        },
+        is_loss={"acc": is_loss},
+    )
+
+
+def assert_same(first, second):
+    np.testing.assert_array_equal(first.dates, second.dates)
+    np.testing.assert_array_equal(first.values, second.values)
+    assert first.ids.tolist() == second.ids.tolist()
+
+
+def test_one_point_per_date():
+    series = SotaProgression().add(frame(ROWS)).series("acc")
+    assert series.dates.astype(str).tolist() == [
+        "2020-01-01",
+        "2020-01-03",
+        "2020-01-05",
+        "2020-01-07",
+        "2020-01-09",
+    ]
+    assert series.values.tolist() == [75.0, 75.0, 80.0, 80.0, 85.0]
+    assert series.ids.tolist() == ["r1", "r1", "r3", "r3", "r7"]
+
+
+def test_steps_only():
+    series = SotaProgression().add(frame(ROWS)).series("acc", steps_only=True)
+    assert series.ids.tolist() == ["r1", "r3", "r7"]
+    assert series.dates.astype(str).tolist() == [
+        "2020-01-01",
+        "2020-01-05",
+        "2020-01-09",
+    ]
+
+
+@pytest.mark.parametrize("is_loss", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_adds_match_a_rebuild(is_loss, seed):
+    rows = ROWS[:]
+    random.Random(seed).shuffle(rows)
+    incremental = SotaProgression()
+    for start in range(0, len(rows), 2):
+        incremental.add(frame(rows[start : start + 2], is_loss))
+    rebuilt = SotaProgression().add(frame(ROWS, is_loss))
+    for steps_only in (False, True):
+        assert_same(
+            incremental.series("acc", steps_only=steps_only),
+            rebuilt.series("acc", steps_only=steps_only),
+        )
+    assert incremental.best("acc") == rebuilt.best("acc")
+
+
+def test_replaced_results():
+    progression = SotaProgression().add(frame(ROWS))
+    progression.add(frame([("r7", "2020-01-09", 60.0)]))
+    series = progression.series("acc")
+    assert series.values[-1] == 81.0
+    assert series.ids[-1] == "r6"
+    assert len(progression) == len(ROWS) - 1
+
+
+def test_results_without_date_are_ignored():
+    progression = SotaProgression().add(frame([("r0", "2020-01-01", 1.0)]))
+    progression.add(frame([("r0", None, 1.0)]))
+    assert len(progression.series("acc")) == 1
+    assert progression.best("acc") == 1.0
@@ -0,0 +1,103 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from sotagents.proxy import CachingProxy
+
+
+class Upstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._reply({"body": self.rfile.read(length).decode("utf-8")})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def proxy_url():
+    upstream = serve(Upstream)
+    proxy = CachingProxy(f"http://127.0.0.1:{upstream.server_port}")
+    server = serve(proxy.handler())
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    upstream.shutdown()
+    proxy.close()
+
+
+def test_chunked_body_is_forwarded(proxy_url):
+    with httpx.Client(base_url=proxy_url) as client:
+        for _ in range(2):
+            # Both requests use the same connection.
+            response = client.post("/api/v1/x/", content=iter([b'{"a":', b" 1}"]))
+            assert response.json() == {"body": '{"a": 1}'}
+        assert client.get("/api/v1/y/").json() == {"path": "/api/v1/y/"}
+
+
+def test_content_length_body_is_forwarded(proxy_url):
+    response = httpx.post(f"{proxy_url}/api/v1/x/", content=b"plain")
+    assert response.json() == {"body": "plain"}
+
+
+def test_malformed_chunked_body_closes_connection(proxy_url):
+    import socket
+
+    host, port = proxy_url[len("http://") :].split(":")
+    with socket.create_connection((host, int(port))) as sock:
+        sock.sendall(
+            b"POST /api/v1/x/ HTTP/1.1\r\nHost: x\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\nzz\r\n"
+        )
+        response = sock.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"Connection: close" in response
+
+
+def test_head(proxy_url):
+    response = httpx.head(f"{proxy_url}/api/v1/y/")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert int(response.headers["Content-Length"]) > 0
+
+
+def test_stats():
+    upstream = serve(Upstream)
+    proxy = CachingProxy(f"http://127.0.0.1:{upstream.server_port}")
+    try:
+        first, served = proxy.get("/api/v1/y/", {})
+        assert served == "miss"
+        # The leader of an identical request finished after the first lookup.
+        get = proxy.cache.get
+        lookups = iter([None])
+        proxy.cache.get = lambda key: next(lookups, get(key))
+        second, served = proxy.get("/api/v1/y/", {})
+        assert served == "hit"
+        assert second is first
+        assert proxy.stats.hits == 1
+        assert proxy.stats.upstream == 1
+    finally:
+        upstream.shutdown()
+        proxy.close()
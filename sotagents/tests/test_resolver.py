@@ -0,0 +1,51 @@
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from sotagents.errors import HttpClientError
+from sotagents.resolver import NameResolver
+
+
+class FakeClient:
+    def __init__(self, cache_dir, url="https://example.com/api/v1"):
+        self.cache_dir = cache_dir
+        self.server_cache_dir = cache_dir / url.split("://")[1].replace("/", "_")
+        self.concurrency = 4
+        self.lookups = []
+        self._lock = threading.Lock()
+
+    def repository_get(self, owner, name):
+        with self._lock:
+            self.lookups.append(f"{owner}/{name}")
+        if owner == "broken":
+            raise HttpClientError(message="Unavailable", status_code=503)
+        return SimpleNamespace(url=f"https://github.com/{owner}/{name}")
+
+
+def test_default_ttl_is_finite(tmp_path):
+    resolver = NameResolver(FakeClient(tmp_path))
+    assert resolver.ttl is not None
+    resolver.resolve("repositories", "a/b")
+    _, expires = resolver._memo["repositories"]["a/b"]
+    assert expires is not None and expires > time.time()
+
+
+def test_default_path_is_scoped_by_server(tmp_path):
+    first = NameResolver(FakeClient(tmp_path, "https://one.example.com"))
+    second = NameResolver(FakeClient(tmp_path, "https://two.example.com"))
+    assert first.path != second.path
+
+
+def test_failed_lookup_keeps_completed_lookups(tmp_path):
+    client = FakeClient(tmp_path)
+    resolver = NameResolver(client)
+    with pytest.raises(HttpClientError):
+        resolver.prefetch("repositories", ["a/b", "broken/repo", "c/d"])
+
+    client.lookups.clear()
+    resolver = NameResolver(client)
+    assert resolver.prefetch("repositories", ["a/b", "c/d"]) == 0
+    assert resolver.resolve("repositories", "c/d") == "https://github.com/c/d"
+    assert client.lookups == []
@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from sotagents.table import Column, StreamingTable
+
+
+def test_streaming_table_prints_all_chunks():
+    console = Console(width=80, record=True)
+    columns = [Column(title="ID", path="id"), Column(title="Title", path="title")]
+    with StreamingTable(columns, console=console, chunk_size=2) as table:
+        for i in range(5):
+            table.add(SimpleNamespace(id=f"paper-{i}", title=f"Title {i}"))
+    assert table.rows == 5
+    text = console.export_text()
+    assert text.count("Title") == 6
+    assert all(f"paper-{i}" in text for i in range(5))
@@ -0,0 +1,26 @@
+from sotagents.client import PapersWithCodeClient
+from sotagents.mirror import Mirror
+from sotagents.typeahead import Typeahead
+
+
+def test_default_path_is_scoped_by_server(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    first = Typeahead(PapersWithCodeClient(url="https://one.example.com"))
+    second = Typeahead(PapersWithCodeClient(url="https://two.example.com"))
+    assert first.path != second.path
+    assert first.path.parent == first.client.server_cache_dir
+
+
+def test_mirror_synced_at_reads_the_server_mirror(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    client = PapersWithCodeClient(url="https://one.example.com")
+    typeahead = Typeahead(client)
+    assert typeahead._mirror_synced_at("tasks") is None
+    assert not Mirror.default_path(client).exists()
+    with Mirror(client) as mirror:
+        with mirror.connection:
+            mirror.connection.execute(
+                "INSERT INTO watermarks (name, value, synced_at) VALUES (?, ?, ?)",
+                ("tasks", "2020-01-01", 42),
+            )
+    assert typeahead._mirror_synced_at("tasks") == 42
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from sotagents.client import PapersWithCodeClient
+from sotagents.errors import HttpClientError, ValidationError
+from sotagents.models import EvaluationTableSyncRequest, ResultSyncRequest
+
+
+class FakeTokenManager:
+    access = "access"
+
+    def token(self):
+        return self.access
+
+
+def make_client(tmp_path, monkeypatch, status, body):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    client = PapersWithCodeClient(url="https://example.com")
+
+    def respond(request):
+        request.read()
+        return httpx.Response(status, json=body)
+
+    client.http._client = httpx.Client(
+        base_url=client.http.url, transport=httpx.MockTransport(respond)
+    )
+    return client
+
+
+def synchronize_stream(client):
+    return client.evaluation_synchronize_stream(
+        EvaluationTableSyncRequest(task="task", dataset="dataset"),
+        iter(
+            [ResultSyncRequest(metrics={}, methodology="m", evaluated_on="2020-01-01")]
+        ),
+    )
+
+
+def test_invalid_responses_raise_validation_error(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch, 200, {})
+    with pytest.raises(ValidationError):
+        client.task_get("task")
+    with pytest.raises(ValidationError):
+        synchronize_stream(client)
+
+
+def test_stream_is_not_retried_after_401(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch, 401, {})
+    client.http.token_manager = FakeTokenManager()
+    refreshes = []
+    monkeypatch.setattr(client, "refresh", lambda stale=None: refreshes.append(stale))
+
+    with pytest.raises(HttpClientError) as info:
+        synchronize_stream(client)
+    assert info.value.status_code == 401
+    assert refreshes == []
+
+    with pytest.raises(HttpClientError):
+        client.task_get("task")
+    assert refreshes == ["access"]
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from sotagents.http import HttpClient
+from sotagents.writebehind import WriteBehindBuffer, merge_update
+from sotagents.models import ResultUpdateRequest, TaskUpdateRequest
+
+
+class FakeClient:
+    concurrency = 2
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def evaluation_result_update(self, evaluation_id, result_id, result):
+        if result_id in self.failing:
+            raise ValueError(f"Cannot update {result_id}")
+        self.calls.append((evaluation_id, result_id, result))
+        return result
+
+
+def test_merge_result_updates():
+    merged = merge_update(
+        ResultUpdateRequest(metrics={"acc": "90"}),
+        ResultUpdateRequest(methodology="New"),
+    )
+    assert merged.metrics == {"acc": "90"}
+    assert merged.methodology == "New"
+    assert merged.dict(exclude_unset=True) == {
+        "metrics": {"acc": "90"},
+        "methodology": "New",
+    }
+
+
+def test_merge_task_updates():
+    merged = merge_update(
+        TaskUpdateRequest(name="Name", description="Old"),
+        TaskUpdateRequest(description="New"),
+    )
+    assert merged.dict(exclude_unset=True) == {"name": "Name", "description": "New"}
+
+
+def test_partial_body_contains_only_set_fields():
+    body = HttpClient.encode(ResultUpdateRequest(metrics={"acc": "90"}), partial=True)
+    assert json.loads(body) == {"metrics": {"acc": "90"}}
+
+    body = HttpClient.encode(ResultUpdateRequest(paper=None), partial=True)
+    assert json.loads(body) == {"paper": None}
+
+
+def test_full_body_contains_all_fields():
+    body = json.loads(HttpClient.encode(ResultUpdateRequest(methodology="m")))
+    assert body["methodology"] == "m"
+    assert body["paper"] is None
+
+
+def test_buffer_sends_merged_update():
+    client = FakeClient()
+    with WriteBehindBuffer(client, flush_interval=60) as buffer:
+        first = buffer.evaluation_result_update(
+            "table", "row", ResultUpdateRequest(metrics={"acc": "90"})
+        )
+        second = buffer.evaluation_result_update(
+            "table", "row", ResultUpdateRequest(methodology="New")
+        )
+        buffer.flush()
+    assert len(client.calls) == 1
+    request = client.calls[0][2]
+    assert request.dict(exclude_unset=True) == {
+        "metrics": {"acc": "90"},
+        "methodology": "New",
+    }
+    assert first.result() is second.result()
+
+
+def test_failing_error_callback_does_not_lose_updates():
+    def on_error(method, args, request, error):
+        raise RuntimeError("Callback failed")
+
+    client = FakeClient(failing=["broken"])
+    buffer = WriteBehindBuffer(client, flush_interval=0.01, on_error=on_error)
+    failed = buffer.evaluation_result_update(
+        "table", "broken", ResultUpdateRequest(methodology="m")
+    )
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    assert len(buffer.errors) == 1
+
+    buffer.flush_interval = 60
+    later = buffer.evaluation_result_update(
+        "table", "row", ResultUpdateRequest(methodology="m")
+    )
+    assert buffer._thread.is_alive()
+    buffer.close()
+    assert later.result(timeout=1).methodology == "m"
+    assert len(buffer) == 0
@@ -0,0 +1,420 @@
+"""Typeahead lookup of task, dataset and method names.
+
+Autocompletion doesn't need a server request per keystroke. `Typeahead` keeps a
+sorted index of the names of every entity kind in memory, answers prefix and
+fuzzy lookups with IDs and stores the index in the cache directory, so a new
+process loads it without listing all the names again.
+
+The names are read from the local mirror (see `Mirror`) if the entity table was
+synced there, otherwise they are listed from the server. Refreshes only apply
+the names that changed since the previous one.
+
+Example:
+    >>> typeahead = Typeahead(client)
+    >>> typeahead.start(interval=600)
+    >>> typeahead.lookup("tasks", "image cla")
+    ['image-classification', 'few-shot-image-classification', ...]
+"""
+
+__all__ = ["NameIndex", "Typeahead"]
+
+import io
+import os
+import re
+import json
+import time
+import bisect
+import difflib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from sotagents.mirror import Mirror
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class NameIndex:
+    """Names of one entity kind in sorted arrays.
+
+    Every name is indexed under each of its words, so `cla` finds
+    `Image Classification`. Lookups are case insensitive.
+    """
+
+    def __init__(self, names: Optional[dict[str, str]] = None):
+        """Initialize.
+
+        Args:
+            names: Names by ID.
+        """
+        self.names: dict[str, str] = {}
+        # Parallel sorted arrays of the indexed keys and the IDs they belong to.
+        self._keys: list[str] = []
+        self._ids: list[str] = []
+        self._normalized: Optional[dict[str, list[str]]] = None
+        if names:
+            self.update(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Return the text lowercased with single spaces between words."""
+        return " ".join(re.findall(r"\w+", text.casefold()))
+
+    @classmethod
+    def keys(cls, name: str) -> list[str]:
+        """Return the keys of a name, the name from each of its words on."""
+        words = cls.normalize(name).split(" ")
+        return [" ".join(words[i:]) for i in range(len(words)) if words[i] != ""]
+
+    def _insert(self, id: str, name: str):
+        for key in self.keys(name):
+            position = bisect.bisect_left(self._keys, key)
+            self._keys.insert(position, key)
+            self._ids.insert(position, id)
+
+    def _remove(self, id: str, name: str):
+        for key in self.keys(name):
+            position = bisect.bisect_left(self._keys, key)
+            while position < len(self._keys) and self._keys[position] == key:
+                if self._ids[position] == id:
+                    del self._keys[position]
+                    del self._ids[position]
+                    break
+                position += 1
+
+    def update(self, names: dict[str, str]):
+        """Add or rename entities.
+
+        Args:
+            names: Names by ID.
+        """
+        changed = {id: name for id, name in names.items() if self.names.get(id) != name}
+        if len(changed) == 0:
+            return
+        if len(changed) > len(self.names) // 4:
+            # Bulk changes are cheaper to sort again than to insert one by one.
+            self.names.update(changed)
+            entries = sorted(
+                (key, id) for id, name in self.names.items() for key in self.keys(name)
+            )
+            self._keys = [key for key, _ in entries]
+            self._ids = [id for _, id in entries]
+        else:
+            for id, name in changed.items():
+                if id in self.names:
+                    self._remove(id, self.names[id])
+                self.names[id] = name
+                self._insert(id, name)
+        self._normalized = None
+
+    def remove(self, ids: Iterable[str]):
+        """Remove entities.
+
+        Args:
+            ids: IDs of the removed entities.
+        """
+        for id in ids:
+            name = self.names.pop(id, None)
+            if name is not None:
+                self._remove(id, name)
+                self._normalized = None
+
+    def prefix(self, prefix: str, limit: int = 10) -> list[str]:
+        """Return IDs of entities with a word starting with the prefix.
+
+        Names starting with the prefix come first, shorter names before longer
+        ones.
+
+        Args:
+            prefix: Beginning of the name or of one of its words.
+            limit: Maximal number of returned IDs.
+        """
+        prefix = self.normalize(prefix)
+        if prefix == "":
+            return []
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo=start)
+        ids = dict.fromkeys(self._ids[start:end])
+        return sorted(
+            ids,
+            key=lambda id: (
+                not self.normalize(self.names[id]).startswith(prefix),
+                len(self.names[id]),
+                self.names[id],
+            ),
+        )[:limit]
+
+    def fuzzy(self, text: str, limit: int = 10, cutoff: float = 0.6) -> list[str]:
+        """Return IDs of entities with names similar to the text.
+
+        Args:
+            text: Possibly misspelled name.
+            limit: Maximal number of returned IDs.
+            cutoff: Minimal similarity between 0 and 1, see `difflib`.
+        """
+        if self._normalized is None:
+            self._normalized = {}
+            for id, name in self.names.items():
+                self._normalized.setdefault(self.normalize(name), []).append(id)
+        matches = difflib.get_close_matches(
+            self.normalize(text), self._normalized, n=limit, cutoff=cutoff
+        )
+        return [id for match in matches for id in self._normalized[match]][:limit]
+
+    def lookup(self, text: str, limit: int = 10) -> list[str]:
+        """Return IDs of prefix matches, completed with fuzzy matches."""
+        ids = self.prefix(text, limit=limit)
+        if len(ids) < limit:
+            for id in self.fuzzy(text, limit=limit):
+                if id not in ids:
+                    ids.append(id)
+        return ids[:limit]
+
+    def to_dict(self) -> dict:
+        """Return the index in a JSON serializable form."""
+        return {"names": self.names, "keys": self._keys, "ids": self._ids}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NameIndex":
+        """Load the index stored by `to_dict` without sorting it again."""
+        index = cls()
+        index.names = data["names"]
+        index._keys = data["keys"]
+        index._ids = data["ids"]
+        return index
+
+
+class Typeahead:
+    """Prefix and fuzzy lookup of task, dataset and method names."""
+
+    #: List methods of the client by entity kind.
+    KINDS = {"tasks": "task_list", "datasets": "dataset_list", "methods": "method_list"}
+
+    #: Version of the stored index, older files are ignored.
+    VERSION = 1
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        path: Union[str, Path, None] = None,
+        items_per_page: int = 500,
+    ):
+        """Initialize.
+
+        The stored index is loaded right away, call `refresh` or `start` to
+        update it.
+
+        Args:
+            client: Client used to list the names.
+            path: Path to the stored index. Defaults to `typeahead.json` in the
+                server cache directory of the client, see
+                `PapersWithCodeClient.server_cache_dir`.
+            items_per_page: Number of names fetched per request.
+        """
+        self.client = client
+        self.path = (
+            Path(path)
+            if path is not None
+            else client.server_cache_dir / "typeahead.json"
+        )
+        self.items_per_page = items_per_page
+        self.indexes: dict[str, NameIndex] = {kind: NameIndex() for kind in self.KINDS}
+        # Mirror sync time of the names in every index.
+        self._synced_at: dict[str, Optional[float]] = dict.fromkeys(self.KINDS)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _index(self, kind: str) -> NameIndex:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown kind: {kind}")
+        return self.indexes[kind]
+
+    def prefix(self, kind: str, prefix: str, limit: int = 10) -> list[str]:
+        """Return IDs of entities with a word starting with the prefix.
+
+        Args:
+            kind: `tasks`, `datasets` or `methods`.
+            prefix: Beginning of the name or of one of its words.
+            limit: Maximal number of returned IDs.
+        """
+        with self._lock:
+            return self._index(kind).prefix(prefix, limit=limit)
+
+    def fuzzy(self, kind: str, text: str, limit: int = 10) -> list[str]:
+        """Return IDs of entities with names similar to the text.
+
+        Args:
+            kind: `tasks`, `datasets` or `methods`.
+            text: Possibly misspelled name.
+            limit: Maximal number of returned IDs.
+        """
+        with self._lock:
+            return self._index(kind).fuzzy(text, limit=limit)
+
+    def lookup(self, kind: str, text: str, limit: int = 10) -> list[str]:
+        """Return IDs of prefix matches, completed with fuzzy matches.
+
+        Args:
+            kind: `tasks`, `datasets` or `methods`.
+            text: Text typed so far.
+            limit: Maximal number of returned IDs.
+        """
+        with self._lock:
+            return self._index(kind).lookup(text, limit=limit)
+
+    def name(self, kind: str, id: str) -> Optional[str]:
+        """Return the name of an entity or `None` if it's not indexed."""
+        with self._lock:
+            return self._index(kind).names.get(id)
+
+    def load(self) -> bool:
+        """Load the stored index.
+
+        Returns:
+            Whether the index was loaded.
+        """
+        try:
+            with io.open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except ValueError as e:
+            logger.warning("Ignoring corrupted typeahead index %s: %s", self.path, e)
+            return False
+        if data.get("version") != self.VERSION:
+            return False
+        with self._lock:
+            for kind, index in data["indexes"].items():
+                if kind in self.KINDS:
+                    self.indexes[kind] = NameIndex.from_dict(index)
+                    self._synced_at[kind] = index.get("synced_at")
+        return True
+
+    def save(self):
+        """Store the index, replacing the previous one atomically."""
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "indexes": {
+                    kind: {**index.to_dict(), "synced_at": self._synced_at[kind]}
+                    for kind, index in self.indexes.items()
+                },
+            }
+            content = json.dumps(data, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with io.open(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _mirror_synced_at(self, kind: str) -> Optional[float]:
+        """Return when the mirror table was synced, `None` if it never was."""
+        # The mirror is not created just to find out it's empty.
+        if not Mirror.default_path(self.client).exists():
+            return None
+        rows = self.client.mirror.query(
+            "SELECT synced_at FROM watermarks WHERE name = ?", (kind,)
+        )
+        return rows[0]["synced_at"] if len(rows) > 0 else None
+
+    def _refresh_from_mirror(self, kind: str, synced_at: float):
+        mirror = self.client.mirror
+        with self._lock:
+            previous = self._synced_at[kind]
+        if previous is not None and previous >= synced_at:
+            return
+        changed = mirror.query(
+            f"SELECT id, name FROM {kind} WHERE synced_at > ?",
+            (-1 if previous is None else previous,),
+        )
+        ids = {row["id"] for row in mirror.query(f"SELECT id FROM {kind}")}
+        with self._lock:
+            index = self.indexes[kind]
+            index.update({row["id"]: row["name"] for row in changed})
+            index.remove([id for id in index.names if id not in ids])
+            self._synced_at[kind] = synced_at
+
+    def _refresh_from_server(self, kind: str):
+        method = getattr(self.client, self.KINDS[kind])
+        names = {
+            item["id"]: item["name"]
+            for item in self.client.iterate_raw(
+                method, fields=["id", "name"], items_per_page=self.items_per_page
+            )
+        }
+        with self._lock:
+            index = self.indexes[kind]
+            index.update(names)
+            index.remove([id for id in index.names if id not in names])
+            self._synced_at[kind] = None
+
+    def refresh(self, kinds: Optional[Iterable[str]] = None):
+        """Apply the names changed since the last refresh and store the index.
+
+        Args:
+            kinds: Entity kinds to refresh. Defaults to all of them.
+        """
+        with self._refresh_lock:
+            for kind in self.KINDS if kinds is None else kinds:
+                self._index(kind)
+                synced_at = self._mirror_synced_at(kind)
+                if synced_at is not None:
+                    self._refresh_from_mirror(kind, synced_at)
+                else:
+                    self._refresh_from_server(kind)
+            self.save()
+
+    def start(self, interval: float = 600):
+        """Refresh the index in a background thread.
+
+        The first refresh starts right away, lookups are answered from the
+        stored index in the meantime.
+
+        Args:
+            interval: Number of seconds between refreshes.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="sotagents-typeahead", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refreshes."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Failed to refresh the typeahead index: %r", e)
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,213 @@
+__all__ = ["WriteBehindBuffer", "merge_update"]
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional
+
+from sotagents.models import (
+    Model,
+    TaskUpdateRequest,
+    DatasetUpdateRequest,
+    MetricUpdateRequest,
+    ResultUpdateRequest,
+    EvaluationTableUpdateRequest,
+)
+
+if TYPE_CHECKING:
+    from sotagents.client import PapersWithCodeClient
+
+
+logger = logging.getLogger(__name__)
+
+
+def merge_update(previous: Model, update: Model) -> Model:
+    """Merge two update requests for the same resource.
+
+    Fields explicitly set on `update` override the fields of `previous`, fields
+    that were not set keep the previous value.
+    """
+    return previous.copy(update=update.dict(exclude_unset=True))
+
+
+class _PendingWrite:
+    __slots__ = ("method", "args", "request", "futures")
+
+    def __init__(self, method: str, args: tuple, request: Model):
+        self.method = method
+        self.args = args
+        self.request = request
+        self.futures: list[Future] = []
+
+
+class WriteBehindBuffer:
+    """Buffers update requests and sends them in the background.
+
+    Successive updates of the same resource are merged into one PATCH request.
+    Buffered updates are flushed every `flush_interval` seconds or as soon as
+    `max_pending` resources are waiting, whichever comes first.
+
+    Every buffered call returns a `concurrent.futures.Future` that resolves to
+    the updated object or to the error raised while sending it. All updates
+    merged into the same request share its outcome.
+
+    Example:
+        >>> with WriteBehindBuffer(client, flush_interval=2) as buffer:
+        ...     buffer.task_update("task-id", TaskUpdateRequest(name="New"))
+        ...     buffer.task_update("task-id", TaskUpdateRequest(description="..."))
+        >>> # Exactly one PATCH request was sent.
+    """
+
+    def __init__(
+        self,
+        client: "PapersWithCodeClient",
+        flush_interval: float = 1.0,
+        max_pending: int = 100,
+        concurrency: Optional[int] = None,
+        on_error: Optional[Callable[[str, tuple, Model, Exception], None]] = None,
+    ):
+        """Initialize.
+
+        Args:
+            client: Client used for sending the updates.
+            flush_interval: Maximal number of seconds an update is buffered.
+            max_pending: Number of buffered resources that triggers a flush.
+            concurrency: Maximal number of concurrent requests during a flush.
+                Defaults to the concurrency of the client.
+            on_error: Callback called with the method name, its arguments, the
+                merged request and the error for every failed update.
+        """
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.errors: list[tuple[str, tuple, Model, Exception]] = []
+
+        self._pending: dict[tuple, _PendingWrite] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency or client.concurrency
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="sotagents-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _submit(self, method: str, args: tuple, request: Model) -> Future:
+        future: Future = Future()
+        key = (method, *args)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind buffer is closed.")
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingWrite(method, args, request)
+            else:
+                pending.request = merge_update(pending.request, request)
+            pending.futures.append(future)
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while (
+                    not self._closed
+                    and len(self._pending) < self.max_pending
+                    and time.monotonic() < deadline
+                ):
+                    self._condition.wait(timeout=deadline - time.monotonic())
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+            if closed:
+                return
+
+    def _send(self, pending: _PendingWrite):
+        try:
+            response = getattr(self.client, pending.method)(
+                *pending.args, pending.request
+            )
+        except Exception as e:
+            logger.warning(
+                "Write-behind %s%s failed: %s", pending.method, pending.args, e
+            )
+            error = (pending.method, pending.args, pending.request, e)
+            self.errors.append(error)
+            for future in pending.futures:
+                future.set_exception(e)
+            if self.on_error is not None:
+                try:
+                    self.on_error(*error)
+                except Exception:
+                    logger.exception("Write-behind error callback failed")
+        else:
+            for future in pending.futures:
+                future.set_result(response)
+
+    def flush(self):
+        """Send all buffered updates and wait until they are done."""
+        with self._flush_lock:
+            with self._condition:
+                pending, self._pending = self._pending, {}
+            # Consume the iterator so all sends are finished before returning.
+            list(self._executor.map(self._send, pending.values()))
+
+    def close(self):
+        """Flush the buffered updates and stop the background thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        # Updates buffered after the last flush of the background thread.
+        self.flush()
+        self._executor.shutdown()
+
+    def task_update(self, task_id: str, task: TaskUpdateRequest) -> Future:
+        """Buffer a task update."""
+        return self._submit("task_update", (task_id,), task)
+
+    def dataset_update(self, dataset_id: str, dataset: DatasetUpdateRequest) -> Future:
+        """Buffer a dataset update."""
+        return self._submit("dataset_update", (dataset_id,), dataset)
+
+    def evaluation_update(
+        self, evaluation_id: str, evaluation: EvaluationTableUpdateRequest
+    ) -> Future:
+        """Buffer an evaluation table update."""
+        return self._submit("evaluation_update", (evaluation_id,), evaluation)
+
+    def evaluation_metric_update(
+        self, evaluation_id: str, metric_id: str, metric: MetricUpdateRequest
+    ) -> Future:
+        """Buffer an evaluation metric update."""
+        return self._submit(
+            "evaluation_metric_update", (evaluation_id, metric_id), metric
+        )
+
+    def evaluation_result_update(
+        self, evaluation_id: str, result_id: str, result: ResultUpdateRequest
+    ) -> Future:
+        """Buffer an evaluation result update."""
+        return self._submit(
+            "evaluation_result_update", (evaluation_id, result_id), result
+        )